@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Measure artifact file hashing MB/s, serially and on the shared hashing threads.
+
+    python standalone_tests/artifact_hash_benchmark.py --files 64 --size-mb 16
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from wandb.sdk.interface import artifacts
+
+
+def report(name, mb, elapsed):
+    print("%-10s %8.2fs %10.2f MB/s" % (name, elapsed, mb / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--size-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp_dir, "file%d.bin" % i)
+            with open(path, "wb") as f:
+                f.write(os.urandom(args.size_mb * 1024 * 1024))
+            paths.append(path)
+        mb = args.files * args.size_mb
+        cache = artifacts.ArtifactsCache(os.path.join(tmp_dir, "cache"))
+
+        start = time.time()
+        for path in paths:
+            artifacts.md5_file_b64(path)
+        report("serial", mb, time.time() - start)
+
+        start = time.time()
+        cache.md5_files_b64(paths, refresh=True)
+        report("parallel", mb, time.time() - start)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Measure Bayesian search suggestions/sec.
+
+Compares calling next_run once per suggestion on a fresh BayesianSearch (no
+fit reuse), next_run on a single BayesianSearch, and next_runs producing a
+whole batch from one fit.
+
+    python standalone_tests/bayes_search_benchmark.py --runs 50 --suggestions 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+from wandb.sweeps.bayes_search import BayesianSearch
+
+
+class Run(object):
+    def __init__(self, name, state, config, summary):
+        self.name = name
+        self.state = state
+        self.config = config
+        self.summaryMetrics = summary
+        self.history = []
+
+
+def make_sweep(runs, params):
+    config = {
+        "metric": {"name": "loss"},
+        "parameters": {"p%d" % i: {"min": 0.0, "max": 1.0} for i in range(params)},
+    }
+    sweep_runs = []
+    for r in range(runs):
+        values = np.random.uniform(size=params)
+        sweep_runs.append(
+            Run(
+                "run-%d" % r,
+                "finished",
+                {"p%d" % i: {"value": v} for i, v in enumerate(values)},
+                {"loss": float(np.sum((values - 0.3) ** 2))},
+            )
+        )
+    return {"config": config, "runs": sweep_runs}
+
+
+def report(name, suggestions, elapsed):
+    print("%-10s %8.2f suggestions/sec" % (name, suggestions / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--params", type=int, default=4)
+    parser.add_argument("--suggestions", type=int, default=20)
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    sweep = make_sweep(args.runs, args.params)
+
+    start = time.time()
+    for _ in range(args.suggestions):
+        BayesianSearch().next_run(sweep)
+    report("fresh", args.suggestions, time.time() - start)
+
+    search = BayesianSearch()
+    start = time.time()
+    for _ in range(args.suggestions):
+        search.next_run(sweep)
+    report("reused", args.suggestions, time.time() - start)
+
+    start = time.time()
+    BayesianSearch().next_runs(sweep, args.suggestions)
+    report("batch", args.suggestions, time.time() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""Measure wandb.Table construction and serialization from numpy and pandas.
+
+    python standalone_tests/table_benchmark.py --rows 100000 --columns 10
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import wandb
+
+
+def timed(name, rows, fn):
+    start = time.time()
+    result = fn()
+    elapsed = time.time() - start
+    print("%-22s %8.3fs %12.0f rows/sec" % (name, elapsed, rows / elapsed))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--columns", type=int, default=10)
+    args = parser.parse_args()
+
+    columns = ["c%d" % i for i in range(args.columns)]
+    ndarray = np.random.uniform(size=(args.rows, args.columns))
+    dataframe = pd.DataFrame(ndarray, columns=columns)
+    dataframe["label"] = np.random.choice(["cat", "dog"], size=args.rows)
+    max_rows = wandb.Table.MAX_ARTIFACT_ROWS
+
+    table = timed(
+        "ndarray init", args.rows, lambda: wandb.Table(columns=columns, data=ndarray)
+    )
+    timed(
+        "ndarray to json",
+        args.rows,
+        lambda: json.dumps(table._to_table_json(max_rows=max_rows)),
+    )
+    table = timed("dataframe init", args.rows, lambda: wandb.Table(dataframe=dataframe))
+    timed(
+        "dataframe to json",
+        args.rows,
+        lambda: json.dumps(table._to_table_json(max_rows=max_rows)),
+    )
+    timed(
+        "list init",
+        args.rows,
+        lambda: wandb.Table(columns=columns, data=ndarray.tolist()),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""Compare per tensor and batched histograms of the kind wandb.watch logs.
+
+Histograms the parameters of a stack of linear layers, one tensor at a time
+with log_tensor_stats (the way wandb.watch used to) and all of them at once
+with log_tensors_stats, optionally sampling large tensors.
+
+    python standalone_tests/torch_histogram_benchmark.py --layers 24 --width 2048
+"""
+
+import argparse
+import time
+import warnings
+
+import torch
+import wandb
+
+
+class History(object):
+    compute = True
+
+    def _row_update(self, row):
+        pass
+
+
+def synchronize(device):
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+def bench(name, fn, device, repeat):
+    fn()
+    synchronize(device)
+    start = time.time()
+    for _ in range(repeat):
+        fn()
+    synchronize(device)
+    elapsed = (time.time() - start) / repeat
+    print("%-16s %8.1f ms/step" % (name, elapsed * 1000))
+
+
+def count_syncs(name, fn):
+    # each host synchronization is reported as a warning in this mode
+    torch.cuda.set_sync_debug_mode("warn")
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            fn()
+    finally:
+        torch.cuda.set_sync_debug_mode("default")
+    print("%-16s %8d syncs/step" % (name, len(caught)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sample-size", type=int, default=1 << 16)
+    args = parser.parse_args()
+
+    model = torch.nn.Sequential(
+        *[torch.nn.Linear(args.width, args.width) for _ in range(args.layers)]
+    ).to(args.device)
+    tensors = [(name, p.detach()) for name, p in model.named_parameters()]
+    print(
+        "%d tensors, %d elements on %s"
+        % (len(tensors), sum(t.numel() for _, t in tensors), args.device)
+    )
+
+    history = History()
+    torch_history = wandb.wandb_torch.TorchHistory(history)
+
+    def per_tensor():
+        for name, tensor in tensors:
+            torch_history.log_tensor_stats(tensor.cpu(), name)
+
+    bench("per tensor", per_tensor, args.device, args.repeat)
+    bench(
+        "batched",
+        lambda: torch_history.log_tensors_stats(tensors),
+        args.device,
+        args.repeat,
+    )
+    bench(
+        "batched sampled",
+        lambda: torch_history.log_tensors_stats(tensors, args.sample_size),
+        args.device,
+        args.repeat,
+    )
+    if args.device.startswith("cuda"):
+        count_syncs("batched", lambda: torch_history.log_tensors_stats(tensors))
+    else:
+        # the device code path, which is used for gpus
+        bench(
+            "batched device",
+            lambda: torch_history._device_histograms(
+                [t.reshape(-1) for _, t in tensors]
+            ),
+            args.device,
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
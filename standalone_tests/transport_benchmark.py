@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Compare multiprocessing.Queue and the shared memory ring buffer transport.
+
+Publishes history records to a consumer process and reports records/sec and
+publish latency percentiles for each transport.  Note that multiprocessing.Queue
+pickles messages in a feeder thread, so its publish latency does not include
+serialization while the ring buffer serializes in the caller.
+
+    python standalone_tests/transport_benchmark.py --records 100000
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.sdk.lib import ringbuffer
+
+
+def make_record(step, keys):
+    record = pb.Record()
+    for i in range(keys):
+        item = record.history.item.add()
+        item.key = "metric_%d" % i
+        item.value_json = json.dumps(step * 0.001 + i)
+    item = record.history.item.add()
+    item.key = "_step"
+    item.value_json = json.dumps(step)
+    return record
+
+
+def consume(q, done_q, count):
+    for _ in range(count):
+        q.get()
+    done_q.put(time.time())
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100.0))]
+
+
+def run(name, q, ctx, records, keys):
+    done_q = ctx.Queue()
+    p = ctx.Process(target=consume, args=(q, done_q, records))
+    p.start()
+    msgs = [make_record(step, keys) for step in range(records)]
+    latencies = []
+    start = time.time()
+    for msg in msgs:
+        t = time.time()
+        q.put(msg)
+        latencies.append(time.time() - t)
+    end = done_q.get()
+    p.join()
+    elapsed = end - start
+    print(
+        "%-10s %10.0f records/sec  p50 %7.1fus  p99 %7.1fus"
+        % (
+            name,
+            records / elapsed,
+            percentile(latencies, 50) * 1e6,
+            percentile(latencies, 99) * 1e6,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--keys", type=int, default=10)
+    parser.add_argument("--buffer-size", type=int, default=16 * 1024 * 1024)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    run("queue", ctx.Queue(), ctx, args.records, args.keys)
+    if not ringbuffer.available():
+        print("shm        not available")
+        return
+    q = ringbuffer.RingBufferQueue(ctx, pb.Record, args.buffer_size)
+    try:
+        run("shm", q, ctx, args.records, args.keys)
+    finally:
+        q.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -206,3 +206,91 @@ def test_nested_shape():
     t3.append(t2)
     shape = wandb.wandb_torch.nested_shape([t1, t2, t3])
     assert shape == [[2, 3], [4, 5], [[2, 3], [4, 5], 0, [4, 5]]]
+
+
+class FakeHistory(object):
+    compute = True
+
+    def __init__(self):
+        self.row = {}
+
+    def _row_update(self, row):
+        self.row.update(row)
+
+
+def test_batched_histograms_match_histc():
+    torch_history = wandb.wandb_torch.TorchHistory(FakeHistory())
+    flats = [torch.randn(1000), torch.arange(10.0), torch.ones(5)]
+    histograms = torch_history._device_histograms(flats)
+    for flat, (counts, bins) in zip(flats, histograms):
+        assert counts == flat.histc(bins=64).tolist()
+        assert len(bins) == 65
+    # histc widens the range of constant tensors
+    assert histograms[2][1][0] == 0.0 and histograms[2][1][-1] == 2.0
+
+
+def test_batched_histograms_skip_nonfinite():
+    torch_history = wandb.wandb_torch.TorchHistory(FakeHistory())
+    flats = [
+        torch.tensor([1.0, float("nan"), 2.0, float("inf")]),
+        torch.tensor([float("nan"), float("-inf")]),
+    ]
+    histograms = torch_history._device_histograms(flats)
+    counts, bins = histograms[0]
+    assert sum(counts) == 2
+    assert bins[0] == 1.0 and bins[-1] == 2.0
+    assert histograms[1] is None
+
+
+def test_log_tensors_stats():
+    history = FakeHistory()
+    torch_history = wandb.wandb_torch.TorchHistory(history)
+    torch_history.log_tensors_stats(
+        [
+            ("a", torch.randn(10, 10)),
+            ("b", torch.tensor([float("nan")])),
+            ("c", torch.ones(10000)),
+            ("d", torch.randn(3).half()),
+        ],
+        sample_size=1000,
+    )
+    assert sorted(history.row) == ["a", "c", "d"]
+    assert sum(history.row["a"].histogram) == 100
+    # sampled counts are scaled up to the size of the tensor
+    assert sum(history.row["c"].histogram) == 10000
+
+
+def test_log_tensors_stats_keeps_global_rng():
+    history = FakeHistory()
+    torch_history = wandb.wandb_torch.TorchHistory(history)
+    tensor = torch.randn(10000)
+    torch.manual_seed(0)
+    expected = torch.rand(3)
+    torch.manual_seed(0)
+    torch_history.log_tensors_stats([("a", tensor)], sample_size=100)
+    assert sorted(history.row) == ["a"]
+    assert torch.equal(torch.rand(3), expected)
+
+
+def test_gradient_stats_after_failed_backward():
+    history = FakeHistory()
+    torch_history = wandb.wandb_torch.TorchHistory(history)
+    weight = dummy_torch_tensor(10)
+    log_track = wandb.wandb_torch.log_track_init(1)
+    torch_history._hook_variable_gradient_stats(weight, "gradients/weight", log_track)
+    fail = [True]
+
+    def fail_once(grad):
+        if fail.pop():
+            raise RuntimeError("backward failed")
+
+    # runs after the gradient stats hook, the pass raises after it was queued
+    weight.register_hook(fail_once)
+    with pytest.raises(RuntimeError):
+        (weight * 2).sum().backward()
+    assert history.row == {}
+    fail.append(False)
+    (weight * 3).sum().backward()
+    assert sorted(history.row) == ["gradients/weight"]
+    assert history.row["gradients/weight"].bins[0] == 2.0
+    assert not torch_history._pending_gradients
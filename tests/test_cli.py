@@ -10,6 +10,8 @@ import pytest
 import netrc
 import subprocess
 import os
+import json
+import sys
 
 DUMMY_API_KEY = "1824812581259009ca9981580f8f8a9012409eee"
 DOCKER_SHA = (
@@ -833,3 +835,87 @@ def test_gc(runner):
             == 0
         )
         assert not os.path.exists(run1_dir)
+
+
+def _offline_run(run_id, steps, batch=None):
+    """Write the transaction log of an offline run, returns record offsets.
+
+    With batch, the history is written as history_batch records of that many
+    steps each.
+    """
+    from wandb.proto import wandb_internal_pb2 as pb
+
+    if sys.version_info >= (3, 6):
+        from wandb.sdk.internal import datastore
+    else:
+        from wandb.sdk_py27.internal import datastore
+
+    run_dir = os.path.join("wandb", "offline-run-20210101_000000-{}".format(run_id))
+    os.makedirs(os.path.join(run_dir, "files"))
+    ds = datastore.DataStore()
+    ds.open_for_write(os.path.join(run_dir, "run-{}.wandb".format(run_id)))
+    ds.write(pb.Record(run=pb.RunRecord(run_id=run_id, project="test")))
+    offsets = []
+    record = pb.Record()
+    for step in range(steps):
+        history = record.history_batch.history.add() if batch else record.history
+        item = history.item.add()
+        item.key = "_step"
+        item.value_json = json.dumps(step)
+        if not batch or len(record.history_batch.history) == batch:
+            offsets.append(ds.write(record)[0])
+            record = pb.Record()
+    ds.write(pb.Record(exit=pb.RunExitRecord(exit_code=0)))
+    ds.write(pb.Record(final=pb.FinalRecord()))
+    ds.close()
+    return run_dir, offsets
+
+
+def _history_lines(ctx):
+    lines = []
+    for post in ctx.get("file_stream", []):
+        data = post.get("files", {}).get("wandb-history.jsonl")
+        if data:
+            lines.append((data["offset"], data["content"]))
+    return lines
+
+
+def test_sync_parallel(runner, live_mock_server, monkeypatch):
+    monkeypatch.setattr(wandb, "_IS_INTERNAL_PROCESS", True)
+    with runner.isolated_filesystem():
+        run_dirs = [_offline_run(run_id, 3)[0] for run_id in ("abcd", "efgh")]
+        result = runner.invoke(cli.sync, ["--sync-all", "--parallel", "2"])
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Synced 2 of 2 runs" in result.output
+        for run_dir in run_dirs:
+            files = os.listdir(run_dir)
+            assert any(f.endswith(".wandb.synced") for f in files)
+            assert not any(f.endswith(".wandb.syncing") for f in files)
+        lines = _history_lines(live_mock_server.get_ctx())
+        assert sum(len(content) for _, content in lines) == 6
+
+
+@pytest.mark.parametrize("batch", [None, 2])
+def test_sync_resume(runner, live_mock_server, monkeypatch, batch):
+    monkeypatch.setattr(wandb, "_IS_INTERNAL_PROCESS", True)
+    live_mock_server.set_ctx({"resume": True})
+    with runner.isolated_filesystem():
+        run_dir, offsets = _offline_run("abcd", 4, batch=batch)
+        # resume at the record holding step 2
+        offset = offsets[2 // (batch or 1)]
+        checkpoint = dict(offset=offset, run_id="abcd", project="test", entity="")
+        with open(os.path.join(run_dir, "run-abcd.wandb.syncing"), "w") as f:
+            json.dump(checkpoint, f)
+        result = runner.invoke(cli.sync, [run_dir])
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Resuming sync" in result.output
+        assert not os.path.exists(os.path.join(run_dir, "run-abcd.wandb.syncing"))
+        # the first two steps were acknowledged before, the rest is appended
+        # after the lines the server already has
+        lines = _history_lines(live_mock_server.get_ctx())
+        assert lines[0][0] == 15
+        assert [
+            json.loads(line)["_step"] for _, content in lines for line in content
+        ] == [2, 3]
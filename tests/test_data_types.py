@@ -633,6 +633,66 @@ def test_table_from_pandas():
     assert table.data == table_data
 
 
+def test_table_columnar_types():
+    pd_data = pd.DataFrame(
+        {"i": [1, 2, 3], "f": [0.5, 1.5, 2.5], "b": [True, False, True]}
+    )
+    table = wandb.Table(dataframe=pd_data)
+    type_map = table._column_types.params["type_map"]
+    assert type_map["i"].assign(1.5) == type_map["i"]
+    assert type_map["b"].assign(False) == type_map["b"]
+    assert type_map["f"].assign("a").__class__.__name__ == "InvalidType"
+
+    with pytest.raises(TypeError):
+        wandb.Table(dataframe=pd_data, dtype=str)
+
+
+def test_table_columnar_add_data():
+    table = wandb.Table(columns=["a", "b"], data=np.arange(6).reshape(3, 2))
+    table.add_data(6, 7)
+    assert table.data == [[0, 1], [2, 3], [4, 5], [6, 7]]
+    assert [row for _, row in table.iterrows()][-1] == [6, 7]
+
+    with pytest.raises(ValueError):
+        wandb.Table(columns=["a", "b", "c"], data=np.arange(6).reshape(3, 2))
+
+
+def test_table_columnar_json():
+    np_data = np.arange(12, dtype=np.float32).reshape(4, 3)
+    table = wandb.Table(columns=["a", "b", "c"], data=np_data)
+    json = table._to_table_json(max_rows=2)
+    assert json["data"] == np_data[:2].tolist()
+    assert all(type(v) is float for v in json["data"][0])
+    # serializing doesn't convert the table to rows
+    assert table._data is None
+    assert table == wandb.Table(columns=["a", "b", "c"], data=np_data.tolist())
+
+
+def test_table_columnar_3d():
+    table = wandb.Table(columns=["a", "b"], data=np.zeros((3, 2, 2)))
+    assert table.data == [[[0.0, 0.0], [0.0, 0.0]]] * 3
+
+
+def test_table_columnar_copies():
+    np_data = np.arange(6).reshape(3, 2)
+    table = wandb.Table(columns=["a", "b"], data=np_data)
+    np_data[0, 0] = 99
+    assert table._to_table_json()["data"][0] == [0, 1]
+
+    pd_data = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    table = wandb.Table(dataframe=pd_data)
+    pd_data.iloc[0, 0] = -5
+    assert table._to_table_json()["data"][0] == [1, 3]
+
+
+def test_table_columnar_nan_to_json():
+    table = wandb.Table(dataframe=pd.DataFrame({"a": [1.0, np.nan], "b": [1, 2]}))
+    artifact = wandb.Artifact("table_nan", "dataset")
+    assert table.to_json(artifact)["data"] == [[1.0, 1], [None, 2]]
+    # the table itself keeps the nan
+    assert np.isnan(table._column_data[0][1])
+
+
 def test_graph():
     graph = wandb.Graph()
     node_a = data_types.Node("a", "Node A", size=(4,))
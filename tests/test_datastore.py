@@ -143,3 +143,198 @@ def test_data_write_fill(with_datastore):
         expected_records=records,
         expected_record_sizes=lengths,
     )
+
+
+def test_data_write_buffered(with_datastore):
+    """Partial blocks are only written on flush, full blocks right away."""
+    ds = with_datastore
+    ds._write_data(b"\x01" * 10)
+    assert os.stat(FNAME).st_size == 0
+    ds.flush()
+    assert os.stat(FNAME).st_size == 7 + 7 + 10
+    ds._write_data(b"\x02" * (32768 - 7 - 7 - 10 - 7))
+    assert os.stat(FNAME).st_size == 32768
+    ds._write_data(b"\x03" * 10)
+    assert os.stat(FNAME).st_size == 32768
+    ds.close()
+    assert os.stat(FNAME).st_size == 32768 + 7 + 10
+
+
+def test_data_sync(with_datastore, mocker):
+    """Sync flushes and only fsyncs when something was written."""
+    fsync = mocker.patch("os.fsync")
+    ds = with_datastore
+    ds._write_data(b"\x01" * 10)
+    ds.sync()
+    assert os.stat(FNAME).st_size == 7 + 7 + 10
+    ds.sync()
+    assert fsync.call_count == 1
+    ds._write_data(b"\x01" * 10)
+    ds.sync()
+    assert fsync.call_count == 2
+    ds.close()
+
+
+def test_data_write_scan(with_datastore):
+    """Records written through the block buffer scan back unchanged."""
+    ds = with_datastore
+    sizes = [1, 100, 32768 - 7 - 7 - 101 - 7 - 2, 32768 * 3 + 5, 0, 70000, 3]
+    offsets = []
+    for i, size in enumerate(sizes):
+        offsets.append(ds._write_data(bytes(bytearray([i + 1] * size))))
+        if i == 3:
+            ds.flush()
+    ds.close()
+    assert offsets[0][0] == 7
+    for prev, cur in zip(offsets, offsets[1:]):
+        assert cur[0] == prev[0] + prev[1]
+    assert os.stat(FNAME).st_size == offsets[-1][0] + offsets[-1][1]
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    for i, size in enumerate(sizes):
+        assert ds.scan_data() == bytes(bytearray([i + 1] * size))
+    assert ds.scan_data() is None
+    ds.close()
+
+
+def _write_records(sizes):
+    wandb._set_internal_process()
+    ds = datastore.DataStore()
+    ds.open_for_write(FNAME)
+    offsets = [
+        ds._write_data(bytes(bytearray([i + 1] * size)))[0]
+        for i, size in enumerate(sizes)
+    ]
+    ds.close()
+    return offsets
+
+
+def _history_record(step):
+    rec = wandb_internal_pb2.Record()
+    item = rec.history.item.add()
+    item.key = "_step"
+    item.value_json = json.dumps(step)
+    return rec
+
+
+@pytest.fixture()
+def datastore_file():
+    yield FNAME
+    for fname in (FNAME, FNAME + datastore.INDEX_SUFFIX):
+        if os.path.exists(fname):
+            os.unlink(fname)
+
+
+def test_reader(datastore_file):
+    """Reader returns the records written, including ones split over blocks."""
+    sizes = [1, 100, 32768 - 7 - 7 - 101 - 7 - 2, 32768 * 3 + 5, 0, 70000, 3]
+    offsets = _write_records(sizes)
+    with datastore.DataStoreReader(FNAME) as reader:
+        records = [(offset, bytes(data)) for offset, data in reader.records()]
+        assert [offset for offset, _ in records] == offsets
+        for i, (_, data) in enumerate(records):
+            assert data == bytes(bytearray([i + 1] * sizes[i]))
+        assert not reader.truncated
+        assert reader.valid_length == os.stat(FNAME).st_size
+        assert bytes(reader.read_at(offsets[3])) == records[3][1]
+        assert reader.verify()
+
+
+@pytest.mark.parametrize("cut", [1, 6, 7, 8, 32768 + 100])
+def test_reader_truncated(datastore_file, cut):
+    """A torn tail ends iteration instead of failing."""
+    sizes = [10, 20, 40000]
+    offsets = _write_records(sizes)
+    size = os.stat(FNAME).st_size
+    with open(FNAME, "r+b") as f:
+        f.truncate(size - cut)
+    with datastore.DataStoreReader(FNAME) as reader:
+        records = list(reader)
+        assert len(records) == 2
+        assert reader.truncated
+        assert reader.valid_length == offsets[2]
+
+
+def test_reader_corrupt(datastore_file):
+    """A bad checksum is found lazily or in bulk."""
+    offsets = _write_records([10, 20, 30])
+    with open(FNAME, "r+b") as f:
+        f.seek(offsets[2] + 7)
+        f.write(b"\x00")
+    with datastore.DataStoreReader(FNAME, verify=False) as reader:
+        assert len(list(reader)) == 3
+        assert not reader.verify()
+    with datastore.DataStoreReader(FNAME) as reader:
+        assert len(list(reader)) == 2
+        assert reader.truncated
+
+
+def test_reader_index(datastore_file, mocker):
+    """Sidecar index allows seeking by step and record type."""
+    wandb._set_internal_process()
+    ds = datastore.DataStore()
+    ds.open_for_write(FNAME)
+    run = wandb_internal_pb2.Record()
+    run.run.run_id = "abc"
+    ds.write(run)
+    for step in range(10):
+        ds.write(_history_record(step))
+    ds.close()
+
+    with datastore.DataStoreReader(FNAME) as reader:
+        index = reader.index()
+        assert [e.record_type for e in index] == ["run"] + ["history"] * 10
+        assert [e.step for e in index] == [-1] + list(range(10))
+        records = list(reader.seek(7))
+        assert len(records) == 3
+        assert [offset for offset, _ in reader.find("run")] == [index[0].offset]
+    assert os.path.exists(FNAME + datastore.INDEX_SUFFIX)
+
+    # append a copy of the first history record, only it needs indexing
+    with open(FNAME, "rb") as f:
+        data = f.read()
+    with open(FNAME, "ab") as f:
+        f.write(data[index[1].offset : index[2].offset])
+    with datastore.DataStoreReader(FNAME) as reader:
+        reader._index_record = mocker.Mock(wraps=reader._index_record)
+        entries = reader.index()
+        assert reader._index_record.call_count == 1
+        assert len(entries) == 12
+        assert entries[:11] == index
+        assert entries[11].step == 0
+
+
+@pytest.mark.parametrize(
+    "sizes", [[10, 20], [32768 - 7 - 7 - 7 - 3], [32768 - 7 - 7], [40000, 5]]
+)
+@pytest.mark.parametrize("cut", [0, 3])
+def test_append(datastore_file, sizes, cut):
+    """Appending after a torn tail continues the log from the last record."""
+    _write_records(sizes)
+    if cut:
+        with open(FNAME, "ab") as f:
+            f.write(b"\x01" * cut)
+    ds = datastore.DataStore()
+    ds.open_for_append(FNAME)
+    ds._write_data(b"\x02" * 100)
+    ds._write_data(b"\x03" * 40000)
+    ds.close()
+    with datastore.DataStoreReader(FNAME) as reader:
+        records = [bytes(data) for data in reader]
+        assert not reader.truncated
+    expected = [bytes(bytearray([i + 1] * size)) for i, size in enumerate(sizes)]
+    assert records == expected + [b"\x02" * 100, b"\x03" * 40000]
+
+
+def test_append_empty(datastore_file):
+    """Appending to a log without a complete header starts it over."""
+    with open(FNAME, "wb") as f:
+        f.write(b":W&")
+    wandb._set_internal_process()
+    ds = datastore.DataStore()
+    ds.open_for_append(FNAME)
+    ds._write_data(b"\x02" * 10)
+    ds.close()
+    with datastore.DataStoreReader(FNAME) as reader:
+        assert [bytes(data) for data in reader] == [b"\x02" * 10]
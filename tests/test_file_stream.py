@@ -0,0 +1,144 @@
+"""file_stream tests."""
+
+import gzip
+import io
+import json
+import threading
+import time
+
+import pytest
+from wandb.sdk.internal import file_stream
+
+
+class FakeApi(object):
+    api_key = "key"
+    user_agent = "test"
+
+    def __init__(self):
+        self.dynamic_settings = {"heartbeat_seconds": 30}
+
+    def settings(self):
+        return {"base_url": "http://localhost", "entity": "e", "project": "p"}
+
+
+class FakeResponse(object):
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {}
+
+
+class FakeClient(object):
+    """Records posts and can hold them to simulate a slow server."""
+
+    def __init__(self):
+        self.posts = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self.release = threading.Event()
+        self.release.set()
+        self._lock = threading.Lock()
+
+    def post(self, url, **kwargs):
+        payload = kwargs.get("json")
+        if "data" in kwargs:
+            assert kwargs["headers"]["Content-Encoding"] == "gzip"
+            data = gzip.GzipFile(fileobj=io.BytesIO(kwargs["data"])).read()
+            payload = json.loads(data.decode("utf-8"))
+        with self._lock:
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+        self.release.wait()
+        with self._lock:
+            self.inflight -= 1
+            self.posts.append(payload)
+        return FakeResponse()
+
+
+@pytest.fixture()
+def fs_factory():
+    streams = []
+
+    def factory(**kwargs):
+        fs = file_stream.FileStreamApi(FakeApi(), "run", time.time(), **kwargs)
+        fs._client = FakeClient()
+        fs.rate_limit_seconds = lambda: 0.01
+        streams.append(fs)
+        return fs
+
+    yield factory
+    for fs in streams:
+        fs._client.release.set()
+
+
+def _lines(posts, filename):
+    lines = []
+    for post in posts:
+        data = post.get("files", {}).get(filename)
+        if data:
+            assert data["offset"] == len(lines)
+            lines.extend(data["content"])
+    return lines
+
+
+@pytest.mark.parametrize("gzip_body", [False, True])
+def test_file_stream_order(fs_factory, gzip_body):
+    fs = fs_factory(max_inflight=3, gzip=gzip_body)
+    fs.start()
+    for i in range(200):
+        fs.push("a.jsonl", json.dumps({"i": i}))
+        fs.push("b.jsonl", json.dumps({"j": i}))
+        if i % 50 == 0:
+            time.sleep(0.02)
+    fs.finish(0)
+    posts = fs._client.posts
+    assert posts[-1] == {"complete": True, "exitcode": 0}
+    assert _lines(posts, "a.jsonl") == [json.dumps({"i": i}) for i in range(200)]
+    assert _lines(posts, "b.jsonl") == [json.dumps({"j": i}) for i in range(200)]
+    stats = fs.stats()
+    assert stats["queued_chunks"] == 0
+    assert stats["inflight_requests"] == 0
+    assert stats["sent_bytes"] == sum(
+        len(json.dumps({"i": i})) + len(json.dumps({"j": i})) for i in range(200)
+    )
+
+
+def test_file_stream_inflight(fs_factory):
+    fs = fs_factory(max_inflight=2)
+    fs._client.release.clear()
+    fs.start()
+    for name in ("a", "b", "c"):
+        fs.push(name, "x")
+        time.sleep(0.05)
+    # one post per file at most, and at most two posts
+    assert fs._client.max_inflight == 2
+    assert fs.stats()["inflight_requests"] == 2
+    assert fs.stats()["queued_chunks"] == 1
+    fs._client.release.set()
+    fs.finish(0)
+    assert fs._client.max_inflight == 2
+    assert fs.stats()["sent_requests"] == 3
+
+
+def test_file_stream_backpressure(fs_factory):
+    fs = fs_factory(max_inflight=1, max_backlog_bytes=10)
+    fs._client.release.clear()
+    fs.start()
+    fs.push("a", "x" * 10)
+    pushed = threading.Event()
+
+    def push():
+        fs.push("a", "y")
+        pushed.set()
+
+    t = threading.Thread(target=push)
+    t.start()
+    assert not pushed.wait(0.1)
+    assert fs.stats()["inflight_bytes"] == 10
+    fs._client.release.set()
+    assert pushed.wait(5)
+    t.join()
+    fs.finish(0)
+    assert fs.stats()["blocked_seconds"] > 0
+    assert _lines(fs._client.posts, "a") == ["x" * 10, "y"]
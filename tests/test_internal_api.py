@@ -0,0 +1,113 @@
+"""internal_api upload tests."""
+
+import pytest
+import requests
+from wandb.apis import internal
+from wandb.old import retry
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError("error", response=self)
+
+
+class FakeStorage(object):
+    """Cloud storage speaking the resumable upload protocol."""
+
+    def __init__(self, fail_puts=()):
+        self.data = b""
+        self.posts = 0
+        self.puts = 0
+        self.fail_puts = set(fail_puts)
+        self.complete = False
+
+    def _status(self, total):
+        if len(self.data) == total:
+            self.complete = True
+            return FakeResponse(200)
+        headers = {"Range": "bytes=0-%d" % (len(self.data) - 1)} if self.data else {}
+        return FakeResponse(308, headers)
+
+    def post(self, url, data=None, headers=None):
+        assert headers["x-goog-resumable"] == "start"
+        self.posts += 1
+        return FakeResponse(201, {"Location": "http://storage/session"})
+
+    def put(self, url, data=None, headers=None):
+        assert url == "http://storage/session"
+        self.puts += 1
+        content_range = headers["Content-Range"]
+        total = int(content_range.rsplit("/", 1)[1])
+        if content_range.startswith("bytes */"):
+            return self._status(total)
+        if self.puts in self.fail_puts:
+            # the connection drops after half of the chunk was stored
+            self.data += data[: len(data) // 2]
+            raise requests.exceptions.ConnectionError("connection reset")
+        start = int(content_range.split(" ")[1].split("-")[0])
+        assert start == len(self.data)
+        self.data += data
+        return self._status(total)
+
+
+@pytest.fixture()
+def upload(tmpdir):
+    api = internal.Api(load_settings=False).api
+    api.UPLOAD_CHUNK_BYTES = 1024
+    api.UPLOAD_CHUNK_RETRY_SECONDS = 0
+    content = bytes(bytearray(i % 251 for i in range(5000)))
+    path = tmpdir.join("file.bin")
+    path.write_binary(content)
+
+    def upload(storage, retries=None):
+        api._storage_session_obj = storage
+        if retries is not None:
+            api.UPLOAD_CHUNK_RETRIES = retries
+        totals = []
+        with open(str(path), "rb") as f:
+            api.upload_file(
+                "http://storage/signed",
+                f,
+                lambda _, total: totals.append(total),
+                extra_headers={"x-goog-resumable": "start"},
+            )
+        return totals
+
+    upload.content = content
+    return upload
+
+
+def test_upload_resumable(upload):
+    storage = FakeStorage()
+    totals = upload(storage)
+    assert storage.data == upload.content
+    assert storage.posts == 1
+    assert totals == [1024, 2048, 3072, 4096, 5000]
+
+
+def test_upload_resumable_chunk_retry(upload):
+    storage = FakeStorage(fail_puts=[2])
+    totals = upload(storage)
+    assert storage.data == upload.content
+    assert storage.posts == 1
+    # the committed half of the failed chunk is not uploaded again
+    assert totals[:3] == [1024, 1536, 2560]
+    assert totals[-1] == 5000
+
+
+def test_upload_resumable_resume(upload):
+    storage = FakeStorage(fail_puts=[2])
+    with pytest.raises(retry.TransientException):
+        upload(storage, retries=0)
+    assert len(storage.data) == 1536
+    # the next attempt continues the same session
+    totals = upload(storage, retries=5)
+    assert storage.data == upload.content
+    assert storage.posts == 1
+    assert totals[0] == 1536
+    assert totals[-1] == 5000
@@ -309,6 +309,36 @@ def test_artifact_download(runner, mock_server, api):
         assert path == os.path.join(".", "artifacts", part)
 
 
+def test_artifact_download_recursive(runner, mock_server, api, mocker):
+    calls = []
+    mocker.patch.object(
+        wandb.apis.public.Artifact,
+        "_download_file",
+        lambda self, name, root: calls.append((self, name)),
+    )
+    run_downloads = mocker.spy(wandb.apis.public, "_run_downloads")
+    with runner.isolated_filesystem():
+        art = api.artifact("entity/project/mnist:v0", type="dataset")
+        dep = api.artifact("entity/project/mnist:v0", type="dataset")
+        art._dependent_artifacts = [dep]
+        art.download(recursive=True)
+    # the files of both artifacts are downloaded together
+    assert run_downloads.call_count == 1
+    names = sorted(art._load_manifest().entries)
+    assert sorted(name for a, name in calls if a is art) == names
+    assert sorted(name for a, name in calls if a is dep) == names
+    assert dep._is_downloaded
+
+
+def test_artifact_download_pool_closed():
+    pool = wandb.apis.public._get_download_pool()
+    assert wandb.apis.public._get_download_pool() is pool
+    wandb.apis.public._close_download_pool()
+    assert wandb.apis.public._download_pool is None
+    with pytest.raises(ValueError):
+        pool.map(len, [])
+
+
 def test_artifact_run_used(runner, mock_server, api):
     run = api.run("test/test/test")
     arts = run.used_artifacts()
@@ -0,0 +1,84 @@
+"""console output coalescing tests."""
+
+import sys
+import time
+
+PY3 = sys.version_info.major == 3 and sys.version_info.minor >= 6
+if PY3:
+    from wandb.sdk.lib import redirect
+else:
+    from wandb.sdk_py27.lib import redirect
+
+
+class Recorder(object):
+    def __init__(self):
+        self.chunks = []
+
+    def __call__(self, name, data):
+        self.chunks.append((name, data))
+
+
+def test_coalesce_line_aligned():
+    cb = Recorder()
+    coalescer = redirect.ConsoleCoalescer(cb)
+    for i in range(100):
+        coalescer.write("stdout", "line %d" % i)
+        coalescer.write("stdout", "\n")
+    coalescer.write("stderr", b"err\npart")
+    coalescer.flush()
+    assert cb.chunks == [
+        ("stdout", "".join("line %d\n" % i for i in range(100))),
+        ("stderr", "err\n"),
+    ]
+    # partial lines are only published on stop
+    coalescer.stop()
+    assert cb.chunks[-1] == ("stderr", "part")
+
+
+def test_coalesce_carriage_returns():
+    cb = Recorder()
+    coalescer = redirect.ConsoleCoalescer(cb)
+    for i in range(101):
+        coalescer.write("stdout", "\r%3d%%|%s" % (i, "#" * (i // 10)))
+    coalescer.write("stdout", "\ndone\r\nx\ry\rz\r\n")
+    coalescer.flush()
+    assert cb.chunks == [("stdout", "\r100%|##########\ndone\r\n\rz\r\n")]
+
+
+def test_coalesce_utf8_split():
+    cb = Recorder()
+    coalescer = redirect.ConsoleCoalescer(cb)
+    data = u"café\n".encode("utf-8")
+    coalescer.write("stdout", data[:4])
+    coalescer.write("stdout", data[4:])
+    coalescer.flush()
+    assert cb.chunks == [("stdout", u"café\n")]
+
+
+def test_coalesce_memory_cap():
+    cb = Recorder()
+    coalescer = redirect.ConsoleCoalescer(cb, max_size=50)
+    for i in range(10):
+        coalescer.write("stdout", "%09d\n" % i)
+    coalescer.flush()
+    assert cb.chunks == [
+        (
+            "stdout",
+            "[50 bytes of console output dropped]\n"
+            + "".join("%09d\n" % i for i in range(5, 10)),
+        )
+    ]
+    stats = coalescer.stats()
+    assert stats["captured_bytes"] == 100
+    assert stats["dropped_bytes"] == 50
+
+
+def test_coalesce_timer():
+    cb = Recorder()
+    coalescer = redirect.ConsoleCoalescer(cb, interval=0.05)
+    coalescer.start()
+    coalescer.write("stdout", "hello\n")
+    time.sleep(0.3)
+    assert cb.chunks == [("stdout", "hello\n")]
+    coalescer.stop()
+    assert len(cb.chunks) == 1
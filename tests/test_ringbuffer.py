@@ -0,0 +1,130 @@
+"""ringbuffer tests."""
+
+import multiprocessing
+
+import pytest
+from six.moves import queue
+from wandb.proto import wandb_internal_pb2 as pb  # type: ignore
+from wandb.sdk.lib import ringbuffer
+
+
+pytestmark = pytest.mark.skipif(
+    not ringbuffer.available(), reason="requires multiprocessing.shared_memory"
+)
+
+
+def _record(num, size=0):
+    record = pb.Record(num=num)
+    if size:
+        record.output.line = "x" * size
+    return record
+
+
+def _consume(q, result_q, count):
+    nums = []
+    lines = 0
+    for _ in range(count):
+        record = q.get()
+        nums.append(record.num)
+        lines += len(record.output.line)
+    result_q.put((nums, lines))
+    q.close()
+
+
+@pytest.fixture()
+def ctx():
+    return multiprocessing.get_context("spawn")
+
+
+def test_ringbuffer_put_get(ctx):
+    q = ringbuffer.RingBufferQueue(ctx, pb.Record, 1024)
+    try:
+        assert q.empty()
+        q.put(_record(1))
+        q.put(_record(2, 10))
+        assert not q.empty()
+        assert q.get().num == 1
+        record = q.get()
+        assert record.num == 2
+        assert record.output.line == "x" * 10
+        assert q.empty()
+        with pytest.raises(queue.Empty):
+            q.get(timeout=0.01)
+    finally:
+        q.close()
+
+
+def test_ringbuffer_wraparound(ctx):
+    q = ringbuffer.RingBufferQueue(ctx, pb.Record, 100)
+    try:
+        for i in range(50):
+            q.put(_record(i, i % 30))
+            record = q.get()
+            assert record.num == i
+            assert record.output.line == "x" * (i % 30)
+    finally:
+        q.close()
+
+
+def test_ringbuffer_spill(ctx):
+    q = ringbuffer.RingBufferQueue(ctx, pb.Record, 64)
+    try:
+        q.put(_record(1, 1000))
+        record = q.get()
+        assert record.num == 1
+        assert record.output.line == "x" * 1000
+    finally:
+        q.close()
+
+
+def test_ringbuffer_too_small(ctx):
+    with pytest.raises(ValueError):
+        ringbuffer.RingBufferQueue(ctx, pb.Record, 8)
+
+
+def test_ringbuffer_full(ctx):
+    q = ringbuffer.RingBufferQueue(ctx, pb.Record, 64)
+    try:
+        q.put(_record(1, 40))
+        with pytest.raises(queue.Full):
+            q.put(_record(2, 40), block=False)
+        with pytest.raises(queue.Full):
+            q.put(_record(2, 40), timeout=0.05)
+        assert q.get().num == 1
+        q.put(_record(2, 40), timeout=0.05)
+        assert q.get().num == 2
+    finally:
+        q.close()
+
+
+def test_ringbuffer_pickle(ctx):
+    q = ringbuffer.RingBufferQueue(ctx, pb.Record, 1024)
+    try:
+        q.put(_record(1))
+        # locks can only be pickled while spawning a process
+        state = q.__getstate__()
+        other = ringbuffer.RingBufferQueue.__new__(ringbuffer.RingBufferQueue)
+        other.__setstate__(state)
+        assert other.get().num == 1
+        other.close()
+        q.put(_record(2))
+        assert q.get().num == 2
+    finally:
+        q.close()
+
+
+def test_ringbuffer_process(ctx):
+    count = 500
+    q = ringbuffer.RingBufferQueue(ctx, pb.Record, 512)
+    result_q = ctx.Queue()
+    p = ctx.Process(target=_consume, args=(q, result_q, count))
+    p.start()
+    try:
+        for i in range(count):
+            q.put(_record(i, 1000 if i % 100 == 0 else i % 50))
+        nums, lines = result_q.get(timeout=30)
+        p.join(timeout=30)
+    finally:
+        q.close()
+    assert nums == list(range(count))
+    assert lines == sum(1000 if i % 100 == 0 else i % 50 for i in range(count))
@@ -1,3 +1,4 @@
+import json
 import os
 import pytest
 from six.moves import queue
@@ -7,6 +8,7 @@ import shutil
 import sys
 
 import wandb
+from wandb.proto import wandb_internal_pb2
 from wandb.util import mkdir_exists_ok
 
 # TODO: consolidate dynamic imports
@@ -14,10 +16,14 @@ PY3 = sys.version_info.major == 3 and sys.version_info.minor >= 6
 if PY3:
     from wandb.sdk.internal.handler import HandleManager
     from wandb.sdk.internal.sender import SendManager
+    from wandb.sdk.internal.writer import WriteManager
+    from wandb.sdk.internal import datastore
     from wandb.sdk.interface.interface import BackendSender
 else:
     from wandb.sdk_py27.internal.handler import HandleManager
     from wandb.sdk_py27.internal.sender import SendManager
+    from wandb.sdk_py27.internal.writer import WriteManager
+    from wandb.sdk_py27.internal import datastore
     from wandb.sdk_py27.interface.interface import BackendSender
 
 
@@ -568,4 +574,257 @@ def test_upgrade_removed(
     assert not ret.yank_message
 
 
+def _history_record(**row):
+    history = wandb_internal_pb2.HistoryRecord()
+    for k, v in row.items():
+        item = history.item.add()
+        item.key = k
+        item.value_json = json.dumps(v)
+    return wandb_internal_pb2.Record(history=history)
+
+
+def _history_proto(**row):
+    return _history_record(**row).history
+
+
+def _summary_updates(record):
+    return {item.key: json.loads(item.value_json) for item in record.summary.update}
+
+
+def test_handler_summary_delta(hm, sender_q):
+    hm.handle(_history_record(loss=0.5, acc=0.1))
+    hm.handle(_history_record(loss=0.25))
+    records = [sender_q.get() for _ in range(sender_q.qsize())]
+    summaries = [r for r in records if r.WhichOneof("record_type") == "summary"]
+    assert len(summaries) == 2
+    assert _summary_updates(summaries[0]) == {"loss": 0.5, "acc": 0.1}
+    assert _summary_updates(summaries[1]) == {"loss": 0.25}
+
+
+def test_handler_summary_flush_snapshot(hm, sender_q, writer_q):
+    hm.handle(_history_record(loss=0.5, acc=0.1))
+    hm.handle(_history_record(loss=0.25))
+    while not writer_q.empty():
+        writer_q.get()
+    hm._save_summary(flush=True)
+    record = writer_q.get()
+    assert _summary_updates(record) == {"loss": 0.25, "acc": 0.1}
+
+
+def test_handler_history_batch(hm, sender_q, writer_q):
+    record = wandb_internal_pb2.Record()
+    record.history_batch.history.add().CopyFrom(_history_proto(loss=0.5, acc=0.1))
+    record.history_batch.history.add().CopyFrom(_history_proto(loss=0.25))
+    hm.handle(record)
+    records = [sender_q.get() for _ in range(sender_q.qsize())]
+    assert [r.WhichOneof("record_type") for r in records] == [
+        "history_batch",
+        "summary",
+    ]
+    assert _summary_updates(records[1]) == {"loss": 0.25, "acc": 0.1}
+    assert writer_q.get().WhichOneof("record_type") == "history_batch"
+
+
+def test_interface_history_batch_rows(record_q):
+    interface = BackendSender(
+        record_q=record_q, history_batch_rows=3, history_batch_seconds=60
+    )
+    for i in range(4):
+        interface._publish_history(_history_proto(step=i))
+    assert record_q.qsize() == 1
+    record = record_q.get()
+    assert len(record.history_batch.history) == 3
+    interface.flush_history()
+    record = record_q.get()
+    assert len(record.history_batch.history) == 1
+
+
+def test_interface_history_batch_ordering(record_q):
+    interface = BackendSender(
+        record_q=record_q, history_batch_rows=100, history_batch_seconds=60
+    )
+    interface._publish_history(_history_proto(step=0))
+    interface.publish_files({"files": [("test.txt", "live")]})
+    assert record_q.get().WhichOneof("record_type") == "history_batch"
+    assert record_q.get().WhichOneof("record_type") == "files"
+
+
+def test_interface_history_batch_timeout(record_q):
+    interface = BackendSender(
+        record_q=record_q, history_batch_rows=100, history_batch_seconds=0.05
+    )
+    interface._publish_history(_history_proto(step=0))
+    record = record_q.get(timeout=5)
+    assert len(record.history_batch.history) == 1
+
+
+def test_interface_history_batch_publish_failure(record_q, mocker):
+    interface = BackendSender(
+        record_q=record_q, history_batch_rows=2, history_batch_seconds=60
+    )
+    put = mocker.patch.object(record_q, "put", side_effect=Exception("shutdown"))
+    interface._publish_history(_history_proto(step=0))
+    with pytest.raises(Exception):
+        interface._publish_history(_history_proto(step=1))
+    # the rows are kept and published with the next flush
+    put.side_effect = None
+    interface._publish_history(_history_proto(step=2))
+    record = put.call_args[0][0]
+    assert len(record.history_batch.history) == 3
+
+
+def _read_summary(sm):
+    with open(os.path.join(sm._settings.files_dir, "wandb-summary.json")) as f:
+        return json.load(f)
+
+
+def test_sender_summary_delta(sm):
+    mkdir_exists_ok(sm._settings.files_dir)
+    summary = wandb_internal_pb2.SummaryRecord()
+    summary.update.add(key="loss", value_json="0.5")
+    summary.update.add(key="acc", value_json="0.1")
+    sm.send(wandb_internal_pb2.Record(summary=summary))
+    summary = wandb_internal_pb2.SummaryRecord()
+    summary.update.add(key="loss", value_json="0.25")
+    summary.remove.add(key="acc")
+    sm.send(wandb_internal_pb2.Record(summary=summary))
+    sm.finish()
+    assert _read_summary(sm) == {"loss": 0.25}
+
+
+def test_sender_summary_write_interval(sm, mocker):
+    mkdir_exists_ok(sm._settings.files_dir)
+    sm._settings.summary_write_seconds = 60
+    for i in range(3):
+        summary = wandb_internal_pb2.SummaryRecord()
+        summary.update.add(key="loss", value_json=json.dumps(i))
+        sm.send(wandb_internal_pb2.Record(summary=summary))
+    # only the first summary is written until the interval passes
+    assert _read_summary(sm) == {"loss": 0}
+    sm.debounce()
+    assert _read_summary(sm) == {"loss": 0}
+    mocker.patch("time.time", return_value=time.time() + 61)
+    sm.debounce()
+    assert _read_summary(sm) == {"loss": 2}
+
+
 # TODO: test other sender methods
+
+
+def test_writer_fsync_on_defer(runner, test_settings, mocker):
+    fsync = mocker.patch("os.fsync")
+    with runner.isolated_filesystem():
+        test_settings.root_dir = os.getcwd()
+        test_settings.sync_file_fsync = "defer"
+        mkdir_exists_ok(os.path.dirname(test_settings.sync_file))
+        wm = WriteManager(settings=test_settings, record_q=None, result_q=None)
+        wandb._set_internal_process()
+        wm.write(_history_record(step=0))
+        assert os.stat(test_settings.sync_file).st_size == 0
+        wm.debounce(idle=False)
+        assert os.stat(test_settings.sync_file).st_size == 0
+        defer = wandb_internal_pb2.Record()
+        defer.request.defer.state = defer.request.defer.BEGIN
+        defer.control.local = True
+        wm.write(defer)
+        assert fsync.call_count == 1
+        size = os.stat(test_settings.sync_file).st_size
+        assert size > 0
+        wm.write(defer)
+        assert fsync.call_count == 1
+        wm.finish()
+        assert os.stat(test_settings.sync_file).st_size == size
+
+
+def test_writer_resume_appends(runner, test_settings):
+    with runner.isolated_filesystem():
+        test_settings.root_dir = os.getcwd()
+        test_settings.resume = "allow"
+        test_settings.mode = "offline"
+        wandb._set_internal_process()
+        fname = test_settings.sync_file
+        previous = os.path.join(
+            os.path.dirname(os.path.dirname(fname)),
+            "offline-run-20200101_000000-" + test_settings.run_id,
+            os.path.basename(fname),
+        )
+        mkdir_exists_ok(os.path.dirname(previous))
+        mkdir_exists_ok(os.path.dirname(fname))
+        ds = datastore.DataStore()
+        ds.open_for_write(previous)
+        ds.write(_history_record(_step=0))
+        ds.close()
+
+        wm = WriteManager(settings=test_settings, record_q=None, result_q=None)
+        wm.write(_history_record(_step=1))
+        wm.finish()
+
+        # the log moved, so syncing the old run dir doesn't upload it twice
+        assert not os.path.exists(previous)
+        reader = datastore.DataStoreReader(fname)
+        steps = []
+        for data in reader:
+            record = wandb_internal_pb2.Record()
+            record.ParseFromString(data)
+            steps.append(json.loads(record.history.item[0].value_json))
+        reader.close()
+        assert steps == [0, 1]
+
+
+def test_writer_resume_skips_synced(runner, test_settings):
+    with runner.isolated_filesystem():
+        test_settings.root_dir = os.getcwd()
+        test_settings.resume = "allow"
+        test_settings.mode = "offline"
+        wandb._set_internal_process()
+        fname = test_settings.sync_file
+        previous = os.path.join(
+            os.path.dirname(os.path.dirname(fname)),
+            "offline-run-20200101_000000-" + test_settings.run_id,
+            os.path.basename(fname),
+        )
+        mkdir_exists_ok(os.path.dirname(previous))
+        mkdir_exists_ok(os.path.dirname(fname))
+        ds = datastore.DataStore()
+        ds.open_for_write(previous)
+        ds.write(_history_record(_step=0))
+        ds.close()
+        open(previous + ".synced", "w").close()
+
+        wm = WriteManager(settings=test_settings, record_q=None, result_q=None)
+        wm.write(_history_record(_step=1))
+        wm.finish()
+
+        reader = datastore.DataStoreReader(fname)
+        assert len(list(reader)) == 1
+        reader.close()
+        assert os.path.exists(previous)
+
+
+def test_writer_resume_online(runner, test_settings):
+    with runner.isolated_filesystem():
+        test_settings.root_dir = os.getcwd()
+        test_settings.resume = "allow"
+        wandb._set_internal_process()
+        fname = test_settings.sync_file
+        previous = os.path.join(
+            os.path.dirname(os.path.dirname(fname)),
+            "run-20200101_000000-" + test_settings.run_id,
+            os.path.basename(fname),
+        )
+        mkdir_exists_ok(os.path.dirname(previous))
+        mkdir_exists_ok(os.path.dirname(fname))
+        ds = datastore.DataStore()
+        ds.open_for_write(previous)
+        ds.write(_history_record(_step=0))
+        ds.close()
+
+        wm = WriteManager(settings=test_settings, record_q=None, result_q=None)
+        wm.write(_history_record(_step=1))
+        wm.finish()
+
+        # online runs streamed their history, the earlier log is left alone
+        reader = datastore.DataStoreReader(fname)
+        assert len(list(reader)) == 1
+        reader.close()
+        assert os.path.exists(previous)
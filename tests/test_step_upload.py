@@ -0,0 +1,161 @@
+"""step_upload tests."""
+
+import threading
+import time
+
+from six.moves import queue
+from wandb.filesync import stats, step_upload
+
+
+class Recorder(object):
+    """Builds save_fn's which record the upload order and concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.order = []
+        self.running = {}
+        self.max_running = 0
+        self.max_same_name = 0
+        self._lock = threading.Lock()
+
+    def save_fn(self, save_name):
+        def save(progress):
+            with self._lock:
+                self.order.append(save_name)
+                self.running[save_name] = self.running.get(save_name, 0) + 1
+                self.max_same_name = max(self.max_same_name, self.running[save_name])
+                self.max_running = max(self.max_running, sum(self.running.values()))
+            time.sleep(self.delay)
+            with self._lock:
+                self.running[save_name] -= 1
+            return False
+
+        return save
+
+
+def _upload(tmpdir, name, size, save_fn, md5=None, is_manifest=False):
+    path = tmpdir.join(name)
+    path.write("x" * size)
+    return step_upload.RequestUpload(
+        str(path), name, None, md5, False, save_fn, md5, is_manifest
+    )
+
+
+def _run(events, max_jobs):
+    event_queue = queue.Queue()
+    file_stats = stats.Stats()
+    step = step_upload.StepUpload(None, file_stats, event_queue, max_jobs, silent=True)
+    for event in events:
+        # like StepChecksum, stats of files with a save_fn are keyed by path
+        stats_name = event.path if event.save_fn else event.save_name
+        file_stats.init_file(stats_name, len(event.save_name))
+        event_queue.put(event)
+    event_queue.put(step_upload.RequestFinish())
+    step.start()
+    step._thread.join(10)
+    assert not step.is_alive()
+    return step, file_stats
+
+
+def test_step_upload_bounded(tmpdir):
+    recorder = Recorder()
+    events = [
+        _upload(tmpdir, "f%d" % i, 10, recorder.save_fn("f%d" % i)) for i in range(12)
+    ]
+    step, file_stats = _run(events, 3)
+    assert sorted(recorder.order) == sorted("f%d" % i for i in range(12))
+    assert recorder.max_running <= 3
+    assert len(step._workers) == 3
+    assert all(not w.is_alive() for w in step._workers)
+    throughput = file_stats.throughput()
+    assert throughput["completed_files"] == 12
+    assert throughput["files_per_sec"] > 0
+
+
+def test_step_upload_smallest_first(tmpdir):
+    recorder = Recorder(delay=0.01)
+    # the first upload occupies the only worker while the rest are queued
+    events = [_upload(tmpdir, "first", 1, recorder.save_fn("first"))]
+    for name, size in (("large", 1000), ("medium", 100), ("small", 10)):
+        events.append(_upload(tmpdir, name, size, recorder.save_fn(name)))
+    _run(events, 1)
+    assert recorder.order == ["first", "small", "medium", "large"]
+
+
+def test_step_upload_same_name_serialized(tmpdir):
+    recorder = Recorder()
+    events = [
+        _upload(tmpdir, "same", 10, recorder.save_fn("same")),
+        _upload(tmpdir, "other", 10, recorder.save_fn("other")),
+        _upload(tmpdir, "same", 10, recorder.save_fn("same")),
+        _upload(tmpdir, "same", 10, recorder.save_fn("same")),
+    ]
+    step, _ = _run(events, 4)
+    assert recorder.order.count("same") == 3
+    assert recorder.max_same_name == 1
+    assert not step._blocked_jobs
+
+
+class FailingApi(object):
+    """Fails to get upload urls, like a CommError from the backend."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_project(self):
+        return "project"
+
+    def upload_urls(self, project, files):
+        self.calls += 1
+        raise Exception("upload_urls failed")
+
+
+def test_step_upload_survives_failed_jobs(tmpdir):
+    recorder = Recorder(delay=0.01)
+    api = FailingApi()
+    # the failing uploads are smaller, so they start first
+    events = [_upload(tmpdir, "bad%d" % i, 1, None) for i in range(5)]
+    events += [
+        _upload(tmpdir, "good%d" % i, 10, recorder.save_fn("good%d" % i))
+        for i in range(3)
+    ]
+    event_queue = queue.Queue()
+    file_stats = stats.Stats()
+    step = step_upload.StepUpload(api, file_stats, event_queue, 2, silent=True)
+    for event in events:
+        file_stats.init_file(event.save_name, 1)
+        event_queue.put(event)
+    event_queue.put(step_upload.RequestFinish())
+    step.start()
+    step._thread.join(10)
+    assert not step.is_alive()
+    assert api.calls == 5
+    assert sorted(recorder.order) == ["good0", "good1", "good2"]
+    assert file_stats.throughput()["completed_files"] == 8
+
+
+def test_step_upload_manifest_last(tmpdir):
+    recorder = Recorder(delay=0.01)
+    events = [_upload(tmpdir, "first", 1, recorder.save_fn("first"))]
+    events.append(
+        _upload(
+            tmpdir, "manifest", 1, recorder.save_fn("manifest"), "m", is_manifest=True
+        )
+    )
+    # artifact files carry their digest as md5 but aren't manifests
+    for name, size in (("large", 1000), ("small", 10)):
+        events.append(_upload(tmpdir, name, size, recorder.save_fn(name), name))
+    _run(events, 1)
+    assert recorder.order == ["first", "small", "large", "manifest"]
+
+
+def test_step_upload_finishes_stats_by_path(tmpdir):
+    recorder = Recorder(delay=0.01)
+    events = [
+        _upload(tmpdir, "a", 10, recorder.save_fn("a")),
+        _upload(tmpdir, "bb", 10, recorder.save_fn("bb")),
+    ]
+    _, file_stats = _run(events, 2)
+    throughput = file_stats.throughput()
+    assert throughput["completed_files"] == 2
+    assert throughput["completed_bytes"] == 3
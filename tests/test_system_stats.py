@@ -0,0 +1,89 @@
+"""system stats sampler tests."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+import wandb
+
+PY3 = sys.version_info.major == 3 and sys.version_info.minor >= 6
+if PY3:
+    from wandb.sdk.internal import stats
+    from wandb.sdk.internal.settings_static import SettingsStatic
+else:
+    from wandb.sdk_py27.internal import stats
+    from wandb.sdk_py27.internal.settings_static import SettingsStatic
+
+
+class FakeInterface(object):
+    def __init__(self):
+        self.published = []
+
+    def publish_stats(self, stats):
+        self.published.append(stats)
+
+
+def _system_stats(**settings):
+    interface = FakeInterface()
+    system_stats = stats.SystemStats(
+        pid=os.getpid(), interface=interface, settings=SettingsStatic(settings)
+    )
+    return system_stats, interface
+
+
+@pytest.mark.parametrize(
+    "aggregation,expected", [("mean", 2.0), ("max", 3.0), ("last", 1.0)]
+)
+def test_stats_aggregation(aggregation, expected):
+    system_stats, interface = _system_stats(_stats_aggregation=aggregation)
+    system_stats.sampler = {"cpu": [2.0, 3.0, 1.0]}
+    system_stats.flush({"cpu": 0.0, "network": {"sent": 1, "recv": 2}})
+    assert interface.published == [{"cpu": expected, "network": {"sent": 1, "recv": 2}}]
+    assert system_stats.sampler == {}
+
+
+def test_stats_default_settings():
+    system_stats, _ = _system_stats(**dict(wandb.Settings()))
+    assert system_stats.sample_rate_seconds == 1
+    assert system_stats.samples_to_average == 4
+
+
+def test_stats_settings():
+    system_stats, _ = _system_stats(system_sample_seconds=0.1, system_samples=100)
+    assert system_stats.sample_rate_seconds == 0.5
+    assert system_stats.samples_to_average == 30
+    assert system_stats.aggregation == "mean"
+    # the process handle is created once
+    assert system_stats.proc is system_stats.proc
+
+
+def test_stats_children_and_per_cpu():
+    system_stats, _ = _system_stats(_stats_children=True, _stats_per_cpu=True)
+    # the base process is our parent, so we are not counted but a child is
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(10)"])
+    try:
+        sample = system_stats.stats()
+    finally:
+        child.kill()
+        child.wait()
+    assert sample["proc.children.count"] >= 1
+    assert sample["proc.children.memory.rssMB"] > 0
+    cpus = [k for k in sample if k.startswith("cpu.")]
+    assert len(cpus) == len(system_stats._cpu_keys) > 0
+
+
+def test_stats_cost_budget():
+    system_stats, interface = _system_stats(
+        system_sample_seconds=0.5, system_samples=2, _stats_cpu_budget=1e-9
+    )
+    system_stats.start()
+    time.sleep(0.2)
+    system_stats.shutdown()
+    cost = system_stats.cost()
+    assert cost["samples"] >= 1
+    assert cost["cpu_seconds"] > 0
+    # sampling is far more expensive than the budget allows, so back off
+    assert system_stats._sample_interval() > 0.5
+    assert len(interface.published) >= 1
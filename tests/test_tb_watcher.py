@@ -1,11 +1,17 @@
 import pytest
 import sys
+import time
+
+from six.moves import queue
+from wandb.proto import wandb_internal_pb2
 
 PY3 = sys.version_info.major == 3 and sys.version_info.minor >= 6
 if PY3:
     from wandb.sdk.internal import tb_watcher
+    from wandb.sdk.lib import inotify
 else:
     from wandb.sdk_py27.internal import tb_watcher
+    from wandb.sdk_py27.lib import inotify
 
 
 class TestIsTfEventsFileCreatedBy:
@@ -66,3 +72,143 @@ class TestIsTfEventsFileCreatedBy:
             tb_watcher.is_tfevents_file_created_by("me.193.tfevents", "me", 193)
             is False
         )
+
+
+class FakeDirWatcher(object):
+    def __init__(self, logdir, events=0):
+        self.logdir = logdir
+        self.events = events
+        self.polls = 0
+
+    def poll(self):
+        self.polls += 1
+        return self.events
+
+
+@pytest.fixture()
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(tb_watcher, "MIN_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(tb_watcher, "MAX_POLL_SECONDS", 0.4)
+    monkeypatch.setattr(tb_watcher, "MAX_POLL_SECONDS_INOTIFY", 10)
+    monkeypatch.setattr(tb_watcher, "SHUTDOWN_DELAY", 0)
+
+
+def test_scheduler_backoff(tmpdir, fast_polls):
+    scheduler = tb_watcher.TBDirScheduler(use_inotify=False)
+    busy = FakeDirWatcher(str(tmpdir.mkdir("busy")), events=2)
+    idle = FakeDirWatcher(str(tmpdir.mkdir("idle")))
+    scheduler.start()
+    scheduler.add(busy)
+    scheduler.add(idle)
+    time.sleep(1)
+    scheduler.finish()
+    # idle polls back off to 0.05, 0.1, 0.2, 0.4, 0.4 ...
+    assert busy.polls >= 10
+    assert idle.polls <= 8
+    stats = scheduler.stats()
+    assert stats[busy.logdir]["events"] == busy.polls * 2
+    assert stats[busy.logdir]["events_per_sec"] > 0
+    assert stats[idle.logdir]["events"] == 0
+
+
+@pytest.mark.skipif(not inotify.available(), reason="requires inotify")
+def test_scheduler_inotify(tmpdir, fast_polls):
+    scheduler = tb_watcher.TBDirScheduler(use_inotify=True)
+    watcher = FakeDirWatcher(str(tmpdir))
+    scheduler.start()
+    scheduler.add(watcher)
+    # idle polls back off to 0.05, 0.1, 0.2, 0.4, 0.8 ...
+    time.sleep(1.2)
+    polls = watcher.polls
+    time.sleep(0.2)
+    assert watcher.polls == polls
+    tmpdir.join("events.out.tfevents").write("x")
+    time.sleep(0.2)
+    assert watcher.polls > polls
+    polls = watcher.polls
+    scheduler.finish()
+    # one last poll on shutdown
+    assert watcher.polls == polls + 1
+
+
+class FakeProtoEvent(object):
+    def __init__(self, wall_time, step, value):
+        self.wall_time = wall_time
+        self.step = step
+        self.value = value
+
+
+class FakeInterface(object):
+    def __init__(self):
+        self.batches = []
+
+    def publish_history_batch(self, rows, run=None):
+        self.batches.append([dict(row) for row in rows])
+
+
+class FakeTBWatcher(object):
+    def __init__(self):
+        self._interface = FakeInterface()
+
+
+def _handle_event(event, history):
+    # rolls up events by step like wandb.tensorboard.log
+    if history._data and history._data["s"] != event.event.step:
+        history.add({})
+    history._row_update({event.namespace: event.event.value, "s": event.event.step})
+
+
+@pytest.fixture()
+def consumer(test_settings, monkeypatch):
+    monkeypatch.setattr(tb_watcher, "BATCH_ROWS", 3)
+    event_queue = queue.PriorityQueue()
+
+    def make(delay):
+        c = tb_watcher.TBEventConsumer(
+            FakeTBWatcher(),
+            event_queue,
+            wandb_internal_pb2.RunRecord(),
+            test_settings,
+            delay=delay,
+        )
+        c._handle_event = _handle_event
+        return c
+
+    def put(wall_time, step, namespace, value):
+        event_queue.put(
+            tb_watcher.Event(FakeProtoEvent(wall_time, step, value), namespace)
+        )
+
+    make.put = put
+    return make
+
+
+def test_consumer_reorders_and_merges_steps(consumer):
+    c = consumer(delay=100)
+    # two tfevent files interleaved out of order
+    for i in (2, 0, 3, 1):
+        consumer.put(10 + i, i, "train", i)
+    for i in (1, 3, 0, 2):
+        consumer.put(10.5 + i, i, "val", -i)
+    c.start()
+    time.sleep(0.2)
+    assert c._tbwatcher._interface.batches == []
+    c.finish()
+    batches = c._tbwatcher._interface.batches
+    rows = [row for batch in batches for row in batch]
+    assert rows == [{"train": i, "val": -i, "s": i, "_step": i} for i in range(4)]
+    assert [len(b) for b in batches] == [3, 1]
+
+
+def test_consumer_watermark_release(consumer):
+    c = consumer(delay=5)
+    for i in range(20):
+        consumer.put(float(i), i, "train", i)
+    c.start()
+    time.sleep(1.5)
+    # events more than 5 seconds older than the newest one were released
+    rows = [row for batch in c._tbwatcher._interface.batches for row in batch]
+    assert [row["s"] for row in rows] == list(range(14))
+    c.finish()
+    rows = [row for batch in c._tbwatcher._interface.batches for row in batch]
+    assert [row["s"] for row in rows] == list(range(20))
@@ -1,6 +1,8 @@
 """Mock Server for simple calls the cli and public api make"""
 
 from flask import Flask, request, g
+import gzip
+import io
 import os
 import sys
 from datetime import datetime, timedelta
@@ -46,6 +48,8 @@ def mock_server(mocker):
     mocker.patch("wandb.apis.public.requests", mock)
     mocker.patch("wandb.util.requests", mock)
     mocker.patch("wandb.wandb_sdk.wandb_artifacts.requests", mock)
+    # don't reuse a storage session created with another test's mock
+    mocker.patch("wandb.wandb_sdk.wandb_artifacts._session", None)
     print("Patched requests everywhere", os.getpid())
     return mock
 
@@ -394,6 +398,8 @@ def create_app(user_ctx=None):
                     }
                 }
             )
+        if "query SweepRuns(" in body["query"]:
+            return json.dumps({"data": {"project": {"runs": paginated(run(ctx), ctx)}}})
         if "query Sweep(" in body["query"]:
             return json.dumps(
                 {
@@ -745,7 +751,11 @@ index 30d74d2..9a2c773 100644
     def file_stream(entity, project, run):
         ctx = get_ctx()
         ctx["file_stream"] = ctx.get("file_stream", [])
-        ctx["file_stream"].append(request.get_json())
+        if request.headers.get("Content-Encoding") == "gzip":
+            data = gzip.GzipFile(fileobj=io.BytesIO(request.get_data())).read()
+            ctx["file_stream"].append(json.loads(data.decode("utf-8")))
+        else:
+            ctx["file_stream"].append(request.get_json())
         return json.dumps({"exitcode": None, "limits": {}})
 
     @app.route("/api/v1/namespaces/default/pods/test")
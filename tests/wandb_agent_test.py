@@ -1,6 +1,83 @@
 """Agent tests"""
+import multiprocessing
+import sys
+import time
+
 import pytest
 import wandb
+import yaml
+from wandb import wandb_agent
+
+
+class FakeAgentApi(object):
+    """Sends one run to every agent without running runs."""
+
+    def __init__(self, runs, seconds):
+        self.runs = ["run-%d" % i for i in range(runs)]
+        self.seconds = seconds
+        self.agents = 0
+        self.heartbeats = []
+        self.running = {}
+        self.max_running = 0
+
+    def sweep(self, *args, **kwargs):
+        command = [sys.executable, "-c", "import time; time.sleep(%s)" % self.seconds]
+        return {"config": yaml.dump({"command": command})}
+
+    def register_agent(self, host, sweep_id=None):
+        self.agents += 1
+        return {"id": "agent-%d" % self.agents}
+
+    def agent_heartbeat(self, agent_id, metrics, run_states):
+        self.heartbeats.append((agent_id, run_states))
+        self.running[agent_id] = len(run_states)
+        self.max_running = max(self.max_running, sum(self.running.values()))
+        if run_states or not self.runs:
+            return []
+        run_id = self.runs.pop(0)
+        return [{"type": "run", "run_id": run_id, "program": "train.py", "args": {}}]
+
+
+@pytest.fixture()
+def agent_env(monkeypatch, tmpdir):
+    monkeypatch.setenv(wandb.env.DIR, str(tmpdir))
+    monkeypatch.setenv(wandb.env.SWEEP_ID, "test-sweep-id")
+    monkeypatch.setenv(wandb.env.RUN_ID, "")
+    monkeypatch.setenv(wandb.env.SWEEP_PARAM_PATH, "")
+
+
+def test_agent_slots(agent_env):
+    api = FakeAgentApi(runs=4, seconds=0.5)
+    agent = wandb_agent.Agent(
+        api, multiprocessing.Queue(), sweep_id="test-sweep-id", count=4, slots=2
+    )
+    start = time.time()
+    agent.run()
+    elapsed = time.time() - start
+    assert api.agents == 2
+    assert api.runs == []
+    assert agent._finished == 4
+    assert api.max_running == 2
+    # two runs at a time, the agent wakes up as soon as a run exits rather
+    # than at the next heartbeat
+    assert elapsed < agent.POLL_INTERVAL
+    assert set(agent_id for agent_id, _ in api.heartbeats) == {"agent-1", "agent-2"}
+
+
+def test_agent_heartbeat_backoff(agent_env):
+    agent = wandb_agent.Agent(FakeAgentApi(runs=0, seconds=0), multiprocessing.Queue())
+    intervals = []
+    for _ in range(4):
+        agent._update_heartbeat_interval(False)
+        intervals.append(agent._heartbeat_interval)
+    assert intervals == [10, 20, 30, 30]
+    agent._update_heartbeat_interval(True)
+    assert agent._heartbeat_interval == agent.POLL_INTERVAL
+
+
+def test_agent_slots_with_function():
+    with pytest.raises(wandb_agent.AgentError):
+        wandb.agent("test-sweep-id", function=lambda: None, slots=2)
 
 
 @pytest.mark.skip(reason="This test doesn't work yet")
@@ -1,3 +1,5 @@
+import base64
+import hashlib
 import os
 import sys
 import pytest
@@ -7,6 +9,7 @@ import shutil
 import wandb.data_types as data_types
 import numpy as np
 import pandas as pd
+import requests
 import time
 
 
@@ -121,6 +124,23 @@ def test_add_one_file(runner):
         }
 
 
+def test_add_file_hardlink_materialize(runner, monkeypatch):
+    monkeypatch.setenv("WANDB_ARTIFACT_MATERIALIZE", "hardlink")
+    # contents that aren't in the cache yet
+    contents = "hello %s" % time.time()
+    with runner.isolated_filesystem():
+        with open("file1.txt", "w") as f:
+            f.write(contents)
+        artifact = wandb.Artifact(type="dataset", name="my-arty")
+        artifact.add_file("file1.txt")
+        # rewriting the file in place doesn't change the cached object
+        with open("file1.txt", "w") as f:
+            f.write("bye")
+        entry = artifact.manifest.entries["file1.txt"]
+        with open(entry.local_path) as f:
+            assert f.read() == contents
+
+
 def test_add_named_file(runner):
     with runner.isolated_filesystem():
         with open("file1.txt", "w") as f:
@@ -815,3 +835,285 @@ def test_add_partition_folder(runner):
             "digest": "uo/SjoAO+O7pcSfg+yhlDg==",
             "size": 61,
         }
+
+
+def test_digest_cache(runner, tmpdir):
+    if sys.version_info >= (3, 6):
+        from wandb.sdk.interface import artifacts
+    else:
+        from wandb.sdk_py27.interface import artifacts
+
+    cache = artifacts.ArtifactsCache(str(tmpdir.join("cache")))
+    with runner.isolated_filesystem():
+        with open("file1.txt", "w") as f:
+            f.write("hello")
+        old = time.time() - 60
+        os.utime("file1.txt", (old, old))
+
+        assert cache.md5_file_b64("file1.txt") == "XUFAKrxLKna5cZ2REBfFkg=="
+        assert cache.md5_file_b64("file1.txt") == "XUFAKrxLKna5cZ2REBfFkg=="
+        assert (cache.digest_hits, cache.digest_misses) == (1, 1)
+        # a second process sees the same entries
+        other = artifacts.ArtifactsCache(str(tmpdir.join("cache")))
+        assert other.md5_file_hex("file1.txt") == "5d41402abc4b2a76b9719d911017c592"
+        assert other.digest_hits == 1
+
+        # changing the file invalidates its entry
+        with open("file1.txt", "w") as f:
+            f.write("hello!")
+        os.utime("file1.txt", (old + 1, old + 1))
+        assert cache.md5_file_b64("file1.txt") == "Wo3TrQdWqT3tcrgjsZ3Ydw=="
+        assert cache.digest_misses == 2
+
+        # recently modified files are hashed but not cached
+        with open("file2.txt", "w") as f:
+            f.write("hello")
+        cache.md5_file_b64("file2.txt")
+        cache.md5_file_b64("file2.txt")
+        assert cache.digest_misses == 4
+
+
+class FakeStorageResponse(object):
+    def __init__(self, status_code, data, headers=None, fail_after=None):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers or {"Content-Length": str(len(data))}
+        self.fail_after = fail_after
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError("error", response=self)
+
+    def iter_content(self, chunk_size=1024):
+        for i in range(0, len(self.data), chunk_size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection reset")
+            yield self.data[i : i + chunk_size]
+
+
+class FakeStorageSession(object):
+    """Serves one object, honoring range requests if supports_range is set."""
+
+    def __init__(self, data, supports_range=True, fail_after=None):
+        self.data = data
+        self.supports_range = supports_range
+        self.fail_after = fail_after
+        self.ranges = []
+
+    def get(self, url, headers=None, **kwargs):
+        byte_range = (headers or {}).get("Range")
+        self.ranges.append(byte_range)
+        fail_after, self.fail_after = self.fail_after, None
+        if byte_range and self.supports_range:
+            start = int(byte_range[len("bytes=") : -1])
+            return FakeStorageResponse(206, self.data[start:], fail_after=fail_after)
+        return FakeStorageResponse(200, self.data, fail_after=fail_after)
+
+
+@pytest.fixture()
+def storage_policy(tmpdir):
+    if sys.version_info >= (3, 6):
+        from wandb.sdk import wandb_artifacts
+        from wandb.sdk.interface import artifacts
+    else:
+        from wandb.sdk_py27 import wandb_artifacts
+        from wandb.sdk_py27.interface import artifacts
+
+    class FakeApi(object):
+        api_key = "key"
+
+    class FakeArtifact(object):
+        entity = "entity"
+
+    policy = wandb_artifacts.WandbStoragePolicy()
+    policy.DOWNLOAD_CHUNK_BYTES = 1024
+    policy._cache = artifacts.ArtifactsCache(str(tmpdir.join("cache")))
+    policy._api = FakeApi()
+    policy._file_url = lambda api, entity, entry: "http://storage/object"
+    data = bytes(bytearray(i % 251 for i in range(5000)))
+    entry = wandb_artifacts.ArtifactManifestEntry(
+        "data.bin",
+        None,
+        base64.b64encode(hashlib.md5(data).digest()).decode("ascii"),
+        size=len(data),
+    )
+
+    def load(session):
+        policy._session = session
+        return policy.load_file(FakeArtifact(), "data.bin", entry)
+
+    load.data = data
+    load.entry = entry
+    load.policy = policy
+    return load
+
+
+def test_load_file_resumes_partial(storage_policy):
+    session = FakeStorageSession(storage_policy.data, fail_after=2048)
+    path = storage_policy(session)
+    with open(path, "rb") as f:
+        assert f.read() == storage_policy.data
+    assert session.ranges == [None, "bytes=2048-"]
+    assert not os.path.exists(path + ".%d.partial" % os.getpid())
+    assert storage_policy.policy.bytes_downloaded == 5000
+
+    # cached objects aren't downloaded again
+    assert storage_policy(FakeStorageSession(b"")) == path
+
+
+def test_load_file_without_range_support(storage_policy):
+    session = FakeStorageSession(
+        storage_policy.data, supports_range=False, fail_after=2048
+    )
+    path = storage_policy(session)
+    with open(path, "rb") as f:
+        assert f.read() == storage_policy.data
+    assert session.ranges == [None, "bytes=2048-"]
+
+
+def test_load_file_failure_keeps_cache_clean(storage_policy):
+    storage_policy.policy.DOWNLOAD_RETRIES = 0
+    session = FakeStorageSession(storage_policy.data, fail_after=3072)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        storage_policy(session)
+    cache = storage_policy.policy._cache
+    entry = storage_policy.entry
+    path, hit = cache.check_md5_obj_path(entry.digest, entry.size)
+    assert not hit
+    assert os.path.getsize(path + ".%d.partial" % os.getpid()) == 3072
+
+    # a later download continues the partial file
+    session = FakeStorageSession(storage_policy.data)
+    assert storage_policy(session) == path
+    assert session.ranges == ["bytes=3072-"]
+
+
+def test_load_file_corrupt_partial(storage_policy):
+    entry = storage_policy.entry
+    path, _ = storage_policy.policy._cache.check_md5_obj_path(entry.digest, entry.size)
+    # e.g. bytes written by another process into the same partial file
+    with open(path + ".%d.partial" % os.getpid(), "wb") as f:
+        f.write(b"x" * 2048)
+    session = FakeStorageSession(storage_policy.data)
+    assert storage_policy(session) == path
+    with open(path, "rb") as f:
+        assert f.read() == storage_policy.data
+    assert session.ranges == ["bytes=2048-", None]
+
+
+def test_load_file_short_download(storage_policy):
+    session = FakeStorageSession(storage_policy.data[:4000])
+    with pytest.raises(ValueError):
+        storage_policy(session)
+    entry = storage_policy.entry
+    path, hit = storage_policy.policy._cache.check_md5_obj_path(
+        entry.digest, entry.size
+    )
+    assert not hit
+    assert not os.path.exists(path + ".%d.partial" % os.getpid())
+    assert session.ranges == [None, None]
+
+
+def test_load_file_finished_by_other_process(storage_policy):
+    policy = storage_policy.policy
+    entry = storage_policy.entry
+    path, _ = policy._cache.check_md5_obj_path(entry.digest, entry.size)
+
+    class OtherProcessSession(FakeStorageSession):
+        def get(self, url, headers=None, **kwargs):
+            # the object lands in the cache while this download runs
+            with open(path, "wb") as f:
+                f.write(self.data)
+            self.inode = os.stat(path).st_ino
+            return super(OtherProcessSession, self).get(url, headers, **kwargs)
+
+    session = OtherProcessSession(storage_policy.data)
+    assert storage_policy(session) == path
+    # the finished object is used as is rather than replaced
+    assert os.stat(path).st_ino == session.inode
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+
+
+def test_materialize(tmpdir):
+    if sys.version_info >= (3, 6):
+        from wandb.sdk.interface import artifacts
+    else:
+        from wandb.sdk_py27.interface import artifacts
+
+    src = tmpdir.join("src.txt")
+    src.write("hello")
+    old = time.time() - 60
+    os.utime(str(src), (old, old))
+
+    dst = str(tmpdir.join("out", "hardlink.txt"))
+    assert artifacts.materialize(str(src), dst, "hardlink") == "hardlink"
+    assert os.path.samefile(str(src), dst)
+
+    dst = str(tmpdir.join("out", "symlink.txt"))
+    assert artifacts.materialize(str(src), dst, "symlink") == "symlink"
+    assert os.path.islink(dst)
+    dst = str(tmpdir.join("out", "cache.txt"))
+    assert artifacts.materialize(str(src), dst, "symlink", allow_symlink=False)
+    assert not os.path.islink(dst)
+    assert (
+        artifacts.materialize(str(src), dst, "hardlink", allow_hardlink=False) == "copy"
+    )
+    assert not os.path.samefile(str(src), dst)
+
+    # reflinks fall back to a copy on filesystems without copy on write
+    for strategy in ("reflink", "copy"):
+        dst = str(tmpdir.join("out", strategy + ".txt"))
+        assert artifacts.materialize(str(src), dst, strategy) in ("reflink", "copy")
+        assert not os.path.samefile(str(src), dst)
+        assert open(dst).read() == "hello"
+        assert os.stat(dst).st_mtime == os.stat(str(src)).st_mtime
+
+    # replacing a hardlinked file doesn't write through to the linked file
+    other = tmpdir.join("other.txt")
+    other.write("other")
+    dst = str(tmpdir.join("out", "hardlink.txt"))
+    artifacts.materialize(str(other), dst, "copy")
+    assert open(dst).read() == "other"
+    assert src.read() == "hello"
+    assert sorted(os.listdir(str(tmpdir.join("out")))) == [
+        "cache.txt",
+        "copy.txt",
+        "hardlink.txt",
+        "reflink.txt",
+        "symlink.txt",
+    ]
+
+    with pytest.raises(ValueError):
+        artifacts.materialize(str(src), dst, "move")
+
+
+def test_md5_files(tmpdir, monkeypatch):
+    if sys.version_info >= (3, 6):
+        from wandb.sdk.interface import artifacts
+    else:
+        from wandb.sdk_py27.interface import artifacts
+
+    # hash the larger files from memory maps
+    monkeypatch.setattr(artifacts, "HASH_MMAP_MIN_BYTES", 1024)
+    cache = artifacts.ArtifactsCache(str(tmpdir.join("cache")))
+    old = time.time() - 60
+    paths = []
+    expected = {}
+    for i in range(20):
+        path = tmpdir.join("file%d.bin" % i)
+        data = bytes(bytearray(j % 251 for j in range(i * 200)))
+        path.write_binary(data)
+        os.utime(str(path), (old, old))
+        paths.append(str(path))
+        expected[str(path)] = base64.b64encode(hashlib.md5(data).digest()).decode(
+            "ascii"
+        )
+
+    assert cache.md5_files_b64(paths) == expected
+    assert cache.digest_misses == 20
+    assert cache.bytes_hashed == sum(i * 200 for i in range(20))
+    assert cache.md5_files_b64(paths) == expected
+    assert cache.digest_hits == 20
+    # refresh hashes every file again
+    assert cache.md5_files_b64(paths, refresh=True) == expected
+    assert cache.digest_misses == 40
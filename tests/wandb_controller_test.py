@@ -1,4 +1,5 @@
 from wandb import wandb_controller as wc
+import json
 import sys
 import pytest
 
@@ -59,4 +60,133 @@ def test_controller_new(mock_server):
     }
 
 
+class FakeSweepApi(object):
+    """Serves a sweep with runs whose history grows between reads."""
+
+    def __init__(self, runs=100, steps=50):
+        self.runs = {}
+        self.history = {}
+        for i in range(runs):
+            self.add_run("run-%d" % i, steps, "2021-01-01T00:00:00.%03d" % i)
+        self.queries = []
+
+    def add_run(self, name, steps, updated_at):
+        self.runs[name] = {
+            "name": name,
+            "state": "running",
+            "config": "{}",
+            "stopped": False,
+            "shouldStop": False,
+            "summaryMetrics": "{}",
+            "updatedAt": updated_at,
+        }
+        self.history[name] = [{"_step": s, "loss": 1.0 / (s + 1)} for s in range(steps)]
+
+    def log(self, name, steps, updated_at):
+        history = self.history[name]
+        for s in range(len(history), len(history) + steps):
+            history.append({"_step": s, "loss": 1.0 / (s + 1)})
+        self.runs[name]["updatedAt"] = updated_at
+
+    def _run(self, name, specs):
+        run = dict(self.runs[name])
+        if specs is not None:
+            min_step = json.loads(specs).get("minStep", 0)
+            run["sampledHistory"] = [
+                [row for row in self.history[name] if row["_step"] >= min_step]
+            ]
+        return run
+
+    def sweep(self, sweep, specs, include_runs=True):
+        self.queries.append(("sweep", include_runs))
+        obj = {
+            "id": "1234",
+            "name": sweep,
+            "state": "RUNNING",
+            "config": json.dumps({"metric": {"name": "loss", "goal": "minimize"}}),
+            "controller": None,
+            "scheduler": None,
+        }
+        if include_runs:
+            obj["runs"] = [self._run(name, specs) for name in self.runs]
+        return obj
+
+    def sweep_runs(
+        self, sweep, specs=None, updated_since=None, names=None, fields=None
+    ):
+        self.queries.append(("sweep_runs", updated_since, names))
+        if fields == "name":
+            return [{"name": name} for name in self.runs]
+        return [
+            self._run(name, specs)
+            for name, run in self.runs.items()
+            if (names is None or name in names)
+            and (not updated_since or run["updatedAt"] >= updated_since)
+        ]
+
+
+def test_controller_incremental_read(mock_server):
+    c = wc.controller("test", entity="test", project="test")
+    api = FakeSweepApi()
+    c._api = api
+    # the first read from a new backend fetches everything
+    c._runs_updated_at = None
+    c._sweep_object_read_from_backend()
+    full_bytes = c._fetched_bytes
+    assert len(c._sweep_runs) == 100
+    assert len(c._sweep_runs_map["run-3"].history) == 50
+
+    api.log("run-3", 5, "2021-01-01T00:01:00")
+    api.add_run("run-new", 2, "2021-01-01T00:01:00")
+    api.queries = []
+    c._sweep_object_read_from_backend()
+    assert api.queries == [
+        ("sweep", False),
+        # the run updated last is fetched again, its history is not
+        ("sweep_runs", "2021-01-01T00:00:00.099", None),
+        ("sweep_runs", None, ["run-new"]),
+        ("sweep_runs", None, ["run-3"]),
+    ]
+    assert len(c._sweep_runs) == 101
+    history = c._sweep_runs_map["run-3"].history
+    assert [row["_step"] for row in history] == list(range(55))
+    assert len(c._sweep_runs_map["run-new"].history) == 2
+    assert c._fetched_bytes * 20 < full_bytes
+
+    # nothing changed, only the sweep and the runs at the boundary are fetched
+    api.queries = []
+    c._sweep_object_read_from_backend()
+    assert api.queries == [
+        ("sweep", False),
+        ("sweep_runs", "2021-01-01T00:01:00", None),
+    ]
+    assert c._fetched_bytes * 50 < full_bytes
+    assert len(c._sweep_runs_map["run-3"].history) == 55
+
+
+def test_controller_evicts_deleted_runs(mock_server):
+    c = wc.controller("test", entity="test", project="test")
+    api = FakeSweepApi(runs=3)
+    c._api = api
+    c._runs_updated_at = None
+    c._sweep_object_read_from_backend()
+    del api.runs["run-1"]
+    for _ in range(wc.RUNS_LIST_READS - 1):
+        c._sweep_object_read_from_backend()
+    assert "run-1" in c._sweep_runs_map
+    # the run names are listed every RUNS_LIST_READS incremental reads
+    api.queries = []
+    c._sweep_object_read_from_backend()
+    assert api.queries[-1] == ("sweep_runs", None, None)
+    assert sorted(c._sweep_runs_map) == ["run-0", "run-2"]
+    assert [run["name"] for run in c._sweep_obj["runs"]] == ["run-0", "run-2"]
+
+
+def test_controller_read_with_mock_server(mock_server):
+    c = wc.controller("test", entity="test", project="test")
+    c._sweep_object_read_from_backend()
+    assert [r.name for r in c._sweep_runs] == ["test"]
+    assert c._sweep_runs[0].history == [{"loss": 0, "acc": 100}, {"loss": 1, "acc": 0}]
+
+
 # TODO: More controller tests!
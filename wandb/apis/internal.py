@@ -85,6 +85,9 @@ class Api(object):
     def sweep(self, *args, **kwargs):
         return self.api.sweep(*args, **kwargs)
 
+    def sweep_runs(self, *args, **kwargs):
+        return self.api.sweep_runs(*args, **kwargs)
+
     def upsert_sweep(self, *args, **kwargs):
         return self.api.upsert_sweep(*args, **kwargs)
 
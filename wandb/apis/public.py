@@ -1,3 +1,4 @@
+import atexit
 import datetime
 from functools import partial
 import json
@@ -5,9 +6,9 @@ import logging
 import os
 import platform
 import re
-import shutil
 import sys
 import tempfile
+import threading
 import time
 
 from gql import Client, gql
@@ -38,6 +39,8 @@ logger = logging.getLogger(__name__)
 
 # Only retry requests for 20 seconds in the public api
 RETRY_TIMEDELTA = datetime.timedelta(seconds=20)
+# Threads downloading artifact files, shared by all downloads in the process
+ARTIFACT_DOWNLOAD_THREADS = 32
 WANDB_INTERNAL_KEYS = {"_wandb", "wandb_version"}
 PROJECT_FRAGMENT = """fragment ProjectFragment on Project {
     id
@@ -2389,6 +2392,47 @@ class ArtifactCollection(object):
         return "<ArtifactCollection {} ({})>".format(self.name, self.type)
 
 
+_download_pool = None
+_download_pool_lock = threading.Lock()
+_download_worker = threading.local()
+
+
+def _mark_download_worker():
+    _download_worker.active = True
+
+
+def _get_download_pool():
+    global _download_pool
+    with _download_pool_lock:
+        if _download_pool is None:
+            import multiprocessing.dummy  # this uses threads
+
+            _download_pool = multiprocessing.dummy.Pool(
+                ARTIFACT_DOWNLOAD_THREADS, initializer=_mark_download_worker
+            )
+            atexit.register(_close_download_pool)
+        return _download_pool
+
+
+def _close_download_pool():
+    global _download_pool
+    with _download_pool_lock:
+        pool, _download_pool = _download_pool, None
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+
+def _run_downloads(downloads):
+    """Calls the download functions on the shared pool."""
+    if getattr(_download_worker, "active", False):
+        # waiting on the pool from one of its own threads could deadlock
+        for download in downloads:
+            download()
+    else:
+        _get_download_pool().map(lambda download: download(), downloads)
+
+
 class Artifact(object):
     QUERY = gql(
         """
@@ -2665,10 +2709,9 @@ class Artifact(object):
                     or os.stat(cache_path).st_mtime != os.stat(target_path).st_mtime
                 )
                 if need_copy:
-                    util.mkdir_exists_ok(os.path.dirname(target_path))
-                    # We use copy2, which preserves file metadata including modified
-                    # time (which we use above to check whether we should do the copy).
-                    shutil.copy2(cache_path, target_path)
+                    # Every strategy preserves the modified time (which we use
+                    # above to check whether we should do the copy).
+                    artifacts.materialize(cache_path, target_path)
                 return target_path
 
             @staticmethod
@@ -2755,8 +2798,9 @@ class Artifact(object):
         """
         dirpath = root or self._default_root()
         manifest = self._load_manifest()
+        storage_policy = manifest.storage_policy
         nfiles = len(manifest.entries)
-        size = sum(e.size for e in manifest.entries.values())
+        size = sum(e.size or 0 for e in manifest.entries.values())
         log = False
         if nfiles > 5000 or size > 50 * 1024 * 1024:
             termlog(
@@ -2764,23 +2808,48 @@ class Artifact(object):
                 % (self.artifact_name, size / (1024 * 1024), nfiles),
                 newline=False,
             )
+            log = True
         start_time = time.time()
+        files_before = getattr(storage_policy, "files_downloaded", 0)
+        bytes_before = getattr(storage_policy, "bytes_downloaded", 0)
 
         # Force all the files to download into the same directory.
-        # Download in parallel
-        import multiprocessing.dummy  # this uses threads
-
-        pool = multiprocessing.dummy.Pool(32)
-        pool.map(partial(self._download_file, root=dirpath), manifest.entries)
-        if recursive:
-            pool.map(lambda artifact: artifact.download(), self._dependent_artifacts)
-        pool.close()
-        pool.join()
+        downloads = [
+            partial(self._download_file, name, root=dirpath)
+            for name in manifest.entries
+        ]
+        dependents = self._dependent_artifacts if recursive else []
+        # the files of dependent artifacts are downloaded on the same pool
+        for artifact in dependents:
+            root = artifact._default_root()
+            downloads.extend(
+                partial(artifact._download_file, name, root=root)
+                for name in artifact._load_manifest().entries
+            )
+        _run_downloads(downloads)
 
         self._is_downloaded = True
-
+        for artifact in dependents:
+            artifact._is_downloaded = True
+
+        elapsed = max(time.time() - start_time, 1e-6)
+        mb_downloaded = (
+            getattr(storage_policy, "bytes_downloaded", 0) - bytes_before
+        ) / (1024 * 1024)
+        logger.info(
+            "Downloaded artifact %s: %d of %d files fetched, %.2fMB in %.1fs (%.2fMB/s)",
+            self.artifact_name,
+            getattr(storage_policy, "files_downloaded", 0) - files_before,
+            nfiles,
+            mb_downloaded,
+            elapsed,
+            mb_downloaded / elapsed,
+        )
         if log:
-            termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
+            termlog(
+                "Done. %.1fs, %.2fMB/s" % (elapsed, mb_downloaded / elapsed),
+                prefix=False,
+            )
 
         return dirpath
 
@@ -2858,7 +2927,7 @@ class Artifact(object):
         )
         return True
 
-    def verify(self, root=None):
+    def verify(self, root=None, quick=False):
         """Verify an artifact by checksumming its downloaded contents.
 
         Raises a ValueError if the verification fails. Does not verify downloaded
@@ -2867,21 +2936,31 @@ class Artifact(object):
         Arguments:
             root (str, optional): directory to download artifact to. If None
                 artifact will be downloaded to './artifacts/<self.name>/'
+            quick (bool, optional): if set to true, files whose size and modified
+                time match a digest already computed on this machine are not
+                hashed again.
         """
         dirpath = root
         if dirpath is None:
             dirpath = os.path.join(".", "artifacts", self.name)
         manifest = self._load_manifest()
         ref_count = 0
+        paths = {}
         for entry in manifest.entries.values():
             if entry.ref is None:
-                if (
-                    artifacts.md5_file_b64(os.path.join(dirpath, entry.path))
-                    != entry.digest
-                ):
+                path = os.path.join(dirpath, entry.path)
+                # a file of the wrong size can't match, don't hash it
+                if entry.size is not None and os.path.getsize(path) != entry.size:
                     raise ValueError("Digest mismatch for file: %s" % entry.path)
+                paths[path] = entry
             else:
                 ref_count += 1
+        digests = artifacts.get_artifacts_cache().md5_files_b64(
+            paths, refresh=not quick
+        )
+        for path, entry in paths.items():
+            if digests[path] != entry.digest:
+                raise ValueError("Digest mismatch for file: %s" % entry.path)
         if ref_count > 0:
             print("Warning: skipped verification of %s refs" % ref_count)
 
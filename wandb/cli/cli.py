@@ -447,6 +447,9 @@ def init(ctx, project, entity, reset, mode):
     help="Mark runs as synced",
 )
 @click.option("--sync-all", is_flag=True, default=False, help="Sync all runs")
+@click.option(
+    "--parallel", default=4, type=int, help="Number of runs to sync at the same time."
+)
 @click.option("--clean", is_flag=True, default=False, help="Delete synced runs")
 @click.option(
     "--clean-old-hours",
@@ -478,6 +481,7 @@ def sync(
     include_synced=None,
     mark_synced=None,
     sync_all=None,
+    parallel=4,
     ignore=None,
     show=None,
     clean=None,
@@ -551,13 +555,27 @@ def sync(
             app_url=api.app_url,
             view=view,
             verbose=verbose,
+            parallel=parallel,
         )
         for p in path:
             sm.add(p)
         sm.start()
+        shown_time = time.time()
         while not sm.is_done():
-            _ = sm.poll()
-            # print(status)
+            status = sm.poll()
+            if len(path) > 1 and time.time() - shown_time > 10:
+                _sync_progress(status)
+                shown_time = time.time()
+        if len(path) > 1 and not view:
+            _sync_progress(sm.status())
+
+    def _sync_progress(status):
+        wandb.termlog(
+            "Synced {done_runs} of {total_runs} runs, {records} records "
+            "({records_per_sec:.1f} records/sec, {mb_per_sec:.2f} MB/sec)".format(
+                mb_per_sec=status["bytes_per_sec"] / 1048576.0, **status
+            )
+        )
 
     def _sync_all():
         sync_items = get_runs(
@@ -691,7 +709,9 @@ def sweep(
         entity = parts.get("entity") or entity
         project = parts.get("project") or project
         sweep_id = parts.get("name") or update
-        found = api.sweep(sweep_id, "{}", entity=entity, project=project)
+        found = api.sweep(
+            sweep_id, "{}", entity=entity, project=project, include_runs=False
+        )
         if not found:
             wandb.termerror(
                 "Could not find sweep {}/{}/{}".format(entity, project, sweep_id)
@@ -802,9 +822,15 @@ def sweep(
 @click.option(
     "--count", default=None, type=int, help="The max number of runs for this agent."
 )
+@click.option(
+    "--slots",
+    default=1,
+    type=int,
+    help="The number of runs this agent runs at the same time.",
+)
 @click.argument("sweep_id")
 @display_error
-def agent(ctx, project, entity, count, sweep_id):
+def agent(ctx, project, entity, count, slots, sweep_id):
     api = _get_cling_api()
     if api.api_key is None:
         wandb.termlog("Login to W&B to use the sweep agent feature")
@@ -812,7 +838,9 @@ def agent(ctx, project, entity, count, sweep_id):
         api = _get_cling_api(reset=True)
 
     wandb.termlog("Starting wandb agent 🕵️")
-    wandb_agent.agent(sweep_id, entity=entity, project=project, count=count)
+    wandb_agent.agent(
+        sweep_id, entity=entity, project=project, count=count, slots=slots
+    )
 
     # you can send local commands like so:
     # agent_api.command({'type': 'run', 'program': 'train.py',
@@ -493,6 +493,22 @@ class Table(Media):
     MAX_ARTIFACT_ROWS = 200000
     artifact_type = "table"
 
+    # numpy dtype kinds whose values are all of one type, with tolist() giving
+    # json friendly python values
+    _NATIVE_KINDS = {
+        "b": _dtypes.BooleanType,
+        "i": _dtypes.NumberType,
+        "u": _dtypes.NumberType,
+        "f": _dtypes.NumberType,
+        "U": _dtypes.StringType,
+    }
+    _PRIMITIVE_TYPES = {
+        str: _dtypes.StringType,
+        bool: _dtypes.BooleanType,
+        int: _dtypes.NumberType,
+        float: _dtypes.NumberType,
+    }
+
     def __init__(
         self,
         columns=None,
@@ -553,22 +569,137 @@ class Table(Media):
         assert util.is_numpy_array(
             ndarray
         ), "ndarray argument expects a `numpy.ndarray` object"
-        self.data = []
         self._assert_valid_columns(columns)
         self.columns = columns
-        self._make_column_types(dtype, optional)
-        for row in ndarray.tolist():
-            self.add_data(*row)
+        if ndarray.ndim != 2:
+            # only 2d arrays have a column per table column
+            self.data = []
+            self._make_column_types(dtype, optional)
+            for row in ndarray.tolist():
+                self.add_data(*row)
+            return
+        if len(ndarray) > 0:
+            self._assert_row_length(ndarray.shape[1])
+        # copies, so later changes to the array don't change the table
+        self._init_from_columns(
+            [ndarray[:, ndx].copy() for ndx in range(len(columns))], optional, dtype
+        )
 
     def _init_from_dataframe(self, dataframe, columns, optional=True, dtype=None):
         assert util.is_pandas_data_frame(
             dataframe
         ), "dataframe argument expects a `pandas.core.frame.DataFrame` object"
-        self.data = []
         self.columns = list(dataframe.columns)
+        column_data = []
+        for ndx in range(len(self.columns)):
+            values = dataframe.iloc[:, ndx].values
+            if util.is_numpy_array(values):
+                # .values can be a view of the dataframe
+                values = values.copy()
+            else:
+                # pandas extension arrays (categorical, nullable ints, ...)
+                values = list(values)
+            column_data.append(values)
+        self._init_from_columns(column_data, optional, dtype)
+
+    def _init_from_columns(self, column_data, optional=True, dtype=None):
+        """Stores the data by column, the type of each column is inferred once
+        from its dtype when it has one and from its values otherwise."""
+        self.data = []
         self._make_column_types(dtype, optional)
-        for row in range(len(dataframe)):
-            self.add_data(*tuple(dataframe[col].values[row] for col in self.columns))
+        self._data = None
+        self._column_data = column_data
+        type_map = self._column_types.params["type_map"]
+        for col_name, column in zip(self.columns, column_data):
+            result_type, bad_value = self._assign_column(type_map[col_name], column)
+            if isinstance(result_type, _dtypes.InvalidType):
+                raise TypeError(
+                    "Data column {} contained incompatible types:\n{}".format(
+                        col_name, type_map[col_name].explain(bad_value)
+                    )
+                )
+            type_map[col_name] = result_type
+
+    def _assign_column(self, wbtype, column):
+        if len(column) == 0:
+            return wbtype, None
+        kind = column.dtype.kind if util.is_numpy_array(column) else None
+        if kind in Table._NATIVE_KINDS:
+            result_type = wbtype.assign_type(Table._NATIVE_KINDS[kind]())
+            return result_type, column[0].item()
+        values = self._as_list(column)
+        value_class = type(values[0])
+        if value_class in Table._PRIMITIVE_TYPES and all(
+            type(v) is value_class for v in values
+        ):
+            result_type = wbtype.assign_type(Table._PRIMITIVE_TYPES[value_class]())
+            return result_type, values[0]
+        for value in values:
+            result_type = wbtype.assign(value)
+            if isinstance(result_type, _dtypes.InvalidType):
+                return result_type, value
+            wbtype = result_type
+        return wbtype, None
+
+    @staticmethod
+    def _as_list(column):
+        if not util.is_numpy_array(column):
+            return column
+        if column.dtype.kind in Table._NATIVE_KINDS or column.dtype.kind == "O":
+            return column.tolist()
+        # tolist() turns datetimes into integers, keep the numpy scalars
+        return list(column)
+
+    @property
+    def data(self):
+        """The rows of the table, tables stored by column are converted to rows
+        the first time this is accessed."""
+        if self._data is None:
+            self._data = self._row_lists()
+            self._column_data = None
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._column_data = None
+
+    def _num_rows(self):
+        if self._data is None:
+            return len(self._column_data[0]) if self._column_data else 0
+        return len(self._data)
+
+    def _column_values(self, col_ndx):
+        if self._data is None:
+            return self._as_list(self._column_data[col_ndx])
+        return [row[col_ndx] for row in self._data]
+
+    def _row_lists(self, max_rows=None, convert=None, nan_to_none=False):
+        """Returns up to max_rows rows as lists, applying convert to the values
+        of columns that aren't of a native numpy dtype. With nan_to_none, NaN
+        in native float columns becomes None, as json_friendly would make it."""
+        if self._data is not None:
+            rows = self._data[:max_rows]
+            if convert is None:
+                return rows
+            return [[convert(v) for v in row] for row in rows]
+        columns = []
+        for column in self._column_data:
+            column = column[:max_rows]
+            is_native = (
+                util.is_numpy_array(column) and column.dtype.kind in Table._NATIVE_KINDS
+            )
+            if nan_to_none and is_native and column.dtype.kind == "f":
+                # nan is the only value not equal to itself
+                nans = column != column
+                if nans.any():
+                    column = column.astype(object)
+                    column[nans] = None
+            values = self._as_list(column)
+            if convert is not None and not is_native:
+                values = [convert(v) for v in values]
+            columns.append(values)
+        return [list(row) for row in zip(*columns)]
 
     def _make_column_types(self, dtype=None, optional=True):
         if dtype is None:
@@ -589,14 +720,12 @@ class Table(Media):
         if optional:
             wbtype = _dtypes.OptionalType(wbtype)
         col_ndx = self.columns.index(col_name)
-        for row in self.data:
-            result_type = wbtype.assign(row[col_ndx])
+        for value in self._column_values(col_ndx):
+            result_type = wbtype.assign(value)
             if isinstance(result_type, _dtypes.InvalidType):
                 raise TypeError(
                     "Existing data {}, of type {} cannot be cast to {}".format(
-                        row[col_ndx],
-                        self._column_types.params["type_map"][col_name],
-                        wbtype,
+                        value, self._column_types.params["type_map"][col_name], wbtype,
                     )
                 )
             wbtype = result_type
@@ -609,14 +738,16 @@ class Table(Media):
     def __eq__(self, other):
         if (
             not isinstance(other, Table)
-            or len(self.data) != len(other.data)
+            or self._num_rows() != other._num_rows()
             or self.columns != other.columns
         ):
             return False
 
-        for row_ndx in range(len(self.data)):
-            for col_ndx in range(len(self.data[row_ndx])):
-                if self.data[row_ndx][col_ndx] != other.data[row_ndx][col_ndx]:
+        data = self._row_lists()
+        other_data = other._row_lists()
+        for row_ndx in range(len(data)):
+            for col_ndx in range(len(data[row_ndx])):
+                if data[row_ndx][col_ndx] != other_data[row_ndx][col_ndx]:
                     return False
 
         return self._column_types == other._column_types
@@ -627,14 +758,17 @@ class Table(Media):
 
     def add_data(self, *data):
         """Add a row of data to the table. Argument length should match column length"""
-        if len(data) != len(self.columns):
+        self._assert_row_length(len(data))
+        self._validate_data(data)
+        self.data.append(list(data))
+
+    def _assert_row_length(self, length):
+        if length != len(self.columns):
             raise ValueError(
                 "This table expects {} columns: {}".format(
                     len(self.columns), self.columns
                 )
             )
-        self._validate_data(data)
-        self.data.append(list(data))
 
     def _validate_data(self, data):
         incoming_data_dict = {
@@ -654,15 +788,22 @@ class Table(Media):
         # seperate method for testing
         if max_rows is None:
             max_rows = Table.MAX_ROWS
-        if len(self.data) > max_rows:
+        if self._num_rows() > max_rows:
             logging.warning("Truncating wandb.Table object to %i rows." % max_rows)
-        return {"columns": self.columns, "data": self.data[:max_rows]}
+        return {"columns": self.columns, "data": self._row_lists(max_rows)}
 
     def bind_to_run(self, *args, **kwargs):
-        data = self._to_table_json()
+        if self._num_rows() > Table.MAX_ROWS:
+            logging.warning(
+                "Truncating wandb.Table object to %i rows." % Table.MAX_ROWS
+            )
+        data = {
+            "columns": self.columns,
+            "data": self._row_lists(Table.MAX_ROWS, numpy_arrays_to_lists),
+        }
         tmp_path = os.path.join(MEDIA_TMP.name, util.generate_id() + ".table.json")
-        data = numpy_arrays_to_lists(data)
-        util.json_dump_safer(data, codecs.open(tmp_path, "w", encoding="utf-8"))
+        with codecs.open(tmp_path, "w", encoding="utf-8") as fp:
+            util.json_dump_safer(data, fp)
         self._set_file(tmp_path, is_tmp=True, extension=".table.json")
         super(Table, self).bind_to_run(*args, **kwargs)
 
@@ -701,7 +842,7 @@ class Table(Media):
                 {
                     "_type": "table-file",
                     "ncols": len(self.columns),
-                    "nrows": len(self.data),
+                    "nrows": self._num_rows(),
                 }
             )
 
@@ -714,8 +855,11 @@ class Table(Media):
                         )
                     )
             artifact = run_or_artifact
-            mapped_data = []
-            data = self._to_table_json(Table.MAX_ARTIFACT_ROWS)["data"]
+            if self._num_rows() > Table.MAX_ARTIFACT_ROWS:
+                logging.warning(
+                    "Truncating wandb.Table object to %i rows."
+                    % Table.MAX_ARTIFACT_ROWS
+                )
 
             def json_helper(val):
                 if isinstance(val, WBValue):
@@ -728,11 +872,9 @@ class Table(Media):
                 else:
                     return util.json_friendly(val)[0]
 
-            for row in data:
-                mapped_row = []
-                for v in row:
-                    mapped_row.append(json_helper(v))
-                mapped_data.append(mapped_row)
+            mapped_data = self._row_lists(
+                Table.MAX_ARTIFACT_ROWS, json_helper, nan_to_none=True
+            )
             json_dict.update(
                 {
                     "_type": Table.artifact_type,
@@ -62,6 +62,7 @@ ANONYMOUS = "WANDB_ANONYMOUS"
 JUPYTER = "WANDB_JUPYTER"
 CONFIG_DIR = "WANDB_CONFIG_DIR"
 CACHE_DIR = "WANDB_CACHE_DIR"
+ARTIFACT_MATERIALIZE = "WANDB_ARTIFACT_MATERIALIZE"
 
 # For testing, to be removed in future version
 USE_V1_ARTIFACTS = "_WANDB_USE_V1_ARTIFACTS"
@@ -286,6 +287,14 @@ def get_cache_dir(env=None):
     return val
 
 
+def get_artifact_materialize(default="reflink", env=None):
+    """How artifact files are placed in the cache and download directories:
+    reflink, hardlink, symlink or copy."""
+    if env is None:
+        env = os.environ
+    return env.get(ARTIFACT_MATERIALIZE, default)
+
+
 def get_use_v1_artifacts(env=None):
     if env is None:
         env = os.environ
@@ -1,4 +1,5 @@
 import threading
+import time
 
 import wandb
 
@@ -7,6 +8,10 @@ class Stats(object):
     def __init__(self):
         self._stats = {}
         self._lock = threading.Lock()
+        # throughput of the upload jobs, counted from the first job start
+        self._upload_start = None
+        self._completed_files = 0
+        self._completed_bytes = 0
 
     def init_file(self, save_name, size, is_artifact_file=False):
         with self._lock:
@@ -30,6 +35,32 @@ class Stats(object):
         self._stats[save_name]["uploaded"] = 0
         self._stats[save_name]["failed"] = True
 
+    def start_file(self, save_name):
+        with self._lock:
+            if self._upload_start is None:
+                self._upload_start = time.time()
+
+    def finish_file(self, save_name):
+        with self._lock:
+            file_stats = self._stats.get(save_name)
+            self._completed_files += 1
+            if file_stats and not file_stats["failed"]:
+                self._completed_bytes += file_stats["total"]
+
+    def throughput(self):
+        with self._lock:
+            start = self._upload_start
+            files = self._completed_files
+            size = self._completed_bytes
+        elapsed = time.time() - start if start is not None else 0.0
+        return {
+            "completed_files": files,
+            "completed_bytes": size,
+            "elapsed_seconds": elapsed,
+            "files_per_sec": files / elapsed if elapsed else 0.0,
+            "bytes_per_sec": size / elapsed if elapsed else 0.0,
+        }
+
     def summary(self):
         # Need to use list to ensure we get a copy, since other threads may
         # modify this while we iterate
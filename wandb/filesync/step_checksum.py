@@ -3,11 +3,19 @@
 import collections
 import os
 import shutil
+import sys
 import threading
 import wandb.util
 
 from wandb.filesync import step_upload
 
+# TODO: consolidate dynamic imports
+PY3 = sys.version_info.major == 3 and sys.version_info.minor >= 6
+if PY3:
+    from wandb.sdk.interface import artifacts
+else:
+    from wandb.sdk_py27.interface import artifacts
+
 
 RequestUpload = collections.namedtuple(
     "RequestUpload",
@@ -60,7 +68,7 @@ class StepChecksum(object):
                     # "prepare" file upload flow, in which we prepare the files in
                     # the database before uploading them. This is currently only
                     # used for artifact manifests
-                    checksum = wandb.util.md5_file(path)
+                    checksum = artifacts.get_artifacts_cache().md5_file_b64(path)
                 self._stats.init_file(req.save_name, os.path.getsize(path))
                 self._output_queue.put(
                     step_upload.RequestUpload(
@@ -71,6 +79,7 @@ class StepChecksum(object):
                         req.copy,
                         req.save_fn,
                         req.digest,
+                        req.use_prepare_flow,
                     )
                 )
             elif isinstance(req, RequestStoreManifestFiles):
@@ -94,6 +103,7 @@ class StepChecksum(object):
                                 False,
                                 make_save_fn_with_entry(req.save_fn, entry),
                                 entry.digest,
+                                False,
                             )
                         )
             elif isinstance(req, RequestCommitArtifact):
@@ -1,6 +1,9 @@
 """Batching file prepare requests to our API."""
 
 import collections
+import heapq
+import logging
+import os
 import threading
 from six.moves import queue
 
@@ -10,15 +13,34 @@ from wandb.errors.term import termerror
 
 RequestUpload = collections.namedtuple(
     "EventStartUploadJob",
-    ("path", "save_name", "artifact_id", "md5", "copied", "save_fn", "digest"),
+    (
+        "path",
+        "save_name",
+        "artifact_id",
+        "md5",
+        "copied",
+        "save_fn",
+        "digest",
+        "is_manifest",
+    ),
 )
 RequestCommitArtifact = collections.namedtuple(
     "RequestCommitArtifact", ("artifact_id", "finalize", "before_commit", "on_commit")
 )
 RequestFinish = collections.namedtuple("RequestFinish", ())
 
+logger = logging.getLogger(__name__)
+
 
 class StepUpload(object):
+    """Upload files with a fixed pool of worker threads.
+
+    Requests are started smallest file first, with artifact manifests last.
+    Uploads of the same `save_name` are serialized: a request for a file
+    which is being uploaded waits in `_blocked_jobs` until that upload is
+    done.
+    """
+
     def __init__(self, api, stats, event_queue, max_jobs, silent=False):
         self._api = api
         self._stats = stats
@@ -28,9 +50,16 @@ class StepUpload(object):
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
 
+        # Workers are started as needed, up to max_jobs
+        self._job_queue = queue.Queue()
+        self._workers = []
+
         # Indexed by files' `save_name`'s, which are their ID's in the Run.
         self._running_jobs = {}
+        self._blocked_jobs = collections.defaultdict(collections.deque)
+        # heap of (is_manifest, size, sequence, event)
         self._pending_jobs = []
+        self._sequence = 0
 
         self._artifacts = {}
 
@@ -60,14 +89,37 @@ class StepUpload(object):
                 event = None
             if event:
                 self._handle_event(event)
-            elif not self._running_jobs:
+            elif not self._running_jobs and not self._pending_jobs:
                 # Queue was empty and no jobs left.
                 break
 
+        for _ in self._workers:
+            self._job_queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        throughput = self._stats.throughput()
+        logger.info(
+            "uploaded %d files in %.1fs, %.1f files/sec, %.1f KB/sec",
+            throughput["completed_files"],
+            throughput["elapsed_seconds"],
+            throughput["files_per_sec"],
+            throughput["bytes_per_sec"] / 1024.0,
+        )
+
+    def _worker_body(self):
+        while True:
+            job = self._job_queue.get()
+            if job is None:
+                break
+            try:
+                job.run()
+            except Exception:
+                # the job reported its failure, keep the worker for the others
+                logger.exception("upload job %s failed", job.save_name)
+
     def _handle_event(self, event):
         if isinstance(event, upload_job.EventJobDone):
             job = event.job
-            job.join()
             if job.artifact_id:
                 if event.success:
                     self._artifacts[job.artifact_id]["pending_count"] -= 1
@@ -77,10 +129,16 @@ class StepUpload(object):
                         "Uploading artifact file failed. Artifact won't be committed."
                     )
             self._running_jobs.pop(job.save_name)
-            # If we have any pending jobs, start one now
-            if self._pending_jobs:
-                event = self._pending_jobs.pop(0)
-                self._start_upload_job(event)
+            # artifact files are tracked in stats by their local path, see
+            # StepChecksum
+            self._stats.finish_file(job.save_path if job.save_fn else job.save_name)
+            # Start the next upload of this file, if any
+            blocked = self._blocked_jobs.get(job.save_name)
+            if blocked:
+                self._queue_upload_job(blocked.popleft())
+                if not blocked:
+                    del self._blocked_jobs[job.save_name]
+            self._start_upload_jobs()
         elif isinstance(event, RequestCommitArtifact):
             if event.artifact_id not in self._artifacts:
                 self._init_artifact(event.artifact_id)
@@ -100,25 +158,41 @@ class StepUpload(object):
                 if event.artifact_id not in self._artifacts:
                     self._init_artifact(event.artifact_id)
                 self._artifacts[event.artifact_id]["pending_count"] += 1
-            if len(self._running_jobs) == self._max_jobs:
-                self._pending_jobs.append(event)
+            # Operations on a single backend file must be serialized. if
+            # we're already uploading this file, wait for that upload
+            if event.save_name in self._running_jobs or self._blocked_jobs.get(
+                event.save_name
+            ):
+                self._blocked_jobs[event.save_name].append(event)
             else:
-                self._start_upload_job(event)
+                self._queue_upload_job(event)
+            self._start_upload_jobs()
         else:
             raise Exception("Programming error: unhandled event: %s" % str(event))
 
+    def _queue_upload_job(self, event):
+        try:
+            size = os.path.getsize(event.path)
+        except OSError:
+            size = 0
+        # artifact manifests are best uploaded once the files they list are
+        heapq.heappush(
+            self._pending_jobs, (bool(event.is_manifest), size, self._sequence, event)
+        )
+        self._sequence += 1
+
+    def _start_upload_jobs(self):
+        while self._pending_jobs and len(self._running_jobs) < self._max_jobs:
+            event = heapq.heappop(self._pending_jobs)[-1]
+            if event.save_name in self._running_jobs:
+                self._blocked_jobs[event.save_name].append(event)
+                continue
+            self._start_upload_job(event)
+
     def _start_upload_job(self, event):
         if not isinstance(event, RequestUpload):
             raise Exception("Programming error: invalid event")
 
-        # Operations on a single backend file must be serialized. if
-        # we're already uploading this file, put the event on the
-        # end of the queue
-        if event.save_name in self._running_jobs:
-            self._pending_jobs.append(event)
-            return
-
-        # Start it.
         job = upload_job.UploadJob(
             self._event_queue,
             self._stats,
@@ -133,7 +207,14 @@ class StepUpload(object):
             event.digest,
         )
         self._running_jobs[event.save_name] = job
-        job.start()
+        self._stats.start_file(event.save_name)
+        if len(self._workers) < min(len(self._running_jobs), self._max_jobs):
+            worker = threading.Thread(target=self._worker_body)
+            worker.name = "UploadWorker-%d" % len(self._workers)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+        self._job_queue.put(job)
 
     def _init_artifact(self, artifact_id):
         self._artifacts[artifact_id] = {
@@ -83,6 +83,9 @@ class Record(google___protobuf___message___Message):
     @property
     def telemetry(self) -> wandb___proto___wandb_telemetry_pb2___TelemetryRecord: ...
 
+    @property
+    def history_batch(self) -> type___HistoryBatchRecord: ...
+
     @property
     def run(self) -> type___RunRecord: ...
 
@@ -117,6 +120,7 @@ class Record(google___protobuf___message___Message):
         tbrecord : typing___Optional[type___TBRecord] = None,
         alert : typing___Optional[type___AlertRecord] = None,
         telemetry : typing___Optional[wandb___proto___wandb_telemetry_pb2___TelemetryRecord] = None,
+        history_batch : typing___Optional[type___HistoryBatchRecord] = None,
         run : typing___Optional[type___RunRecord] = None,
         exit : typing___Optional[type___RunExitRecord] = None,
         final : typing___Optional[type___FinalRecord] = None,
@@ -126,9 +130,9 @@ class Record(google___protobuf___message___Message):
         control : typing___Optional[type___Control] = None,
         uuid : typing___Optional[typing___Text] = None,
         ) -> None: ...
-    def HasField(self, field_name: typing_extensions___Literal[u"alert",b"alert",u"artifact",b"artifact",u"config",b"config",u"control",b"control",u"exit",b"exit",u"files",b"files",u"final",b"final",u"footer",b"footer",u"header",b"header",u"history",b"history",u"output",b"output",u"record_type",b"record_type",u"request",b"request",u"run",b"run",u"stats",b"stats",u"summary",b"summary",u"tbrecord",b"tbrecord",u"telemetry",b"telemetry"]) -> builtin___bool: ...
-    def ClearField(self, field_name: typing_extensions___Literal[u"alert",b"alert",u"artifact",b"artifact",u"config",b"config",u"control",b"control",u"exit",b"exit",u"files",b"files",u"final",b"final",u"footer",b"footer",u"header",b"header",u"history",b"history",u"num",b"num",u"output",b"output",u"record_type",b"record_type",u"request",b"request",u"run",b"run",u"stats",b"stats",u"summary",b"summary",u"tbrecord",b"tbrecord",u"telemetry",b"telemetry",u"uuid",b"uuid"]) -> None: ...
-    def WhichOneof(self, oneof_group: typing_extensions___Literal[u"record_type",b"record_type"]) -> typing_extensions___Literal["history","summary","output","config","files","stats","artifact","tbrecord","alert","telemetry","run","exit","final","header","footer","request"]: ...
+    def HasField(self, field_name: typing_extensions___Literal[u"alert",b"alert",u"artifact",b"artifact",u"config",b"config",u"control",b"control",u"exit",b"exit",u"files",b"files",u"final",b"final",u"footer",b"footer",u"header",b"header",u"history",b"history",u"history_batch",b"history_batch",u"output",b"output",u"record_type",b"record_type",u"request",b"request",u"run",b"run",u"stats",b"stats",u"summary",b"summary",u"tbrecord",b"tbrecord",u"telemetry",b"telemetry"]) -> builtin___bool: ...
+    def ClearField(self, field_name: typing_extensions___Literal[u"alert",b"alert",u"artifact",b"artifact",u"config",b"config",u"control",b"control",u"exit",b"exit",u"files",b"files",u"final",b"final",u"footer",b"footer",u"header",b"header",u"history",b"history",u"history_batch",b"history_batch",u"num",b"num",u"output",b"output",u"record_type",b"record_type",u"request",b"request",u"run",b"run",u"stats",b"stats",u"summary",b"summary",u"tbrecord",b"tbrecord",u"telemetry",b"telemetry",u"uuid",b"uuid"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions___Literal[u"record_type",b"record_type"]) -> typing_extensions___Literal["history","summary","output","config","files","stats","artifact","tbrecord","alert","telemetry","history_batch","run","exit","final","header","footer","request"]: ...
 type___Record = Record
 
 class Control(google___protobuf___message___Message):
@@ -389,6 +393,19 @@ class HistoryResult(google___protobuf___message___Message):
         ) -> None: ...
 type___HistoryResult = HistoryResult
 
+class HistoryBatchRecord(google___protobuf___message___Message):
+    DESCRIPTOR: google___protobuf___descriptor___Descriptor = ...
+
+    @property
+    def history(self) -> google___protobuf___internal___containers___RepeatedCompositeFieldContainer[type___HistoryRecord]: ...
+
+    def __init__(self,
+        *,
+        history : typing___Optional[typing___Iterable[type___HistoryRecord]] = None,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions___Literal[u"history",b"history"]) -> None: ...
+type___HistoryBatchRecord = HistoryBatchRecord
+
 class OutputRecord(google___protobuf___message___Message):
     DESCRIPTOR: google___protobuf___descriptor___Descriptor = ...
     OutputTypeValue = typing___NewType('OutputTypeValue', builtin___int)
@@ -945,11 +962,16 @@ class StatusResponse(google___protobuf___message___Message):
     DESCRIPTOR: google___protobuf___descriptor___Descriptor = ...
     run_should_stop: builtin___bool = ...
 
+    @property
+    def file_stream_stats(self) -> type___FileStreamStats: ...
+
     def __init__(self,
         *,
         run_should_stop : typing___Optional[builtin___bool] = None,
+        file_stream_stats : typing___Optional[type___FileStreamStats] = None,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions___Literal[u"run_should_stop",b"run_should_stop"]) -> None: ...
+    def HasField(self, field_name: typing_extensions___Literal[u"file_stream_stats",b"file_stream_stats"]) -> builtin___bool: ...
+    def ClearField(self, field_name: typing_extensions___Literal[u"file_stream_stats",b"file_stream_stats",u"run_should_stop",b"run_should_stop"]) -> None: ...
 type___StatusResponse = StatusResponse
 
 class PollExitRequest(google___protobuf___message___Message):
@@ -972,15 +994,19 @@ class PollExitResponse(google___protobuf___message___Message):
     @property
     def pusher_stats(self) -> type___FilePusherStats: ...
 
+    @property
+    def file_stream_stats(self) -> type___FileStreamStats: ...
+
     def __init__(self,
         *,
         done : typing___Optional[builtin___bool] = None,
         exit_result : typing___Optional[type___RunExitResult] = None,
         file_counts : typing___Optional[type___FileCounts] = None,
         pusher_stats : typing___Optional[type___FilePusherStats] = None,
+        file_stream_stats : typing___Optional[type___FileStreamStats] = None,
         ) -> None: ...
-    def HasField(self, field_name: typing_extensions___Literal[u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"pusher_stats",b"pusher_stats"]) -> builtin___bool: ...
-    def ClearField(self, field_name: typing_extensions___Literal[u"done",b"done",u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"pusher_stats",b"pusher_stats"]) -> None: ...
+    def HasField(self, field_name: typing_extensions___Literal[u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"file_stream_stats",b"file_stream_stats",u"pusher_stats",b"pusher_stats"]) -> builtin___bool: ...
+    def ClearField(self, field_name: typing_extensions___Literal[u"done",b"done",u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"file_stream_stats",b"file_stream_stats",u"pusher_stats",b"pusher_stats"]) -> None: ...
 type___PollExitResponse = PollExitResponse
 
 class FileCounts(google___protobuf___message___Message):
@@ -1015,6 +1041,29 @@ class FilePusherStats(google___protobuf___message___Message):
     def ClearField(self, field_name: typing_extensions___Literal[u"deduped_bytes",b"deduped_bytes",u"total_bytes",b"total_bytes",u"uploaded_bytes",b"uploaded_bytes"]) -> None: ...
 type___FilePusherStats = FilePusherStats
 
+class FileStreamStats(google___protobuf___message___Message):
+    DESCRIPTOR: google___protobuf___descriptor___Descriptor = ...
+    queued_chunks: builtin___int = ...
+    queued_bytes: builtin___int = ...
+    inflight_requests: builtin___int = ...
+    inflight_bytes: builtin___int = ...
+    sent_requests: builtin___int = ...
+    sent_bytes: builtin___int = ...
+    blocked_seconds: builtin___float = ...
+
+    def __init__(self,
+        *,
+        queued_chunks : typing___Optional[builtin___int] = None,
+        queued_bytes : typing___Optional[builtin___int] = None,
+        inflight_requests : typing___Optional[builtin___int] = None,
+        inflight_bytes : typing___Optional[builtin___int] = None,
+        sent_requests : typing___Optional[builtin___int] = None,
+        sent_bytes : typing___Optional[builtin___int] = None,
+        blocked_seconds : typing___Optional[builtin___float] = None,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions___Literal[u"blocked_seconds",b"blocked_seconds",u"inflight_bytes",b"inflight_bytes",u"inflight_requests",b"inflight_requests",u"queued_bytes",b"queued_bytes",u"queued_chunks",b"queued_chunks",u"sent_bytes",b"sent_bytes",u"sent_requests",b"sent_requests"]) -> None: ...
+type___FileStreamStats = FileStreamStats
+
 class ShutdownRequest(google___protobuf___message___Message):
     DESCRIPTOR: google___protobuf___descriptor___Descriptor = ...
 
@@ -11,9 +11,11 @@ import os
 import sys
 
 import wandb
+from wandb.proto import wandb_internal_pb2
 
 from ..interface import interface
 from ..internal.internal import wandb_internal
+from ..lib import ringbuffer
 
 logger = logging.getLogger("wandb")
 
@@ -49,8 +51,7 @@ class Backend(object):
         if "_early_logger" in settings:
             del settings["_early_logger"]
 
-        self.record_q = self._wl._multiprocessing.Queue()
-        self.result_q = self._wl._multiprocessing.Queue()
+        self._make_queues(settings)
         self.wandb_process = self._wl._multiprocessing.Process(
             target=wandb_internal,
             kwargs=dict(
@@ -89,9 +90,30 @@ class Backend(object):
             main_module.__file__ = save_mod_path
 
         self.interface = interface.BackendSender(
-            process=self.wandb_process, record_q=self.record_q, result_q=self.result_q,
+            process=self.wandb_process,
+            record_q=self.record_q,
+            result_q=self.result_q,
+            history_batch_rows=settings.get("history_batch_rows"),
+            history_batch_seconds=settings.get("history_batch_seconds"),
         )
 
+    def _make_queues(self, settings):
+        transport = settings.get("_transport")
+        if transport == "shm" and not ringbuffer.available():
+            logger.warning("shared memory transport not available, using queues")
+            transport = None
+        if transport == "shm":
+            size = settings.get("_transport_buffer_size")
+            self.record_q = ringbuffer.RingBufferQueue(
+                self._wl._multiprocessing, wandb_internal_pb2.Record, size
+            )
+            self.result_q = ringbuffer.RingBufferQueue(
+                self._wl._multiprocessing, wandb_internal_pb2.Result, size
+            )
+            return
+        self.record_q = self._wl._multiprocessing.Queue()
+        self.result_q = self._wl._multiprocessing.Queue()
+
     def server_connect(self):
         """Connect to server."""
         pass
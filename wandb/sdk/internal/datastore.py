@@ -15,16 +15,32 @@ header :=
   ident: char[4]
   magic: uint16
   version: uint8
+
+DataStoreReader can write a sidecar index next to the log:
+
+index :=
+  ident: char[4]
+  magic: uint16
+  version: uint8
+  length: uint64       // bytes of the log covered by the index
+  entry*
+entry :=
+  offset: uint64       // file offset of the record
+  type: uint16         // field number of the record_type in Record
+  step: int64          // history step, -1 if none
 """
 from __future__ import print_function
 
+import collections
 import logging
+import mmap
 import os
 import struct
 import sys
 import zlib
 
 import wandb
+from wandb.proto import wandb_internal_pb2  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +61,14 @@ LEVELDBLOG_HEADER_MAGIC = (
 )
 LEVELDBLOG_HEADER_VERSION = 0
 
+LEVELDBLOG_CHUNK = struct.Struct("<IHB")
+
+INDEX_SUFFIX = ".index"
+INDEX_HEADER = struct.Struct("<4sHBQ")
+INDEX_HEADER_IDENT = ":WBX"
+INDEX_HEADER_VERSION = 0
+INDEX_ENTRY = struct.Struct("<QHq")
+
 try:
     bytes("", "ascii")
 
@@ -66,6 +90,13 @@ class DataStore(object):
         self._fp = None
         self._index = 0
 
+        # the block currently being written, bytes before _flushed have
+        # already been written to the file
+        self._block = bytearray(LEVELDBLOG_BLOCK_LEN)
+        self._block_view = memoryview(self._block)
+        self._flushed = 0
+        self._synced = 0
+
         self._crc = [0] * (LEVELDBLOG_LAST + 1)
         for x in range(1, LEVELDBLOG_LAST + 1):
             self._crc[x] = zlib.crc32(strtobytes(chr(x))) & 0xFFFFFFFF
@@ -80,15 +111,41 @@ class DataStore(object):
             open_flags = "wb"
             if os.path.exists(fname):
                 raise IOError("File exists: {}".format(fname))
-        self._fp = open(fname, open_flags)
+        # unbuffered, whole blocks are assembled in self._block
+        self._fp = open(fname, open_flags, 0)
         self._write_header()
 
     def open_for_append(self, fname):
-        # TODO: implement
+        """Open an existing log to add records after the last valid one.
+
+        A torn tail left by a crash is truncated, new records continue the
+        partial block the log ends with.
+        """
         self._fname = fname
-        logger.info("open: %s", fname)
-        self._fp = open(fname, "wb")
-        # do something with _index
+        logger.info("open for append: %s", fname)
+        reader = DataStoreReader(fname)
+        try:
+            reader.verify()
+        finally:
+            reader.close()
+        self._fp = open(fname, "r+b", 0)
+        if reader.valid_length < LEVELDBLOG_HEADER_LEN:
+            self._fp.truncate(0)
+            self._write_header()
+            return
+        if reader.truncated:
+            logger.warning(
+                "truncate: %s from %d to %d",
+                fname,
+                os.fstat(self._fp.fileno()).st_size,
+                reader.valid_length,
+            )
+            self._fp.truncate(reader.valid_length)
+        self._fp.seek(reader.valid_length)
+        self._index = reader.valid_length
+        # the start of the current block is already in the file
+        self._flushed = self._index % LEVELDBLOG_BLOCK_LEN
+        self._synced = self._index
 
     def open_for_scan(self, fname):
         self._fname = fname
@@ -136,18 +193,17 @@ class DataStore(object):
             return data
 
         assert dtype == LEVELDBLOG_FIRST
+        parts = [data]
         while True:
-            offset = self._index % LEVELDBLOG_BLOCK_LEN
             record = self.scan_record()
             if record is None:  # eof
                 return None
             dtype, new_data = record
+            parts.append(new_data)
             if dtype == LEVELDBLOG_LAST:
-                data += new_data
                 break
             assert dtype == LEVELDBLOG_MIDDLE
-            data += new_data
-        return data
+        return b"".join(parts)
 
     def _write_header(self):
         data = struct.pack(
@@ -157,8 +213,7 @@ class DataStore(object):
             LEVELDBLOG_HEADER_VERSION,
         )
         assert len(data) == 7
-        self._fp.write(data)
-        self._index += len(data)
+        self._write_block(data)
 
     def _read_header(self):
         header_length = 7
@@ -173,13 +228,30 @@ class DataStore(object):
         assert len(header) == header_length
         self._index += len(header)
 
+    def _write_block(self, data):
+        """Append data to the current block, writing out the block when full."""
+        offset = self._index % LEVELDBLOG_BLOCK_LEN
+        self._block_view[offset : offset + len(data)] = data  # noqa: E203
+        self._index += len(data)
+        if self._index % LEVELDBLOG_BLOCK_LEN == 0:
+            self._flush_block(LEVELDBLOG_BLOCK_LEN)
+            self._flushed = 0
+
+    def _flush_block(self, end):
+        view = self._block_view[self._flushed : end]  # noqa: E203
+        while view:
+            written = self._fp.write(view)
+            if written is None:  # python2 file objects write everything
+                break
+            view = view[written:]
+        self._flushed = end
+
     def _write_record(self, s, dtype=None):
         """Write record that must fit into a block."""
+        offset = self._index % LEVELDBLOG_BLOCK_LEN
         # double check that there is enough space
         # (this is a precondition to calling this method)
-        assert len(s) + LEVELDBLOG_HEADER_LEN <= (
-            LEVELDBLOG_BLOCK_LEN - self._index % LEVELDBLOG_BLOCK_LEN
-        )
+        assert len(s) + LEVELDBLOG_HEADER_LEN <= LEVELDBLOG_BLOCK_LEN - offset
 
         dlength = len(s)
         dtype = dtype or LEVELDBLOG_FULL
@@ -187,16 +259,17 @@ class DataStore(object):
         checksum = zlib.crc32(s, self._crc[dtype]) & 0xFFFFFFFF
         # logger.info("write_record: index=%d len=%d dtype=%d",
         #     self._index, dlength, dtype)
-        self._fp.write(struct.pack("<IHB", checksum, dlength, dtype))
-        if dlength:
-            self._fp.write(s)
-        self._index += LEVELDBLOG_HEADER_LEN + len(s)
+        struct.pack_into("<IHB", self._block, offset, checksum, dlength, dtype)
+        self._index += LEVELDBLOG_HEADER_LEN
+        self._write_block(s)
 
     def _write_data(self, s):
         file_offset = self._index
         flush_index = 0
         flush_offset = 0
 
+        if PY3:
+            s = memoryview(s)
         offset = self._index % LEVELDBLOG_BLOCK_LEN
         space_left = LEVELDBLOG_BLOCK_LEN - offset
         data_used = 0
@@ -204,9 +277,7 @@ class DataStore(object):
         # logger.info("write_data: index=%d offset=%d len=%d",
         #     self._index, offset, data_left)
         if space_left < LEVELDBLOG_HEADER_LEN:
-            pad = "\x00" * space_left
-            self._fp.write(strtobytes(pad))
-            self._index += space_left
+            self._write_block(strtobytes("\x00" * space_left))
             offset = 0
             space_left = LEVELDBLOG_BLOCK_LEN
 
@@ -253,7 +324,316 @@ class DataStore(object):
         ret = self._write_data(s)
         return ret
 
+    def flush(self):
+        """Write out the partial block, records written so far are visible to readers."""
+        if self._fp is None or self._opened_for_scan:
+            return
+        self._flush_block(self._index % LEVELDBLOG_BLOCK_LEN)
+
+    def sync(self):
+        """Flush and fsync, records written so far survive a crash of the host."""
+        if self._fp is None or self._opened_for_scan:
+            return
+        if self._synced == self._index:
+            return
+        self.flush()
+        os.fsync(self._fp.fileno())
+        self._synced = self._index
+
     def close(self):
         if self._fp is not None:
             logger.info("close: %s", self._fname)
+            self.flush()
             self._fp.close()
+            self._fp = None
+
+
+IndexEntry = collections.namedtuple("IndexEntry", ("offset", "record_type", "step"))
+
+
+def _record_type_names():
+    """Map field numbers of the record_type oneof in Record to names."""
+    oneof = wandb_internal_pb2.Record.DESCRIPTOR.oneofs_by_name["record_type"]
+    return dict((field.number, field.name) for field in oneof.fields)
+
+
+class DataStoreReader(object):
+    """Read records from a leveldb log without copying.
+
+    The file is mapped with mmap and records which fit in a block are
+    returned as memoryview slices of the mapping, records split over blocks
+    are joined once.  Reading stops at the first incomplete or corrupt chunk,
+    which is what the tail of a crashed run looks like, and sets `truncated`.
+    `valid_length` is the end of the last complete record read.
+
+    Arguments:
+        fname: log file to read.
+        verify: check the crc of chunks as they are read, see `verify()` to
+            check the whole file at once.
+    """
+
+    def __init__(self, fname, verify=True):
+        self._fname = fname
+        self._verify = verify
+        self._crc = [0] * (LEVELDBLOG_LAST + 1)
+        for x in range(1, LEVELDBLOG_LAST + 1):
+            self._crc[x] = zlib.crc32(strtobytes(chr(x))) & 0xFFFFFFFF
+        self._index = None
+
+        logger.info("open for read: %s", fname)
+        self._fp = open(fname, "rb")
+        self._mmap = None
+        size = os.fstat(self._fp.fileno()).st_size
+        if PY3 and size:
+            self._mmap = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = memoryview(self._mmap)
+        else:
+            self._data = self._fp.read()
+
+        self.truncated = False
+        self.valid_length = 0
+        if size < LEVELDBLOG_HEADER_LEN:
+            self.truncated = True
+            return
+        ident, magic, version = struct.unpack_from("<4sHB", self._data, 0)
+        if ident != strtobytes(LEVELDBLOG_HEADER_IDENT):
+            raise Exception("Invalid header")
+        if magic != LEVELDBLOG_HEADER_MAGIC:
+            raise Exception("Invalid header")
+        if version != LEVELDBLOG_HEADER_VERSION:
+            raise Exception("Invalid header")
+        self.valid_length = LEVELDBLOG_HEADER_LEN
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        for _, data in self.records():
+            yield data
+
+    def _read_chunk(self, index):
+        """Return (dtype, start, end) of the chunk at index, None if invalid."""
+        space_left = LEVELDBLOG_BLOCK_LEN - index % LEVELDBLOG_BLOCK_LEN
+        if space_left < LEVELDBLOG_HEADER_LEN:
+            # block trailer
+            index += space_left
+            space_left = LEVELDBLOG_BLOCK_LEN
+        if index + LEVELDBLOG_HEADER_LEN > len(self._data):
+            return None
+        checksum, dlength, dtype = LEVELDBLOG_CHUNK.unpack_from(self._data, index)
+        start = index + LEVELDBLOG_HEADER_LEN
+        end = start + dlength
+        if not LEVELDBLOG_FULL <= dtype <= LEVELDBLOG_LAST:
+            return None
+        if end > len(self._data) or dlength + LEVELDBLOG_HEADER_LEN > space_left:
+            return None
+        if self._verify:
+            computed = zlib.crc32(self._data[start:end], self._crc[dtype])
+            if checksum != computed & 0xFFFFFFFF:
+                return None
+        return dtype, start, end
+
+    def _read_record(self, index):
+        """Return (data, end) of the record at index, None if invalid."""
+        chunk = self._read_chunk(index)
+        if chunk is None:
+            return None
+        dtype, start, end = chunk
+        if dtype == LEVELDBLOG_FULL:
+            return self._data[start:end], end
+        if dtype != LEVELDBLOG_FIRST:
+            return None
+        parts = [self._data[start:end]]
+        while True:
+            chunk = self._read_chunk(end)
+            if chunk is None:
+                return None
+            dtype, start, end = chunk
+            parts.append(self._data[start:end])
+            if dtype == LEVELDBLOG_LAST:
+                return b"".join(parts), end
+            if dtype != LEVELDBLOG_MIDDLE:
+                return None
+
+    def records(self, offset=None):
+        """Yield (offset, data) of each record, starting at offset if given."""
+        data = self._data
+        size = len(data)
+        verify = self._verify
+        crc = self._crc[LEVELDBLOG_FULL]
+        crc32 = zlib.crc32
+        unpack_from = LEVELDBLOG_CHUNK.unpack_from
+        index = offset or LEVELDBLOG_HEADER_LEN
+        while index < size:
+            # fast path for records which fit in the rest of the block
+            start = index + LEVELDBLOG_HEADER_LEN
+            limit = index - index % LEVELDBLOG_BLOCK_LEN + LEVELDBLOG_BLOCK_LEN
+            if limit > size:
+                limit = size
+            if start <= limit:
+                checksum, dlength, dtype = unpack_from(data, index)
+                end = start + dlength
+                if dtype == LEVELDBLOG_FULL and end <= limit:
+                    record = data[start:end]
+                    if not verify or checksum == crc32(record, crc) & 0xFFFFFFFF:
+                        if end > self.valid_length:
+                            self.valid_length = end
+                        yield index, record
+                        index = end
+                        continue
+            record = self._read_record(index)
+            if record is None:
+                self.truncated = True
+                logger.warning(
+                    "log truncated: %s at %d of %d", self._fname, index, size,
+                )
+                return
+            record, end = record
+            if end > self.valid_length:
+                self.valid_length = end
+            yield index, record
+            index = end
+
+    def read_at(self, offset):
+        """Return the data of the record at offset, as returned by records()."""
+        record = self._read_record(offset)
+        if record is None:
+            raise Exception("Invalid record at offset {}".format(offset))
+        return record[0]
+
+    def verify(self):
+        """Check the crc of every chunk, returns False if the log is damaged."""
+        verify, self._verify = self._verify, True
+        try:
+            for _ in self.records():
+                pass
+        finally:
+            self._verify = verify
+        return not self.truncated
+
+    def _index_record(self, offset, data):
+        record = wandb_internal_pb2.Record()
+        record.ParseFromString(data)
+        record_type = record.WhichOneof("record_type")
+        history = None
+        if record_type == "history":
+            history = record.history
+        elif record_type == "history_batch" and record.history_batch.history:
+            history = record.history_batch.history[0]
+        step = -1
+        if history is not None:
+            for item in history.item:
+                if item.key == "_step":
+                    step = int(item.value_json)
+                    break
+        return IndexEntry(offset, record_type, step)
+
+    def _load_index(self, fname):
+        try:
+            with open(fname, "rb") as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None, LEVELDBLOG_HEADER_LEN
+        if len(data) < INDEX_HEADER.size:
+            return None, LEVELDBLOG_HEADER_LEN
+        ident, magic, version, length = INDEX_HEADER.unpack_from(data, 0)
+        if (
+            ident != strtobytes(INDEX_HEADER_IDENT)
+            or magic != LEVELDBLOG_HEADER_MAGIC
+            or version != INDEX_HEADER_VERSION
+            or length > len(self._data)
+        ):
+            return None, LEVELDBLOG_HEADER_LEN
+        fields = _record_type_names()
+        entries = []
+        for pos in range(INDEX_HEADER.size, len(data), INDEX_ENTRY.size):
+            offset, number, step = INDEX_ENTRY.unpack_from(data, pos)
+            entries.append(IndexEntry(offset, fields[number], step))
+        return entries, length
+
+    def _write_index(self, fname, entries):
+        numbers = dict((v, k) for k, v in _record_type_names().items())
+        data = bytearray(INDEX_HEADER.size + INDEX_ENTRY.size * len(entries))
+        INDEX_HEADER.pack_into(
+            data,
+            0,
+            strtobytes(INDEX_HEADER_IDENT),
+            LEVELDBLOG_HEADER_MAGIC,
+            INDEX_HEADER_VERSION,
+            self.valid_length,
+        )
+        for i, entry in enumerate(entries):
+            INDEX_ENTRY.pack_into(
+                data,
+                INDEX_HEADER.size + INDEX_ENTRY.size * i,
+                entry.offset,
+                numbers[entry.record_type],
+                entry.step,
+            )
+        tmp_fname = "%s.%d.tmp" % (fname, os.getpid())
+        with open(tmp_fname, "wb") as f:
+            f.write(data)
+        os.rename(tmp_fname, fname)
+
+    def index(self, sidecar=True):
+        """Return an IndexEntry for each record.
+
+        With sidecar, the index is loaded from and saved to the log file name
+        plus INDEX_SUFFIX, only records appended since it was written are read.
+        """
+        if self._index is not None:
+            return self._index
+        fname = self._fname + INDEX_SUFFIX
+        entries, length = None, LEVELDBLOG_HEADER_LEN
+        if sidecar:
+            entries, length = self._load_index(fname)
+        self.valid_length = max(self.valid_length, length)
+        start = self.valid_length
+        entries = entries or []
+        for offset, data in self.records(offset=length):
+            entries.append(self._index_record(offset, data))
+        if sidecar and self.valid_length > start:
+            self._write_index(fname, entries)
+        self._index = entries
+        return entries
+
+    def find(self, record_type):
+        """Yield (offset, data) of the records of a type, e.g. "history"."""
+        for entry in self.index():
+            if entry.record_type == record_type:
+                yield entry.offset, self.read_at(entry.offset)
+
+    def seek(self, step):
+        """Yield (offset, data) of all records from the history record with step.
+
+        With batched history, this is the batch containing step.
+        """
+        start = None
+        for entry in self.index():
+            if entry.step < 0:
+                continue
+            if entry.step >= step:
+                if start is None or entry.step == step:
+                    start = entry
+                break
+            start = entry
+        if start is None:
+            return
+        for record in self.records(offset=start.offset):
+            yield record
+
+    def close(self):
+        if self._mmap is not None:
+            try:
+                self._data.release()
+                self._mmap.close()
+            except BufferError:
+                # records returned by the reader are still referenced, the
+                # mapping is released once they are garbage collected
+                pass
+            self._mmap = None
+        self._data = b""
+        self._fp.close()
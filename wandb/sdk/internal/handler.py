@@ -8,6 +8,7 @@ import json
 import logging
 import numbers
 import os
+import time
 
 import six
 import wandb
@@ -15,7 +16,6 @@ from wandb.proto import wandb_internal_pb2
 
 from . import meta, sample, stats
 from . import tb_watcher
-from ..lib import proto_util
 
 
 if wandb.TYPE_CHECKING:
@@ -25,22 +25,31 @@ if wandb.TYPE_CHECKING:
         Dict,
         Iterable,
         Optional,
+        Set,
     )
     from .settings_static import SettingsStatic
     from six.moves.queue import Queue
     from threading import Event
     from ..interface.interface import BackendSender
-    from wandb.proto.wandb_internal_pb2 import Record, Result
+    from wandb.proto.wandb_internal_pb2 import HistoryRecord, Record, Result
 
     SummaryDict = Dict[str, Any]
 
 
 logger = logging.getLogger(__name__)
 
+# Summary records sent to the sender only carry keys that changed since the
+# previous record, a full snapshot is sent at most this often (and on flush)
+SUMMARY_SNAPSHOT_SECONDS = 60
+
 
 class HandleManager(object):
 
     _consolidated_summary: SummaryDict
+    _summary_json: Dict[str, str]
+    _summary_dirty: Set[str]
+    _summary_removed: Set[str]
+    _summary_snapshot_time: float
     _sampled_history: Dict[str, sample.UniformSampleAccumulator]
     _settings: SettingsStatic
     _record_q: "Queue[Record]"
@@ -77,6 +86,13 @@ class HandleManager(object):
         self._consolidated_summary = dict()
         self._sampled_history = dict()
 
+        # serialized summary values by top-level key and keys changed since
+        # the last summary record, so unchanged values are never re-encoded
+        self._summary_json = dict()
+        self._summary_dirty = set()
+        self._summary_removed = set()
+        self._summary_snapshot_time = time.time()
+
     def handle(self, record: Record) -> None:
         record_type = record.WhichOneof("record_type")
         assert record_type
@@ -117,10 +133,12 @@ class HandleManager(object):
                 self._tb_watcher.finish()
                 self._tb_watcher = None
         elif state == defer.FLUSH_SUM:
-            self._save_summary(self._consolidated_summary, flush=True)
+            self._save_summary(flush=True)
 
         # defer is used to drive the sender finish state machine
         self._dispatch_record(record, always_send=True)
+        # and lets the writer commit what was logged so far
+        self._writer_q.put(record)
 
     def handle_request_login(self, record: Record) -> None:
         self._dispatch_record(record)
@@ -146,33 +164,85 @@ class HandleManager(object):
     def handle_alert(self, record: Record) -> None:
         self._dispatch_record(record)
 
-    def _save_summary(self, summary_dict: SummaryDict, flush: bool = False) -> None:
+    def _update_summary(self, key: str, value_json: Optional[str] = None) -> None:
+        # value_json is None when the value was modified in place and needs
+        # to be serialized again when the next summary record is built
+        if value_json is None:
+            self._summary_json.pop(key, None)
+        else:
+            self._summary_json[key] = value_json
+        self._summary_dirty.add(key)
+        self._summary_removed.discard(key)
+
+    def _remove_summary(self, key: str) -> None:
+        self._summary_json.pop(key, None)
+        self._summary_dirty.discard(key)
+        self._summary_removed.add(key)
+
+    def _summary_value_json(self, key: str) -> str:
+        value_json = self._summary_json.get(key)
+        if value_json is None:
+            value_json = json.dumps(self._consolidated_summary[key])
+            self._summary_json[key] = value_json
+        return value_json
+
+    def _save_summary(self, flush: bool = False) -> None:
+        if not flush and self._settings._offline:
+            # nothing consumes intermediate summaries when offline, changes
+            # stay pending until the full snapshot at flush time
+            return
+
+        now = time.time()
+        snapshot = (
+            flush or now - self._summary_snapshot_time >= SUMMARY_SNAPSHOT_SECONDS
+        )
+        if snapshot:
+            keys: Iterable[str] = self._consolidated_summary.keys()
+            self._summary_snapshot_time = now
+        elif self._summary_dirty or self._summary_removed:
+            keys = self._summary_dirty
+        else:
+            return
+
         summary = wandb_internal_pb2.SummaryRecord()
-        for k, v in six.iteritems(summary_dict):
+        for k in keys:
             update = summary.update.add()
             update.key = k
-            update.value_json = json.dumps(v)
+            update.value_json = self._summary_value_json(k)
+        for k in self._summary_removed:
+            remove = summary.remove.add()
+            remove.key = k
+        self._summary_dirty.clear()
+        self._summary_removed.clear()
+
         record = wandb_internal_pb2.Record(summary=summary)
         if flush:
             self._dispatch_record(record)
-        elif not self._settings._offline:
+        else:
             self._sender_q.put(record)
 
-    def _save_history(self, record: Record) -> None:
-        for item in record.history.item:
+    def _save_history(self, history: HistoryRecord) -> None:
+        for item in history.item:
             # TODO(jhr) save nested keys?
             k = item.key
             v = json.loads(item.value_json)
             if isinstance(v, numbers.Real):
                 self._sampled_history.setdefault(k, sample.UniformSampleAccumulator())
                 self._sampled_history[k].add(v)
+            self._consolidated_summary[k] = v
+            self._update_summary(k, item.value_json)
 
     def handle_history(self, record: Record) -> None:
         self._dispatch_record(record)
-        self._save_history(record)
-        history_dict = proto_util.dict_from_proto_list(record.history.item)
-        self._consolidated_summary.update(history_dict)
-        self._save_summary(self._consolidated_summary)
+        self._save_history(record.history)
+        self._save_summary()
+
+    def handle_history_batch(self, record: Record) -> None:
+        self._dispatch_record(record)
+        for history in record.history_batch.history:
+            self._save_history(history)
+        # one summary update covers all rows in the batch
+        self._save_summary()
 
     def handle_summary(self, record: Record) -> None:
         summary = record.summary
@@ -195,6 +265,10 @@ class HandleManager(object):
 
             # use the last element of the key to write the leaf:
             target[key[-1]] = json.loads(item.value_json)
+            if len(key) == 1:
+                self._update_summary(key[0], item.value_json)
+            else:
+                self._update_summary(key[0])
 
         for item in summary.remove:
             if len(item.nested_key) > 0:
@@ -214,8 +288,12 @@ class HandleManager(object):
 
             # use the last element of the key to erase the leaf:
             del target[key[-1]]
+            if len(key) == 1:
+                self._remove_summary(key[0])
+            else:
+                self._update_summary(key[0])
 
-        self._save_summary(self._consolidated_summary)
+        self._save_summary()
 
     def handle_exit(self, record: Record) -> None:
         self._dispatch_record(record, always_send=True)
@@ -242,7 +320,9 @@ class HandleManager(object):
 
         if not self._settings._disable_stats:
             pid = os.getpid()
-            self._system_stats = stats.SystemStats(pid=pid, interface=self._interface)
+            self._system_stats = stats.SystemStats(
+                pid=pid, interface=self._interface, settings=self._settings
+            )
             self._system_stats.start()
 
         if not self._settings._disable_meta:
@@ -275,10 +355,10 @@ class HandleManager(object):
 
     def handle_request_get_summary(self, record: Record) -> None:
         result = wandb_internal_pb2.Result(uuid=record.uuid)
-        for key, value in six.iteritems(self._consolidated_summary):
+        for key in self._consolidated_summary:
             item = wandb_internal_pb2.SummaryItem()
             item.key = key
-            item.value_json = json.dumps(value)
+            item.value_json = self._summary_value_json(key)
             result.response.get_summary_response.item.append(item)
         self._result_q.put(result)
 
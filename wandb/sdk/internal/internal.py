@@ -272,6 +272,9 @@ class SenderThread(internal_util.RecordLoopThread):
     def _finish(self) -> None:
         self._sm.finish()
 
+    def _debounce(self) -> None:
+        self._sm.debounce()
+
 
 class WriterThread(internal_util.RecordLoopThread):
     """Read records from queue and dispatch to writer routines."""
@@ -306,6 +309,9 @@ class WriterThread(internal_util.RecordLoopThread):
     def _finish(self) -> None:
         self._wm.finish()
 
+    def _debounce(self) -> None:
+        self._wm.debounce(idle=self._input_record_q.empty())
+
 
 class ProcessCheck(object):
     """Class to help watch a process id to detect when it is dead."""
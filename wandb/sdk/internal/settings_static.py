@@ -19,11 +19,24 @@ class SettingsStatic(object):
     # TODO(jhr): figure out how to share type defs with sdk/wandb_settings.py
     _offline: "Optional[bool]"
     _disable_stats: "Optional[bool]"
+    _stats_aggregation: "Optional[str]"
+    _stats_per_cpu: "Optional[bool]"
+    _stats_children: "Optional[bool]"
+    _stats_cpu_budget: "Optional[float]"
+    system_sample_seconds: "Optional[float]"
+    system_samples: "Optional[int]"
     _disable_meta: "Optional[bool]"
     _start_time: float
     files_dir: str
     log_internal: str
     _internal_check_process: bool
+    summary_write_seconds: "Optional[float]"
+    sync_file_fsync: "Optional[str]"
+    sync_file_fsync_seconds: "Optional[float]"
+    _file_stream_inflight: "Optional[int]"
+    _file_stream_backlog_bytes: "Optional[int]"
+    _file_stream_gzip: "Optional[bool]"
+    _tensorboard_inotify: "Optional[bool]"
 
     # TODO(jhr): clean this up, it is only in SettingsStatic and not in Settings
     _log_level: int
@@ -0,0 +1,103 @@
+#
+# -*- coding: utf-8 -*-
+"""Minimal inotify wrapper.
+
+A single inotify file descriptor watching many directories, so one thread
+can wait for changes in all of them with select().  Only available on Linux.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+
+import wandb
+
+if wandb.TYPE_CHECKING:
+    from typing import TYPE_CHECKING
+
+    if TYPE_CHECKING:
+        from typing import List, Optional
+
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+# struct inotify_event: int wd, uint32 mask, uint32 cookie, uint32 len, name
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc() -> "Optional[ctypes.CDLL]":
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(
+                ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+            )
+        except OSError:
+            return None
+        if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+            return None
+        _libc = libc
+    return _libc
+
+
+def available() -> bool:
+    return _load_libc() is not None
+
+
+class Inotify(object):
+    """Reports the watches of files changed in the watched directories."""
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self) -> None:
+        libc = _load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add_watch(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(
+            self._fd, path.encode("utf-8"), self.MASK | IN_ONLYDIR
+        )
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read(self) -> "List[int]":
+        """Returns the watch descriptors with pending changes."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+        wds = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size + length
+            if wd not in wds:
+                wds.append(wd)
+        return wds
+
+    def close(self) -> None:
+        os.close(self._fd)
@@ -4,6 +4,7 @@
 util/redirect.
 """
 
+import codecs
 import io
 import logging
 import os
@@ -114,6 +115,144 @@ class StreamWrapper(RedirectBase):
             self.installed = False
 
 
+def _collapse_cr(text):
+    """Removes the text in each line that a carriage return overwrites.
+
+    Keeps the last carriage return of a line so the result looks the same
+    after the server side CRDedupeFilePolicy has processed it.
+    """
+    if "\r" not in text:
+        return text
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        end = "\r" if line.endswith("\r") else ""
+        body = line[:-1] if end else line
+        cr = body.rfind("\r")
+        if cr > 0:
+            lines[i] = body[cr:] + end
+    return "\n".join(lines)
+
+
+class _ConsoleBuffer(object):
+    def __init__(self):
+        self.lines = []
+        self.lines_size = 0
+        self.partial = ""
+        self.dropped = 0
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+
+
+class ConsoleCoalescer(object):
+    """Coalesces console writes into line-aligned chunks.
+
+    `write` has the signature of the redirect callbacks.  Writes are buffered
+    per stream and passed on to `cb` every `interval` seconds as complete
+    lines, with text overwritten by carriage returns removed.  A partial line
+    is held back until it is completed or the coalescer is stopped.  At most
+    `max_size` characters are buffered per stream, the oldest lines are
+    dropped beyond that and replaced by a note saying how much was dropped.
+    """
+
+    def __init__(self, cb, interval=0.5, max_size=4 * 1024 * 1024):
+        self._cb = cb
+        self._interval = interval
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._captured_bytes = 0
+        self._dropped_bytes = 0
+        self._published_bytes = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._thread_body)
+        self._thread.name = "ConsoleCoalescer"
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush(final=True)
+        logger.info("console output: %s", self.stats())
+
+    def stats(self):
+        """Bytes written to the console, dropped and passed on to `cb`."""
+        with self._lock:
+            return {
+                "captured_bytes": self._captured_bytes,
+                "dropped_bytes": self._dropped_bytes,
+                "published_bytes": self._published_bytes,
+            }
+
+    def write(self, name, data):
+        with self._lock:
+            buf = self._buffers.get(name)
+            if buf is None:
+                buf = self._buffers[name] = _ConsoleBuffer()
+            if isinstance(data, bytes):
+                self._captured_bytes += len(data)
+                data = buf.decoder.decode(data)
+            else:
+                self._captured_bytes += len(data.encode("utf-8", "replace"))
+            text = buf.partial + data
+            newline = text.rfind("\n")
+            if newline >= 0:
+                lines = _collapse_cr(text[: newline + 1])
+                buf.lines.append(lines)
+                buf.lines_size += len(lines)
+                text = text[newline + 1 :]
+            buf.partial = _collapse_cr(text)
+            if buf.lines_size + len(buf.partial) > self._max_size:
+                self._drop(buf)
+
+    def _drop(self, buf):
+        # NOTE: caller must hold self._lock
+        dropped = []
+        while buf.lines and buf.lines_size + len(buf.partial) > self._max_size:
+            lines = buf.lines.pop(0)
+            buf.lines_size -= len(lines)
+            dropped.append(lines)
+        if len(buf.partial) > self._max_size:
+            dropped.append(buf.partial[: -self._max_size])
+            buf.partial = buf.partial[-self._max_size :]
+        size = len("".join(dropped).encode("utf-8", "replace"))
+        buf.dropped += size
+        self._dropped_bytes += size
+
+    def flush(self, final=False):
+        """Passes on the buffered lines, and partial lines when `final`."""
+        chunks = []
+        with self._lock:
+            for name, buf in self._buffers.items():
+                data = "".join(buf.lines)
+                if buf.dropped:
+                    data = (
+                        "[%d bytes of console output dropped]\n" % buf.dropped
+                    ) + data
+                if final:
+                    data += buf.partial
+                    buf.partial = ""
+                buf.lines = []
+                buf.lines_size = 0
+                buf.dropped = 0
+                if data:
+                    self._published_bytes += len(data.encode("utf-8", "replace"))
+                    chunks.append((name, data))
+        for name, data in chunks:
+            try:
+                self._cb(name, data)
+            except Exception:
+                logger.exception("problem publishing console output")
+
+    def _thread_body(self):
+        while not self._stopped.wait(self._interval):
+            self.flush()
+
+
 def _pipe_relay(stopped, fd, name, cb, tee, output_writer):
     while True:
         try:
@@ -0,0 +1,223 @@
+#
+# -*- coding: utf-8 -*-
+"""Shared memory ring buffer queue.
+
+Queue-like transport for protobuf messages between the user process and the
+internal process.  Messages are serialized into a ring buffer in shared memory
+as length prefixed bytes and readers are woken up with a semaphore, avoiding
+the pickling and the feeder thread of multiprocessing.Queue.
+
+Messages which do not fit in the ring buffer are spilled to a temporary file
+and only the file name is passed through the buffer.
+"""
+
+import os
+import struct
+import tempfile
+import time
+
+from six.moves import queue
+import wandb
+
+try:
+    from multiprocessing import shared_memory  # type: ignore
+except ImportError:
+    shared_memory = None  # type: ignore
+
+if wandb.TYPE_CHECKING:
+    from typing import TYPE_CHECKING
+
+    if TYPE_CHECKING:
+        from typing import Any, Dict, Optional, Type
+        from google.protobuf.message import Message
+
+
+# head: total bytes written, tail: total bytes read
+_HEADER = struct.Struct("<QQ")
+_POSITION = struct.Struct("<Q")
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = _POSITION.size
+_LENGTH = struct.Struct("<I")
+_SPILLED = 0x80000000
+
+# how long a writer waits for the reader when the buffer is full
+_FULL_WAIT_SECONDS = 0.001
+
+
+def available() -> bool:
+    return shared_memory is not None
+
+
+def _spilled_size() -> int:
+    # length prefix and the name of a file created by _spill
+    name = os.path.join(tempfile.gettempdir(), "wandb-XXXXXXXX.rec")
+    return _LENGTH.size + len(name.encode("utf-8"))
+
+
+class RingBufferQueue(object):
+    """Multi-producer queue of protobuf messages backed by shared memory.
+
+    Arguments:
+        ctx: multiprocessing context used to create locks and semaphores.
+        message_type: protobuf message class returned by `get()`.
+        size: size of the ring buffer in bytes.
+    """
+
+    _size: int
+    _tail: int
+
+    def __init__(self, ctx: "Any", message_type: "Type[Message]", size: int) -> None:
+        if size < _spilled_size():
+            raise ValueError(
+                "Ring buffer of %d bytes can't hold a spilled message, it needs "
+                "at least %d bytes" % (size, _spilled_size())
+            )
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + size)
+        _HEADER.pack_into(self._shm.buf, 0, 0, 0)
+        self._owner = True
+        self._size = size
+        self._message_type = message_type
+        self._write_lock = ctx.Lock()
+        self._read_lock = ctx.Lock()
+        self._items = ctx.Semaphore(0)
+        self._tail = 0
+
+    def __getstate__(self) -> "Dict[str, Any]":
+        return dict(
+            name=self._shm.name,
+            size=self._size,
+            message_type=self._message_type,
+            write_lock=self._write_lock,
+            read_lock=self._read_lock,
+            items=self._items,
+        )
+
+    def __setstate__(self, state: "Dict[str, Any]") -> None:
+        # spawned processes share the resource tracker of their parent, so
+        # attaching registers the segment a second time which is a no-op.
+        # the creating process owns the segment and unlinks it on close
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._owner = False
+        self._size = state["size"]
+        self._message_type = state["message_type"]
+        self._write_lock = state["write_lock"]
+        self._read_lock = state["read_lock"]
+        self._items = state["items"]
+        self._tail = 0
+
+    def _write(self, pos: int, data: bytes) -> None:
+        buf = self._shm.buf
+        data = memoryview(data)
+        start = _HEADER.size + pos % self._size
+        first = min(len(data), _HEADER.size + self._size - start)
+        buf[start : start + first] = data[:first]
+        if first < len(data):
+            buf[_HEADER.size : _HEADER.size + len(data) - first] = data[first:]
+
+    def _read(self, pos: int, length: int) -> bytes:
+        buf = self._shm.buf
+        start = _HEADER.size + pos % self._size
+        first = min(length, _HEADER.size + self._size - start)
+        data = bytes(buf[start : start + first])
+        if first < length:
+            data += bytes(buf[_HEADER.size : _HEADER.size + length - first])
+        return data
+
+    def _spill(self, data: bytes) -> bytes:
+        fd, path = tempfile.mkstemp(prefix="wandb-", suffix=".rec")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return path.encode("utf-8")
+
+    def _unspill(self, data: bytes) -> bytes:
+        path = data.decode("utf-8")
+        with open(path, "rb") as f:
+            data = f.read()
+        os.remove(path)
+        return data
+
+    def put(
+        self, message: "Message", block: bool = True, timeout: "Optional[float]" = None
+    ) -> None:
+        """Writes message to the buffer, waiting for the reader to make room.
+
+        Like queue.Queue.put, raises queue.Full when the message doesn't fit
+        and block is false or timeout seconds have passed.
+        """
+        deadline = None
+        if block and timeout is not None:
+            deadline = time.time() + timeout
+        data = message.SerializeToString()
+        length = len(data)
+        spilled = None
+        if _LENGTH.size + length > self._size or length >= _SPILLED:
+            data = self._spill(data)
+            spilled = data.decode("utf-8")
+            length = len(data) | _SPILLED
+        needed = _LENGTH.size + len(data)
+
+        try:
+            if needed > self._size:
+                raise ValueError(
+                    "Message of %d bytes doesn't fit in a ring buffer of %d bytes"
+                    % (needed, self._size)
+                )
+            if not self._write_lock.acquire(block, timeout if block else None):
+                raise queue.Full
+            try:
+                self._put_locked(data, length, needed, block, deadline)
+            finally:
+                self._write_lock.release()
+        except BaseException:
+            if spilled is not None:
+                os.remove(spilled)
+            raise
+        self._items.release()
+
+    def _put_locked(
+        self,
+        data: bytes,
+        length: int,
+        needed: int,
+        block: bool,
+        deadline: "Optional[float]",
+    ) -> None:
+        (head,) = _POSITION.unpack_from(self._shm.buf, _HEAD_OFFSET)
+        while self._size - (head - self._tail) < needed:
+            # the cached tail is stale, read it with the reader excluded
+            with self._read_lock:
+                (self._tail,) = _POSITION.unpack_from(self._shm.buf, _TAIL_OFFSET)
+            if self._size - (head - self._tail) >= needed:
+                break
+            if not block or (deadline is not None and time.time() >= deadline):
+                raise queue.Full
+            time.sleep(_FULL_WAIT_SECONDS)
+        self._write(head, _LENGTH.pack(length))
+        self._write(head + _LENGTH.size, data)
+        _POSITION.pack_into(self._shm.buf, _HEAD_OFFSET, head + needed)
+
+    def get(self, block: bool = True, timeout: "Optional[float]" = None) -> "Message":
+        if not self._items.acquire(block, timeout):
+            raise queue.Empty
+        with self._read_lock:
+            (tail,) = _POSITION.unpack_from(self._shm.buf, _TAIL_OFFSET)
+            (length,) = _LENGTH.unpack(self._read(tail, _LENGTH.size))
+            spilled = length & _SPILLED
+            length &= ~_SPILLED
+            data = self._read(tail + _LENGTH.size, length)
+            tail += _LENGTH.size + length
+            _POSITION.pack_into(self._shm.buf, _TAIL_OFFSET, tail)
+        if spilled:
+            data = self._unspill(data)
+        message = self._message_type()
+        message.ParseFromString(data)
+        return message
+
+    def empty(self) -> bool:
+        head, tail = _HEADER.unpack_from(self._shm.buf, 0)
+        return head == tail
+
+    def close(self) -> None:
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -2,8 +2,8 @@
 import contextlib
 import re
 import os
+import threading
 import time
-import shutil
 import requests
 
 from six.moves.urllib.parse import urlparse, quote
@@ -33,6 +33,27 @@ _REQUEST_POOL_CONNECTIONS = 64
 
 _REQUEST_POOL_MAXSIZE = 64
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """Returns the session shared by all storage policies, so downloads of
+    different artifacts reuse the same connection pool."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=_REQUEST_RETRY_STRATEGY,
+                pool_connections=_REQUEST_POOL_CONNECTIONS,
+                pool_maxsize=_REQUEST_POOL_MAXSIZE,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
 
 class Artifact(object):
     """An artifact object you can write files into, and pass to log_artifact."""
@@ -137,7 +158,7 @@ class Artifact(object):
             raise ValueError("Path is not a file: %s" % local_path)
 
         name = name or os.path.basename(local_path)
-        digest = md5_file_b64(local_path)
+        digest = self._cache.md5_file_b64(local_path)
 
         if is_tmp:
             file_path, file_name = os.path.split(name)
@@ -168,9 +189,13 @@ class Artifact(object):
                     logical_path = os.path.join(name, logical_path)
                 paths.append((logical_path, physical_path))
 
+        digests = self._cache.md5_files_b64(physical_path for _, physical_path in paths)
+
         def add_manifest_file(log_phy_path):
             logical_path, physical_path = log_phy_path
-            self._add_local_file(logical_path, physical_path)
+            self._add_local_file(
+                logical_path, physical_path, digest=digests[physical_path]
+            )
 
         import multiprocessing.dummy  # this uses threads
 
@@ -286,12 +311,12 @@ class Artifact(object):
         self._digest = self._manifest.digest()
 
     def _add_local_file(self, name, path, digest=None):
-        digest = digest or md5_file_b64(path)
+        digest = digest or self._cache.md5_file_b64(path)
         size = os.path.getsize(path)
 
         cache_path, hit = self._cache.check_md5_obj_path(digest, size)
         if not hit:
-            shutil.copyfile(path, cache_path)
+            materialize(path, cache_path, allow_symlink=False, allow_hardlink=False)
 
         entry = ArtifactManifestEntry(
             name, None, digest=digest, size=size, local_path=cache_path,
@@ -414,6 +439,11 @@ class ArtifactManifestEntry(object):
 
 
 class WandbStoragePolicy(StoragePolicy):
+    DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+    # attempts to finish a download whose connection dropped part way through,
+    # each one continues from the bytes already written
+    DOWNLOAD_RETRIES = 3
+
     @classmethod
     def name(cls):
         return "wandb-storage-policy-v1"
@@ -425,14 +455,10 @@ class WandbStoragePolicy(StoragePolicy):
     def __init__(self, config=None):
         self._cache = get_artifacts_cache()
         self._config = config or {}
-        self._session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(
-            max_retries=_REQUEST_RETRY_STRATEGY,
-            pool_connections=_REQUEST_POOL_CONNECTIONS,
-            pool_maxsize=_REQUEST_POOL_MAXSIZE,
-        )
-        self._session.mount("http://", adapter)
-        self._session.mount("https://", adapter)
+        self._session = _get_session()
+        self._stats_lock = threading.Lock()
+        self.files_downloaded = 0
+        self.bytes_downloaded = 0
 
         s3 = S3Handler()
         gcs = GCSHandler()
@@ -456,17 +482,101 @@ class WandbStoragePolicy(StoragePolicy):
         )
         if hit:
             return path
+        with self._cache.obj_lock(path):
+            # another thread may have downloaded it while we waited
+            path, hit = self._cache.check_md5_obj_path(
+                manifest_entry.digest, manifest_entry.size
+            )
+            if hit:
+                return path
+            url = self._file_url(self._api, artifact.entity, manifest_entry)
+            # obj_lock only excludes threads, so each process writes its own
+            # partial file, e.g. when several ranks of a job download at once
+            partial_path = "%s.%d.partial" % (path, os.getpid())
+            for attempt in range(self.DOWNLOAD_RETRIES + 1):
+                try:
+                    resumed = self._download_partial(
+                        url, partial_path, manifest_entry.size
+                    )
+                    break
+                except (
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError,
+                ):
+                    if attempt == self.DOWNLOAD_RETRIES:
+                        raise
+            if not self._partial_matches(partial_path, manifest_entry, resumed):
+                # the partial file was stale or corrupt, start over once
+                os.remove(partial_path)
+                self._download_partial(url, partial_path, manifest_entry.size)
+                if not self._partial_matches(partial_path, manifest_entry, False):
+                    os.remove(partial_path)
+                    raise ValueError(
+                        "Downloaded file %s doesn't match its manifest entry" % name
+                    )
+            path, hit = self._cache.check_md5_obj_path(
+                manifest_entry.digest, manifest_entry.size
+            )
+            if hit:
+                # another process finished the same object first
+                os.remove(partial_path)
+                return path
+            getattr(os, "replace", os.rename)(partial_path, path)
+        return path
+
+    def _partial_matches(self, partial_path, manifest_entry, resumed):
+        """Checks the size of a downloaded file, and the digest as well when
+        the download continued a partial file left by an earlier attempt."""
+        size = manifest_entry.size
+        if size is not None and os.path.getsize(partial_path) != size:
+            return False
+        return not resumed or md5_file_b64(partial_path) == manifest_entry.digest
+
+    def _download_partial(self, url, partial_path, size):
+        """Downloads url into partial_path, asking the server for the missing
+        range when a previous attempt left part of the file behind.
+
+        Returns whether the download continued an existing partial file.
+        """
+        offset = 0
+        if os.path.isfile(partial_path):
+            offset = os.path.getsize(partial_path)
+            if size is None or offset >= size:
+                offset = 0
+        headers = {"Range": "bytes=%d-" % offset} if offset else {}
         response = self._session.get(
-            self._file_url(self._api, artifact.entity, manifest_entry),
-            auth=("api", self._api.api_key),
-            stream=True,
+            url, auth=("api", self._api.api_key), stream=True, headers=headers,
         )
+        if offset and response.status_code == 416:
+            # the object changed since the partial file was written
+            os.remove(partial_path)
+            return self._download_partial(url, partial_path, size)
         response.raise_for_status()
-
-        with open(path, "wb") as file:
-            for data in response.iter_content(chunk_size=16 * 1024):
-                file.write(data)
-        return path
+        if response.status_code != 206:
+            # the server sent the whole file
+            offset = 0
+
+        written = 0
+        with open(partial_path, "ab" if offset else "wb") as file:
+            try:
+                for data in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_BYTES):
+                    file.write(data)
+                    written += len(data)
+            finally:
+                with self._stats_lock:
+                    self.bytes_downloaded += written
+        expected = response.headers.get("Content-Length")
+        # with a content encoding the length is of the encoded body
+        encoded = response.headers.get("Content-Encoding") not in (None, "identity")
+        if expected is not None and not encoded and written < int(expected):
+            # the connection closed early without an error, the next attempt
+            # continues from what was written
+            raise requests.exceptions.ChunkedEncodingError(
+                "Download of %s ended after %d of %s bytes" % (url, written, expected)
+            )
+        with self._stats_lock:
+            self.files_downloaded += 1
+        return offset > 0
 
     def store_reference(
         self, artifact, path, name=None, checksum=True, max_objects=None
@@ -504,7 +614,9 @@ class WandbStoragePolicy(StoragePolicy):
         # write-through cache
         cache_path, hit = self._cache.check_md5_obj_path(entry.digest, entry.size)
         if not hit:
-            shutil.copyfile(entry.local_path, cache_path)
+            materialize(
+                entry.local_path, cache_path, allow_symlink=False, allow_hardlink=False
+            )
 
         resp = preparer.prepare(
             lambda: {
@@ -687,15 +799,14 @@ class LocalFileHandler(StorageHandler):
         if hit:
             return path
 
-        md5 = md5_file_b64(local_path)
+        md5 = self._cache.md5_file_b64(local_path)
         if md5 != manifest_entry.digest:
             raise ValueError(
                 "Local file reference: Digest mismatch for path %s: expected %s but found %s"
                 % (local_path, manifest_entry.digest, md5)
             )
 
-        util.mkdir_exists_ok(os.path.dirname(path))
-        shutil.copy(local_path, path)
+        materialize(local_path, path, allow_symlink=False, allow_hardlink=False)
         return path
 
     def store_path(self, artifact, path, name=None, checksum=True, max_objects=None):
@@ -718,6 +829,7 @@ class LocalFileHandler(StorageHandler):
                 % (max_objects, local_path),
                 newline=False,
             )
+            paths = []
             for root, dirs, files in os.walk(local_path):
                 for sub_path in files:
                     i += 1
@@ -730,13 +842,18 @@ class LocalFileHandler(StorageHandler):
                     logical_path = os.path.relpath(physical_path, start=local_path)
                     if name is not None:
                         logical_path = os.path.join(name, logical_path)
-                    entry = ArtifactManifestEntry(
-                        logical_path,
-                        os.path.join(path, logical_path),
-                        size=os.path.getsize(physical_path),
-                        digest=md5_file_b64(physical_path),
-                    )
-                    entries.append(entry)
+                    paths.append((logical_path, physical_path))
+            digests = self._cache.md5_files_b64(
+                physical_path for _, physical_path in paths
+            )
+            for logical_path, physical_path in paths:
+                entry = ArtifactManifestEntry(
+                    logical_path,
+                    os.path.join(path, logical_path),
+                    size=os.path.getsize(physical_path),
+                    digest=digests[physical_path],
+                )
+                entries.append(entry)
             termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
         elif os.path.isfile(local_path):
             name = name or os.path.basename(local_path)
@@ -744,7 +861,7 @@ class LocalFileHandler(StorageHandler):
                 name,
                 path,
                 size=os.path.getsize(local_path),
-                digest=md5_file_b64(local_path),
+                digest=self._cache.md5_file_b64(local_path),
             )
             entries.append(entry)
         else:
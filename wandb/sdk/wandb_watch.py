@@ -16,7 +16,14 @@ logger = logging.getLogger("wandb")
 _global_watch_idx = 0
 
 
-def watch(models, criterion=None, log="gradients", log_freq=1000, idx=None):
+def watch(
+    models,
+    criterion=None,
+    log="gradients",
+    log_freq=1000,
+    idx=None,
+    histogram_sample_size=None,
+):
     """
     Hooks into the torch model to collect gradients and the topology.  Should be extended
     to accept arbitrary ML models.
@@ -27,6 +34,8 @@ def watch(models, criterion=None, log="gradients", log_freq=1000, idx=None):
         log: (str) One of "gradients", "parameters", "all", or None
         log_freq: (int) log gradients and parameters every N batches
         idx: (int) an index to be used when calling wandb.watch on multiple models
+        histogram_sample_size: (int) histogram tensors with more elements from a
+            random sample of this many elements, which is faster but approximate
 
     Returns:
         `wandb.Graph` The graph object that will populate after the first backward pass
@@ -88,6 +97,7 @@ def watch(models, criterion=None, log="gradients", log_freq=1000, idx=None):
             prefix=prefix,
             log_freq=log_freq,
             jupyter_run=wandb.run if in_jupyter else None,
+            sample_size=histogram_sample_size,
         )
 
         graph = wandb.wandb_torch.TorchGraph.hook_torch(
@@ -2,12 +2,35 @@
 import base64
 import binascii
 import codecs
+import ctypes
+import ctypes.util
+import errno
 import hashlib
+import logging
+import mmap
+import multiprocessing
 import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
 
 from wandb import env
 from wandb import util
 
+logger = logging.getLogger(__name__)
+
+HASH_READ_BYTES = 1024 * 1024
+# files this large are hashed from a memory map instead of read into buffers
+HASH_MMAP_MIN_BYTES = 16 * 1024 * 1024
+# threads hashing files, shared by all the hashing in the process
+HASH_THREADS = min(32, multiprocessing.cpu_count() + 4)
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+_hash_worker = threading.local()
+
 
 def md5_string(string):
     hash_md5 = hashlib.md5()
@@ -22,7 +45,18 @@ def b64_string_to_hex(string):
 def md5_hash_file(path):
     hash_md5 = hashlib.md5()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(64 * 1024), b""):
+        if os.fstat(f.fileno()).st_size >= HASH_MMAP_MIN_BYTES:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, EnvironmentError):
+                mapped = None
+            if mapped is not None:
+                try:
+                    hash_md5.update(mapped)
+                finally:
+                    mapped.close()
+                return hash_md5
+        for chunk in iter(lambda: f.read(HASH_READ_BYTES), b""):
             hash_md5.update(chunk)
     return hash_md5
 
@@ -35,11 +69,128 @@ def md5_file_hex(path):
     return md5_hash_file(path).hexdigest()
 
 
+def _mark_hash_worker():
+    _hash_worker.active = True
+
+
+def _hash_map(fn, items):
+    """Calls fn for every item on the shared hashing threads.  hashlib releases
+    the GIL while it hashes, so files are hashed in parallel."""
+    global _hash_pool
+    if len(items) < 2 or getattr(_hash_worker, "active", False):
+        return [fn(item) for item in items]
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            import multiprocessing.dummy  # this uses threads
+
+            _hash_pool = multiprocessing.dummy.Pool(
+                HASH_THREADS, initializer=_mark_hash_worker
+            )
+    return _hash_pool.map(fn, items)
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    mtime_ns = getattr(st, "st_mtime_ns", None)
+    if mtime_ns is None:
+        mtime_ns = int(st.st_mtime * 1e9)
+    return (os.path.abspath(path), st.st_ino, st.st_size, mtime_ns)
+
+
 def bytes_to_hex(bytestr):
     # Works in python2 / python3
     return codecs.getencoder("hex")(bytestr)[0]
 
 
+# linux ioctl cloning a whole file, _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def _reflink(src, dst):
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+    elif sys.platform == "darwin":
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "clonefile"):
+            raise OSError(errno.ENOTSUP, "clonefile is not available")
+        if libc.clonefile(src.encode("utf-8"), dst.encode("utf-8"), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), dst)
+    else:
+        raise OSError(errno.ENOTSUP, "reflinks are not supported on this platform")
+    shutil.copystat(src, dst)
+
+
+def _hardlink(src, dst):
+    if not hasattr(os, "link"):
+        raise OSError(errno.ENOTSUP, "hardlinks are not supported")
+    os.link(src, dst)
+
+
+def _symlink(src, dst):
+    if not hasattr(os, "symlink"):
+        raise OSError(errno.ENOTSUP, "symlinks are not supported")
+    os.symlink(os.path.abspath(src), dst)
+
+
+_MATERIALIZERS = {
+    "reflink": _reflink,
+    "hardlink": _hardlink,
+    "symlink": _symlink,
+    "copy": shutil.copy2,
+}
+
+MATERIALIZE_STRATEGIES = tuple(_MATERIALIZERS)
+
+
+def materialize(src, dst, strategy=None, allow_symlink=True, allow_hardlink=True):
+    """Places the contents of the file src at dst.
+
+    The strategy is one of MATERIALIZE_STRATEGIES, by default the one set with
+    the WANDB_ARTIFACT_MATERIALIZE environment variable.  A reflink shares the
+    blocks of src until either file is written (on filesystems with copy on
+    write, e.g. btrfs, xfs and apfs), hardlinks and symlinks make dst the same
+    file as src, so changes to one are seen in the other.  When the strategy
+    fails for this file, e.g. across devices, dst is copied instead.  Cache
+    objects must outlive the file they were added from and keep its contents
+    when it is rewritten, they are created with allow_symlink=False and
+    allow_hardlink=False which copy instead of linking.
+
+    dst is created under a temporary name and renamed into place, replacing a
+    link rather than writing through it.  Returns the strategy that was used.
+    """
+    strategy = strategy or env.get_artifact_materialize()
+    if strategy not in _MATERIALIZERS:
+        raise ValueError(
+            "Invalid materialize strategy %s, expected one of %s"
+            % (strategy, ", ".join(MATERIALIZE_STRATEGIES))
+        )
+    if (strategy == "symlink" and not allow_symlink) or (
+        strategy == "hardlink" and not allow_hardlink
+    ):
+        strategy = "copy"
+    dst_dir = os.path.dirname(dst)
+    if dst_dir:
+        util.mkdir_exists_ok(dst_dir)
+    tmp_path = "%s.%s.tmp" % (dst, util.generate_id())
+    strategies = [strategy] if strategy == "copy" else [strategy, "copy"]
+    for attempt in strategies:
+        try:
+            _MATERIALIZERS[attempt](src, tmp_path)
+            getattr(os, "replace", os.rename)(tmp_path, dst)
+            return attempt
+        except (IOError, OSError) as e:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            if attempt == "copy":
+                raise
+            logger.info("Can't %s %s to %s, copying it: %s", attempt, src, dst, e)
+    return None
+
+
 class ArtifactManifest(object):
     @classmethod
     # TODO: we don't need artifact here.
@@ -163,12 +314,111 @@ class StorageHandler(object):
 
 
 class ArtifactsCache(object):
+    # files modified this recently are not added to the digest cache, their
+    # mtime could be unchanged by a write that happens right after hashing
+    DIGEST_MIN_AGE_SECONDS = 2
+
     def __init__(self, cache_dir):
         self._cache_dir = cache_dir
         util.mkdir_exists_ok(self._cache_dir)
         self._md5_obj_dir = os.path.join(self._cache_dir, "obj", "md5")
         self._etag_obj_dir = os.path.join(self._cache_dir, "obj", "etag")
+        self._digest_dir = os.path.join(self._cache_dir, "digests")
         self._artifacts_by_id = {}
+        self._digest_lock = threading.Lock()
+        self._obj_locks = {}
+        self._obj_locks_lock = threading.Lock()
+        self.digest_hits = 0
+        self.digest_misses = 0
+        self.bytes_hashed = 0
+
+    def md5_file_b64(self, path, refresh=False):
+        """Returns the base64 md5 of a file, using the persistent digest cache.
+
+        Digests are stored one per file under `digests/`, keyed by the
+        absolute path, inode, size and mtime of the hashed file, so a file
+        which was changed in any way is hashed again.  Entries are written to
+        a temporary file and renamed into place, which makes the cache safe
+        to share between processes.  With refresh the file is always hashed
+        and its entry replaced.
+        """
+        try:
+            key = _stat_key(path)
+        except OSError:
+            return md5_file_b64(path)
+        key_str = "%s\n%d\n%d\n%d" % key
+        key_hex = hashlib.md5(key_str.encode("utf-8")).hexdigest()
+        entry_path = os.path.join(self._digest_dir, key_hex[:2], key_hex[2:])
+        if not refresh:
+            try:
+                with open(entry_path, "rb") as f:
+                    cached_key, digest = f.read().decode("utf-8").rsplit("\n", 1)
+                if cached_key == key_str:
+                    with self._digest_lock:
+                        self.digest_hits += 1
+                    return digest
+            except (IOError, OSError, ValueError):
+                pass
+
+        with self._digest_lock:
+            self.digest_misses += 1
+            self.bytes_hashed += key[2]
+        digest = md5_file_b64(path)
+        try:
+            if _stat_key(path) != key:
+                # changed while we were reading it
+                return digest
+        except OSError:
+            return digest
+        if time.time() - key[3] / 1e9 >= self.DIGEST_MIN_AGE_SECONDS:
+            self._store_digest(entry_path, key_str, digest)
+        return digest
+
+    def md5_file_hex(self, path):
+        return b64_string_to_hex(self.md5_file_b64(path))
+
+    def md5_files_b64(self, paths, refresh=False):
+        """Returns a dict of the base64 md5 of each path, see md5_file_b64.
+
+        The files are hashed on HASH_THREADS threads and the throughput is
+        logged.
+        """
+        paths = list(paths)
+        start_time = time.time()
+        with self._digest_lock:
+            misses_before, bytes_before = self.digest_misses, self.bytes_hashed
+        digests = _hash_map(lambda path: self.md5_file_b64(path, refresh), paths)
+        elapsed = max(time.time() - start_time, 1e-6)
+        with self._digest_lock:
+            hashed = self.digest_misses - misses_before
+            mb_hashed = (self.bytes_hashed - bytes_before) / (1024 * 1024)
+        logger.info(
+            "Hashed %d of %d files, %.2fMB in %.1fs (%.2fMB/s)",
+            hashed,
+            len(paths),
+            mb_hashed,
+            elapsed,
+            mb_hashed / elapsed,
+        )
+        return dict(zip(paths, digests))
+
+    def _store_digest(self, entry_path, key_str, digest):
+        # the cache is an optimization, never fail hashing because of it
+        entry_dir = os.path.dirname(entry_path)
+        try:
+            util.mkdir_exists_ok(entry_dir)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_dir, prefix=".tmp")
+        except (IOError, OSError):
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(("%s\n%s" % (key_str, digest)).encode("utf-8"))
+            getattr(os, "replace", os.rename)(tmp_path, entry_path)
+        except (IOError, OSError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
     def check_md5_obj_path(self, b64_md5, size):
         hex_md5 = util.bytes_to_hex(base64.b64decode(b64_md5))
@@ -178,6 +428,14 @@ class ArtifactsCache(object):
         util.mkdir_exists_ok(os.path.dirname(path))
         return path, False
 
+    def obj_lock(self, path):
+        """Returns the lock held by threads writing the object at path."""
+        with self._obj_locks_lock:
+            lock = self._obj_locks.get(path)
+            if lock is None:
+                lock = self._obj_locks[path] = threading.Lock()
+            return lock
+
     def check_etag_obj_path(self, etag, size):
         path = os.path.join(self._cache_dir, "obj", "etag", etag[:2], etag[2:])
         if os.path.isfile(path) and os.path.getsize(path) == size:
@@ -9,6 +9,7 @@ Manage backend sender.
 import json
 import logging
 import threading
+import time
 import uuid
 
 import six
@@ -122,7 +123,12 @@ class BackendSender(object):
         pass
 
     def __init__(
-        self, record_q=None, result_q=None, process=None,
+        self,
+        record_q=None,
+        result_q=None,
+        process=None,
+        history_batch_rows=None,
+        history_batch_seconds=None,
     ):
         self.record_q = record_q
         self.result_q = result_q
@@ -133,6 +139,23 @@ class BackendSender(object):
         if record_q and result_q:
             self._router = MessageRouter(record_q, result_q)
 
+        # history rows are published as one HistoryBatchRecord when batching
+        # is enabled, flushed before any other record to keep ordering
+        self._history_batch_rows = history_batch_rows or 0
+        self._history_batch_seconds = history_batch_seconds or 0
+        self._history_batch = None
+        self._history_batch_deadline = 0.0
+        self._history_batch_cond = threading.Condition()
+        self._history_batch_stopped = False
+        self._history_batch_thread = None
+        if self._history_batch_rows > 1:
+            self._history_batch_thread = threading.Thread(
+                target=self._history_batch_loop
+            )
+            self._history_batch_thread.name = "HistoryBatchThread"
+            self._history_batch_thread.daemon = True
+            self._history_batch_thread.start()
+
     def _hack_set_run(self, run):
         self._run = run
 
@@ -166,10 +189,60 @@ class BackendSender(object):
         self._publish(rec)
 
     def _publish_history(self, history):
-        rec = self._make_record(history=history)
-        self._publish(rec)
+        if not self._history_batch_thread:
+            rec = self._make_record(history=history)
+            self._publish(rec)
+            return
+        with self._history_batch_cond:
+            if self._history_batch is None:
+                self._history_batch = wandb_internal_pb2.Record()
+                self._history_batch_deadline = time.time() + self._history_batch_seconds
+                self._history_batch_cond.notify()
+            batch = self._history_batch.history_batch
+            batch.history.add().CopyFrom(history)
+            if len(batch.history) >= self._history_batch_rows:
+                self._flush_history_batch()
+
+    def _flush_history_batch(self):
+        # NOTE: caller must hold self._history_batch_cond
+        if self._history_batch is None:
+            return
+        rec = self._history_batch
+        self._history_batch = None
+        try:
+            self._publish_record(rec)
+        except Exception:
+            # keep the rows, the next flush publishes them again
+            self._history_batch = rec
+            raise
+
+    def _history_batch_loop(self):
+        with self._history_batch_cond:
+            while not self._history_batch_stopped:
+                if self._history_batch is None:
+                    self._history_batch_cond.wait()
+                    continue
+                remaining = self._history_batch_deadline - time.time()
+                if remaining > 0:
+                    self._history_batch_cond.wait(remaining)
+                    continue
+                try:
+                    self._flush_history_batch()
+                except Exception as e:
+                    # the next publish from the user process will raise
+                    logger.warning("history batch publish failed, will retry: %s", e)
+                    self._history_batch_deadline = time.time() + max(
+                        self._history_batch_seconds, 1
+                    )
+
+    def flush_history(self):
+        """Publish history rows waiting to be batched."""
+        if not self._history_batch_thread:
+            return
+        with self._history_batch_cond:
+            self._flush_history_batch()
 
-    def publish_history(self, data, step=None, run=None):
+    def _make_history(self, data, step=None, run=None):
         run = run or self._run
         data = data_types.history_dict_to_json(run, data, step=step)
         history = wandb_internal_pb2.HistoryRecord()
@@ -177,8 +250,22 @@ class BackendSender(object):
             item = history.item.add()
             item.key = k
             item.value_json = json_dumps_safer_history(v)
+        return history
+
+    def publish_history(self, data, step=None, run=None):
+        history = self._make_history(data, step=step, run=run)
         self._publish_history(history)
 
+    def publish_history_batch(self, rows, run=None):
+        """Publish several history rows as a single record."""
+        if not rows:
+            return
+        rec = wandb_internal_pb2.Record()
+        for data in rows:
+            history = self._make_history(data, run=run)
+            rec.history_batch.history.add().CopyFrom(history)
+        self._publish(rec)
+
     def publish_telemetry(self, telem):
         rec = self._make_record(telemetry=telem)
         self._publish(rec)
@@ -454,15 +541,31 @@ class BackendSender(object):
             raise Exception("Invalid record")
         return record
 
+    def _publish_record(self, record):
+        while True:
+            if self._process and not self._process.is_alive():
+                raise Exception("The wandb backend process has shutdown")
+            try:
+                # bounded queues like the shared memory ring buffer block while
+                # full, wake up to notice a backend process that died
+                self.record_q.put(record, timeout=1)
+                return
+            except queue.Full:
+                continue
+
     def _publish(self, record, local=None):
-        if self._process and not self._process.is_alive():
-            raise Exception("The wandb backend process has shutdown")
         if local:
             record.control.local = local
-        self.record_q.put(record)
+        if not self._history_batch_thread:
+            self._publish_record(record)
+            return
+        with self._history_batch_cond:
+            self._flush_history_batch()
+            self._publish_record(record)
 
     def _communicate(self, rec, timeout=5, local=None):
         assert self._router
+        self.flush_history()
         future = self._router.send_and_receive(rec, local=local)
         f = future.get(timeout)
         return f
@@ -677,6 +780,14 @@ class BackendSender(object):
         return sampled_history_response
 
     def join(self):
+        if self._history_batch_thread:
+            with self._history_batch_cond:
+                self._flush_history_batch()
+                self._history_batch_stopped = True
+                self._history_batch_cond.notify()
+            self._history_batch_thread.join()
+            self._history_batch_thread = None
+
         # shutdown
         request = wandb_internal_pb2.Request(
             shutdown=wandb_internal_pb2.ShutdownRequest()
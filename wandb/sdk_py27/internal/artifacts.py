@@ -5,7 +5,7 @@ import tempfile
 
 import wandb.filesync.step_prepare
 
-from ..interface.artifacts import ArtifactManifest
+from ..interface.artifacts import ArtifactManifest, get_artifacts_cache
 
 
 def _manifest_json_from_proto(manifest):
@@ -147,7 +147,7 @@ class ArtifactSaver(object):
             with tempfile.NamedTemporaryFile("w+", suffix=".json", delete=False) as fp:
                 path = os.path.abspath(fp.name)
                 json.dump(self._manifest.to_manifest_json(), fp, indent=4)
-            digest = wandb.util.md5_file(path)
+            digest = get_artifacts_cache().md5_file_b64(path)
             if distributed_id:
                 # If we're in the distributed flow, we want to update the
                 # patch manifest we created with our finalized digest.
@@ -2,6 +2,9 @@
 import base64
 import binascii
 import collections
+import gzip
+import io
+import json
 import logging
 import threading
 import requests
@@ -117,8 +120,12 @@ class BinaryFilePolicy(DefaultFilePolicy):
 class FileStreamApi(object):
     """Pushes chunks of files to our streaming endpoint.
 
-    This class is used as a singleton. It has a thread that serializes access to
-    the streaming endpoint and performs rate-limiting and batching.
+    This class is used as a singleton. Chunks are batched per file and a
+    dispatcher thread hands posts to a pool of sender threads, performing
+    rate-limiting.  At most one post per file is in flight so chunks of a file
+    arrive in order, and at most `max_inflight` posts are in flight overall.
+    `push()` blocks while more than `max_backlog_bytes` of chunks are waiting
+    or in flight.
 
     TODO: Differentiate between binary/text encoding.
     """
@@ -128,7 +135,16 @@ class FileStreamApi(object):
     HTTP_TIMEOUT = env.get_http_timeout(10)
     MAX_ITEMS_PER_PUSH = 10000
 
-    def __init__(self, api, run_id, start_time, settings=None):
+    def __init__(
+        self,
+        api,
+        run_id,
+        start_time,
+        settings=None,
+        max_inflight=None,
+        max_backlog_bytes=None,
+        gzip=None,
+    ):
         if settings is None:
             settings = dict()
         self._settings = settings
@@ -146,11 +162,38 @@ class FileStreamApi(object):
             }
         )
         self._file_policies = {}
-        self._queue = queue.Queue()
+        self._max_inflight = max_inflight or 1
+        self._max_backlog_bytes = max_backlog_bytes or 0
+        self._gzip = gzip
+
+        # chunks waiting to be posted by file name, protected by _lock
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._chunks = collections.OrderedDict()
+        self._inflight_files = set()
+        self._finished = None
+        self._stats = dict(
+            queued_chunks=0,
+            queued_bytes=0,
+            inflight_requests=0,
+            inflight_bytes=0,
+            sent_requests=0,
+            sent_bytes=0,
+            blocked_seconds=0.0,
+        )
+
+        self._post_q = queue.Queue()
         self._thread = threading.Thread(target=self._thread_body)
         # It seems we need to make this a daemon thread to get sync.py's atexit handler to run, which
         # cleans this thread up.
         self._thread.daemon = True
+        self._post_threads = []
+        for i in range(self._max_inflight):
+            t = threading.Thread(target=self._post_thread_body)
+            t.name = "FileStreamPost-%d" % i
+            t.daemon = True
+            self._post_threads.append(t)
         self._init_endpoint()
 
     def _init_endpoint(self):
@@ -166,6 +209,8 @@ class FileStreamApi(object):
     def start(self):
         self._init_endpoint()
         self._thread.start()
+        for t in self._post_threads:
+            t.start()
 
     def set_default_file_policy(self, filename, file_policy):
         """Set an upload policy for a file unless one has already been set.
@@ -190,66 +235,130 @@ class FileStreamApi(object):
         else:
             return max(5, self.heartbeat_seconds)
 
-    def _read_queue(self):
-        # called from the push thread (_thread_body), this does an initial read
-        # that'll block for up to rate_limit_seconds. Then it tries to read
-        # as much out of the queue as it can. We do this because the http post
-        # to the server happens within _thread_body, and can take longer than
-        # our rate limit. So next time we get a chance to read the queue we want
-        # read all the stuff that queue'd up since last time.
-        #
-        # If we have more than MAX_ITEMS_PER_PUSH in the queue then the push thread
-        # will get behind and data will buffer up in the queue.
-        return util.read_many_from_queue(
-            self._queue, self.MAX_ITEMS_PER_PUSH, self.rate_limit_seconds()
-        )
+    def stats(self):
+        """Return a copy of the backlog and throughput counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _take_files(self):
+        # called with _lock held, builds a post of the pending chunks of all
+        # files which do not have a post in flight
+        files = {}
+        nbytes = 0
+        for filename in list(self._chunks):
+            if filename in self._inflight_files:
+                continue
+            chunks = self._chunks[filename]
+            if len(chunks) > self.MAX_ITEMS_PER_PUSH:
+                self._chunks[filename] = chunks[self.MAX_ITEMS_PER_PUSH :]
+                chunks = chunks[: self.MAX_ITEMS_PER_PUSH]
+            else:
+                del self._chunks[filename]
+            size = sum(len(c.data) for c in chunks)
+            self._stats["queued_chunks"] -= len(chunks)
+            self._stats["queued_bytes"] -= size
+            nbytes += size
+            # Specific file policies are set by internal/sender.py
+            self.set_default_file_policy(filename, DefaultFilePolicy())
+            files[filename] = self._file_policies[filename].process_chunks(chunks)
+            if not files[filename]:
+                del files[filename]
+                continue
+            self._inflight_files.add(filename)
+        return files, nbytes
 
     def _thread_body(self):
         posted_data_time = time.time()
         posted_anything_time = time.time()
-        ready_chunks = []
-        finished = None
-        while finished is None:
-            items = self._read_queue()
-            for item in items:
-                if isinstance(item, self.Finish):
-                    finished = item
-                else:
-                    # item is Chunk
-                    ready_chunks.append(item)
-
-            cur_time = time.time()
-
-            if ready_chunks and (
-                finished or cur_time - posted_data_time > self.rate_limit_seconds()
-            ):
-                posted_data_time = cur_time
-                posted_anything_time = cur_time
-                self._send(ready_chunks)
-                ready_chunks = []
-
-            if cur_time - posted_anything_time > self.heartbeat_seconds:
-                posted_anything_time = cur_time
-                self._handle_response(
-                    util.request_with_retry(
-                        self._client.post,
-                        self._endpoint,
-                        json={"complete": False, "failed": False},
+        while True:
+            post = None
+            with self._lock:
+                if self._finished is None:
+                    self._changed.wait(self.rate_limit_seconds())
+                finished = self._finished is not None
+                if finished and not self._chunks and not self._inflight_files:
+                    break
+                cur_time = time.time()
+                if (
+                    self._chunks
+                    and self._stats["inflight_requests"] < self._max_inflight
+                    and (
+                        finished
+                        or cur_time - posted_data_time > self.rate_limit_seconds()
                     )
-                )
+                ):
+                    files, nbytes = self._take_files()
+                    if files:
+                        post = ({"files": files}, set(files), nbytes)
+                elif (
+                    cur_time - posted_anything_time > self.heartbeat_seconds
+                    and not self._stats["inflight_requests"]
+                ):
+                    post = ({"complete": False, "failed": False}, set(), 0)
+                if post:
+                    posted_anything_time = cur_time
+                    if post[1] or post[2]:
+                        posted_data_time = cur_time
+                    self._stats["inflight_requests"] += 1
+                    self._stats["inflight_bytes"] += post[2]
+            if post:
+                self._post_q.put(post)
+            if finished:
+                # wait for posts in flight without spinning
+                with self._lock:
+                    if self._inflight_files or self._stats["inflight_requests"]:
+                        self._changed.wait(self.rate_limit_seconds())
+
+        for _ in self._post_threads:
+            self._post_q.put(None)
+        for t in self._post_threads:
+            t.join()
         # post the final close message. (item is self.Finish instance now)
         util.request_with_retry(
             self._client.post,
             self._endpoint,
-            json={"complete": True, "exitcode": int(finished.exitcode)},
+            json={"complete": True, "exitcode": int(self._finished.exitcode)},
+        )
+
+    def _post_thread_body(self):
+        while True:
+            post = self._post_q.get()
+            if post is None:
+                return
+            payload, filenames, nbytes = post
+            try:
+                self._handle_response(self._post(payload))
+            except Exception as e:
+                wandb.termerror("Droppped streaming file chunk (see wandb/debug.log)")
+                logger.error("dropped chunk %s" % e)
+            with self._lock:
+                self._inflight_files -= filenames
+                self._stats["inflight_requests"] -= 1
+                self._stats["inflight_bytes"] -= nbytes
+                self._stats["sent_requests"] += 1
+                self._stats["sent_bytes"] += nbytes
+                self._changed.notify()
+                self._not_full.notify_all()
+
+    def _post(self, payload):
+        if not self._gzip:
+            return util.request_with_retry(
+                self._client.post, self._endpoint, json=payload
+            )
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode="wb") as f:
+            f.write(json.dumps(payload).encode("utf-8"))
+        return util.request_with_retry(
+            self._client.post,
+            self._endpoint,
+            data=buf.getvalue(),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
         )
 
     def _handle_response(self, response):
         """Logs dropped chunks and updates dynamic settings"""
         if isinstance(response, Exception):
             raise response
-            wandb.termerror("Droppped streaming file chunk (see wandb/debug.log)")
-            logging.error("dropped chunk %s" % response)
         elif response.json().get("limits"):
             parsed = response.json()
             self._api.dynamic_settings.update(parsed["limits"])
@@ -268,11 +377,7 @@ class FileStreamApi(object):
             if not files[filename]:
                 del files[filename]
 
-        self._handle_response(
-            util.request_with_retry(
-                self._client.post, self._endpoint, json={"files": files}
-            )
-        )
+        self._handle_response(self._post({"files": files}))
 
     def stream_file(self, path):
         name = path.split("/")[-1]
@@ -282,12 +387,28 @@ class FileStreamApi(object):
     def push(self, filename, data):
         """Push a chunk of a file to the streaming endpoint.
 
+        Blocks while the backlog is over max_backlog_bytes.
+
         Arguments:
             filename: Name of file that this is a chunk of.
             chunk_id: TODO: change to 'offset'
             chunk: File data.
         """
-        self._queue.put(Chunk(filename, data))
+        with self._lock:
+            if self._max_backlog_bytes:
+                start = None
+                while (
+                    self._finished is None
+                    and self._stats["queued_bytes"] + self._stats["inflight_bytes"]
+                    >= self._max_backlog_bytes
+                ):
+                    start = start or time.time()
+                    self._not_full.wait()
+                if start:
+                    self._stats["blocked_seconds"] += time.time() - start
+            self._chunks.setdefault(filename, []).append(Chunk(filename, data))
+            self._stats["queued_chunks"] += 1
+            self._stats["queued_bytes"] += len(data)
 
     def finish(self, exitcode):
         """Cleans up.
@@ -297,5 +418,8 @@ class FileStreamApi(object):
         Arguments:
             exitcode: The exitcode of the watched process.
         """
-        self._queue.put(self.Finish(exitcode))
+        with self._lock:
+            self._finished = self.Finish(exitcode)
+            self._changed.notify()
+            self._not_full.notify_all()
         self._thread.join()
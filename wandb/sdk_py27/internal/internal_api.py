@@ -12,6 +12,7 @@ import click
 import logging
 import requests
 import sys
+import time
 
 if os.name == "posix" and sys.version_info[0] < 3:
     import subprocess32 as subprocess  # type: ignore
@@ -35,6 +36,35 @@ from .progress import Progress
 
 logger = logging.getLogger(__name__)
 
+# status codes from cloud storage which are worth retrying
+TRANSIENT_STATUS_CODES = (308, 408, 409, 429, 500, 502, 503, 504)
+
+
+def _is_transient(e):
+    status_code = e.response.status_code if e.response is not None else 0
+    return status_code in TRANSIENT_STATUS_CODES or isinstance(
+        e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+    )
+
+
+def _is_resumable(headers):
+    """Whether the upload url was signed to start a resumable upload."""
+    for key, val in six.iteritems(headers):
+        if key.lower() == "x-goog-resumable" and val.strip().lower() == "start":
+            return True
+    return False
+
+
+def _committed_bytes(response, total):
+    """Bytes stored according to a response of a resumable upload session."""
+    if response.status_code in (200, 201):
+        return total
+    # 308 with an optional "Range: bytes=0-<last byte>" header
+    committed = response.headers.get("Range")
+    if not committed:
+        return 0
+    return int(committed.rsplit("-", 1)[1]) + 1
+
 
 class Api(object):
     """W&B Internal Api wrapper
@@ -52,6 +82,26 @@ class Api(object):
     """
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
+    # connections kept to cloud storage, one per concurrent upload
+    STORAGE_POOL_SIZE = 64
+    # chunks of resumable uploads, a multiple of 256KiB
+    UPLOAD_CHUNK_BYTES = 16 * 1024 * 1024
+    UPLOAD_CHUNK_RETRIES = 5
+    UPLOAD_CHUNK_RETRY_SECONDS = 1
+    # fields of the runs read by sweep controllers
+    SWEEP_RUN_FIELDS = """
+        name
+        state
+        config
+        exitcode
+        heartbeatAt
+        updatedAt
+        shouldStop
+        failed
+        stopped
+        running
+        summaryMetrics
+    """
 
     def __init__(
         self,
@@ -103,12 +153,29 @@ class Api(object):
         )
         self._current_run_id = None
         self._file_stream_api = None
+        self._storage_session_obj = None
+        # resumable upload sessions by (url, path, size)
+        self._resumable_uploads = {}
         # This Retry class is initialized once for each Api instance, so this
         # defaults to retrying 1 million times per process or 7 days
         self.upload_file_retry = normalize_exceptions(
             retry.retriable(retry_timedelta=retry_timedelta)(self.upload_file)
         )
 
+    @property
+    def _storage_session(self):
+        """Pooled session shared by the requests to cloud storage."""
+        if self._storage_session_obj is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.STORAGE_POOL_SIZE,
+                pool_maxsize=self.STORAGE_POOL_SIZE,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._storage_session_obj = session
+        return self._storage_session_obj
+
     def reauth(self):
         """Ensures the current api key is set in the transport"""
         self.client.transport.auth = ("api", self.api_key or "")
@@ -477,7 +544,7 @@ class Api(object):
         ]
 
     @normalize_exceptions
-    def sweep(self, sweep, specs, project=None, entity=None):
+    def sweep(self, sweep, specs, project=None, entity=None, include_runs=True):
         """Retrieve sweep.
 
         Arguments:
@@ -485,13 +552,30 @@ class Api(object):
             specs (str): history specs
             project (str, optional): The project to scope this sweep to.
             entity (str, optional): The entity to scope this sweep to.
+            include_runs (bool, optional): Whether to fetch the runs of the sweep.
 
         Returns:
                 [{"id","name","repo","dockerImage","description"}]
         """
+        runs = ""
+        specs_var = ""
+        if include_runs:
+            runs = """
+                    runs {
+                        edges {
+                            node {
+                                %s
+                                sampledHistory(specs: $specs)
+                            }
+                        }
+                    }
+            """ % (
+                self.SWEEP_RUN_FIELDS
+            )
+            specs_var = ", $specs: [JSONString!]!"
         query = gql(
             """
-        query Sweep($entity: String, $project: String, $sweep: String!, $specs: [JSONString!]!) {
+        query Sweep($entity: String, $project: String, $sweep: String!%s) {
             project(name: $project, entityName: $entity) {
                 sweep(sweepName: $sweep) {
                     id
@@ -507,46 +591,104 @@ class Api(object):
                     bestLoss
                     controller
                     scheduler
-                    runs {
-                        edges {
-                            node {
-                                name
-                                state
-                                config
-                                exitcode
-                                heartbeatAt
-                                shouldStop
-                                failed
-                                stopped
-                                running
-                                summaryMetrics
-                                sampledHistory(specs: $specs)
-                            }
-                        }
-                    }
+                    %s
                 }
             }
         }
         """
+            % (specs_var, runs)
         )
         entity = entity or self.settings("entity")
         project = project or self.settings("project")
-        response = self.gql(
-            query,
-            variable_values={
-                "entity": entity,
-                "project": project,
-                "sweep": sweep,
-                "specs": specs,
-            },
-        )
+        variable_values = {"entity": entity, "project": project, "sweep": sweep}
+        if include_runs:
+            variable_values["specs"] = specs
+        response = self.gql(query, variable_values=variable_values)
         if response["project"] is None or response["project"]["sweep"] is None:
             raise ValueError("Sweep {}/{}/{} not found".format(entity, project, sweep))
         data = response["project"]["sweep"]
-        if data:
+        if data and include_runs:
             data["runs"] = self._flatten_edges(data["runs"])
         return data
 
+    @normalize_exceptions
+    def sweep_runs(
+        self,
+        sweep,
+        specs=None,
+        updated_since=None,
+        names=None,
+        project=None,
+        entity=None,
+        per_page=500,
+        fields=None,
+    ):
+        """Retrieve some of the runs of a sweep.
+
+        Arguments:
+            sweep (str): The sweep to get runs for
+            specs (str, optional): history specs, history is not fetched if None
+            updated_since (str, optional): Only runs updated at or after this time
+            names (list, optional): Only runs with these names
+            project (str, optional): The project to scope this sweep to.
+            entity (str, optional): The entity to scope this sweep to.
+            fields (str, optional): Run fields to fetch, defaults to SWEEP_RUN_FIELDS
+
+        Returns:
+                [{"name","state","config","updatedAt","summaryMetrics",...}]
+        """
+        history = ""
+        specs_var = ""
+        if specs is not None:
+            history = "sampledHistory(specs: $specs)"
+            specs_var = ", $specs: [JSONString!]!"
+        query = gql(
+            """
+        query SweepRuns($entity: String, $project: String, $filters: JSONString, $cursor: String, $perPage: Int%s) {
+            project(name: $project, entityName: $entity) {
+                runs(filters: $filters, after: $cursor, first: $perPage, order: "+updatedAt") {
+                    edges {
+                        node {
+                            %s
+                            %s
+                        }
+                    }
+                    pageInfo {
+                        endCursor
+                        hasNextPage
+                    }
+                }
+            }
+        }
+        """
+            % (specs_var, fields or self.SWEEP_RUN_FIELDS, history)
+        )
+        filters = [{"sweep": sweep}]
+        if updated_since:
+            filters.append({"updatedAt": {"$gte": updated_since}})
+        if names is not None:
+            filters.append({"name": {"$in": list(names)}})
+        variable_values = {
+            "entity": entity or self.settings("entity"),
+            "project": project or self.settings("project"),
+            "filters": json.dumps({"$and": filters}),
+            "perPage": per_page,
+            "cursor": None,
+        }
+        if specs is not None:
+            variable_values["specs"] = specs
+        runs = []
+        while True:
+            response = self.gql(query, variable_values=variable_values)
+            if response["project"] is None:
+                break
+            page = response["project"]["runs"]
+            runs.extend(self._flatten_edges(page))
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            variable_values["cursor"] = page["pageInfo"]["endCursor"]
+        return runs
+
     @normalize_exceptions
     def list_runs(self, project, entity=None):
         """Lists runs in W&B scoped by project.
@@ -1196,24 +1338,108 @@ class Api(object):
         progress = Progress(file, callback=callback)
         if progress.len == 0:
             raise CommError("%s is an empty file" % file.name)
+        resumable = _is_resumable(extra_headers)
         try:
-            response = requests.put(url, data=progress, headers=extra_headers)
-            response.raise_for_status()
+            if resumable:
+                response = self._upload_file_resumable(url, progress, extra_headers)
+            else:
+                response = self._storage_session.put(
+                    url, data=progress, headers=extra_headers
+                )
+                response.raise_for_status()
         except requests.exceptions.RequestException as e:
             logger.error("upload_file exception {} {}".format(url, e))
-            status_code = e.response.status_code if e.response != None else 0
-            # We need to rewind the file for the next retry (the file passed in is seeked to 0)
-            progress.rewind()
+            if not resumable:
+                # We need to rewind the file for the next retry (the file passed in is seeked to 0)
+                progress.rewind()
             # Retry errors from cloud storage or local network issues
-            if status_code in (308, 408, 409, 429, 500, 502, 503, 504) or isinstance(
-                e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
-            ):
+            if _is_transient(e):
                 util.sentry_reraise(retry.TransientException(exc=e))
             else:
                 util.sentry_reraise(e)
 
         return response
 
+    def _upload_file_resumable(self, url, progress, extra_headers):
+        """Upload a file in chunks through a resumable upload session.
+
+        The session is started with a POST to the signed url. Each chunk is
+        retried on its own, and the session outlives this call so that the
+        next retry of upload_file continues after the last committed chunk.
+        """
+        file = progress.file
+        total = progress.len
+        key = (url, os.path.abspath(file.name), total)
+        session_url = self._resumable_uploads.get(key)
+        committed = 0
+        if session_url is not None:
+            committed = self._resumable_committed(session_url, total)
+            if committed is None:
+                # the session expired, start over
+                session_url = None
+        if session_url is None:
+            response = self._storage_session.post(url, data=b"", headers=extra_headers)
+            response.raise_for_status()
+            session_url = response.headers["Location"]
+            self._resumable_uploads[key] = session_url
+            committed = 0
+        if committed:
+            logger.info("resuming upload of %s at byte %d", file.name, committed)
+            progress.callback(committed, committed)
+
+        response = None
+        failures = 0
+        while committed < total:
+            file.seek(committed)
+            data = file.read(self.UPLOAD_CHUNK_BYTES)
+            if not data:
+                raise CommError(
+                    "File {} size shrank from {} to {} while it was being uploaded.".format(
+                        file.name, total, committed
+                    )
+                )
+            content_range = "bytes %d-%d/%d" % (
+                committed,
+                committed + len(data) - 1,
+                total,
+            )
+            try:
+                response = self._storage_session.put(
+                    session_url, data=data, headers={"Content-Range": content_range}
+                )
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                failures += 1
+                if failures > self.UPLOAD_CHUNK_RETRIES or not _is_transient(e):
+                    raise
+                logger.warning(
+                    "retrying chunk %s of %s: %s", content_range, file.name, e
+                )
+                time.sleep(min(self.UPLOAD_CHUNK_RETRY_SECONDS * 2 ** failures, 60))
+                uploaded = self._resumable_committed(session_url, total)
+                if uploaded is None:
+                    del self._resumable_uploads[key]
+                    raise
+                progress.callback(uploaded - committed, uploaded)
+                committed = uploaded
+                continue
+            failures = 0
+            uploaded = _committed_bytes(response, total)
+            progress.callback(uploaded - committed, uploaded)
+            committed = uploaded
+        del self._resumable_uploads[key]
+        return response
+
+    def _resumable_committed(self, session_url, total):
+        """Returns the bytes committed to an upload session, None if it expired."""
+        response = self._storage_session.put(
+            session_url, data=b"", headers={"Content-Range": "bytes */%d" % total}
+        )
+        if response.status_code in (404, 410):
+            return None
+        response.raise_for_status()
+        return _committed_bytes(response, total)
+
     @normalize_exceptions
     def register_agent(self, host, sweep_id=None, project_name=None, entity=None):
         """Register a new agent
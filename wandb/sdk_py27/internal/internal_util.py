@@ -85,12 +85,17 @@ class RecordLoopThread(ExceptionThread):
     def _finish(self):
         raise NotImplementedError
 
+    def _debounce(self):
+        pass
+
     def _run(self):
         self._setup()
         while not self._stopped.is_set():
             try:
                 record = self._input_record_q.get(timeout=1)
             except queue.Empty:
+                self._debounce()
                 continue
             self._process(record)
+            self._debounce()
         self._finish()
@@ -13,6 +13,7 @@ import os
 import time
 
 from pkg_resources import parse_version
+import six
 import wandb
 from wandb import util
 from wandb.filesync.dir_watcher import DirWatcher
@@ -24,7 +25,7 @@ from . import internal_api
 from . import update
 from .file_pusher import FilePusher
 from ..interface import interface
-from ..lib import config_util, filenames, proto_util, telemetry
+from ..lib import config_util, filenames, filesystem, proto_util, telemetry
 from ..lib.git import GitRepo
 
 
@@ -79,6 +80,11 @@ class SendManager(object):
 
         # keep track of config from key/val updates
         self._consolidated_config = dict()
+        # keep track of serialized summary values from summary updates
+        self._consolidated_summary = dict()
+        # summary changes not yet written to wandb-summary.json
+        self._summary_pending = False
+        self._summary_write_time = 0.0
         self._telemetry_obj = telemetry.TelemetryRecord()
 
         # State updated by resuming
@@ -169,8 +175,21 @@ class SendManager(object):
                     )
                 except Exception as e:
                     logger.warning("Failed to check stop requested status: %s", e)
+        if self._fs:
+            self._file_stream_stats(status_resp.file_stream_stats)
         self._result_q.put(result)
 
+    def _file_stream_stats(self, stats_pb):
+        for k, v in six.iteritems(self._fs.stats()):
+            setattr(stats_pb, k, v)
+
+    def stream_pending(self):
+        """Whether streamed records are still waiting for the server."""
+        if not self._fs:
+            return False
+        stats = self._fs.stats()
+        return bool(stats["queued_chunks"] or stats["inflight_requests"])
+
     def send_request_login(self, record):
         # TODO: do something with api_key or anonymous?
         # TODO: return an error if we aren't logged in?
@@ -221,8 +240,8 @@ class SendManager(object):
             # NOTE: this is handled in handler.py:handle_request_defer()
             pass
         elif state == defer.FLUSH_SUM:
-            # NOTE: this is handled in handler.py:handle_request_defer()
-            pass
+            # NOTE: the final summary is sent by handler.py:handle_request_defer()
+            self._write_summary(force=True)
         elif state == defer.FLUSH_DIR:
             if self._dir_watcher:
                 self._dir_watcher.finish()
@@ -285,6 +304,9 @@ class SendManager(object):
             resp.file_counts.media_count = file_counts["media"]
             resp.file_counts.artifact_count = file_counts["artifact"]
             resp.file_counts.other_count = file_counts["other"]
+        if self._fs:
+            resp = result.response.poll_exit_response
+            self._file_stream_stats(resp.file_stream_stats)
 
         if self._exit_result and not alive:
             # pusher join should not block as it was reported as not alive
@@ -566,6 +588,9 @@ class SendManager(object):
             self._run.run_id,
             self._run.start_time.ToSeconds(),
             settings=self._api_settings,
+            max_inflight=self._settings._file_stream_inflight,
+            max_backlog_bytes=self._settings._file_stream_backlog_bytes,
+            gzip=self._settings._file_stream_gzip,
         )
         # Ensure the streaming polices have the proper offsets
         self._fs.set_file_policy("wandb-summary.json", file_stream.SummaryFilePolicy())
@@ -605,17 +630,58 @@ class SendManager(object):
         history_dict = proto_util.dict_from_proto_list(history.item)
         self._save_history(history_dict)
 
+    def send_history_batch(self, data):
+        for history in data.history_batch.history:
+            history_dict = proto_util.dict_from_proto_list(history.item)
+            self._save_history(history_dict)
+
+    def _update_summary(self, summary):
+        # the handler only emits top-level keys, nested updates are sent as
+        # the whole top-level value
+        for item in summary.update:
+            self._consolidated_summary[item.key] = item.value_json
+        for item in summary.remove:
+            self._consolidated_summary.pop(item.key, None)
+
+    def _summary_json(self):
+        # summary values are already serialized, join them instead of
+        # encoding the whole summary again
+        return "{%s}" % ", ".join(
+            "%s: %s" % (json.dumps(k), v)
+            for k, v in six.iteritems(self._consolidated_summary)
+        )
+
     def send_summary(self, data):
-        summary_dict = proto_util.dict_from_proto_list(data.summary.update)
-        json_summary = json.dumps(summary_dict)
+        # summary records only carry the keys that changed
+        self._update_summary(data.summary)
+        self._summary_pending = True
+        self._write_summary()
+
+    def _write_summary(self, force=False):
+        """Write the consolidated summary, at most once per summary_write_seconds.
+
+        Arguments:
+            force: write pending changes even if the interval hasn't elapsed.
+        """
+        if not self._summary_pending:
+            return
+        now = time.time()
+        interval = self._settings.summary_write_seconds or 0
+        if not force and now < self._summary_write_time + interval:
+            return
+        self._summary_pending = False
+        self._summary_write_time = now
+
+        json_summary = self._summary_json()
         if self._fs:
             self._fs.push(filenames.SUMMARY_FNAME, json_summary)
-        # TODO(jhr): we should only write this at the end of the script
         summary_path = os.path.join(self._settings.files_dir, filenames.SUMMARY_FNAME)
-        with open(summary_path, "w") as f:
-            f.write(json_summary)
+        filesystem.write_atomic(summary_path, json_summary)
         self._save_file(filenames.SUMMARY_FNAME)
 
+    def debounce(self):
+        self._write_summary()
+
     def send_stats(self, data):
         stats = data.stats
         if stats.stats_type != wandb_internal_pb2.StatsRecord.StatsType.SYSTEM:
@@ -764,6 +830,7 @@ class SendManager(object):
 
     def finish(self):
         logger.info("shutting down sender")
+        self._write_summary(force=True)
         # if self._tb_watcher:
         #     self._tb_watcher.finish()
         if self._dir_watcher:
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 
 import json
+import logging
 import platform
 import subprocess
 import threading
@@ -17,8 +18,9 @@ from ..lib import telemetry
 
 
 if wandb.TYPE_CHECKING:
-    from typing import Dict, List, Optional, Union
+    from typing import Any, Dict, List, Optional, Set, Union
     from ..interface.interface import BackendSender
+    from .settings_static import SettingsStatic
 
     GPUHandle = object
     SamplerDict = Dict[str, List[float]]
@@ -29,23 +31,41 @@ if wandb.TYPE_CHECKING:
 # Eventually we can have the apple_gpu_stats binary query for this.
 M1_MAX_POWER_WATTS = 16.5
 
+GPU_METRICS = ("gpu", "memory", "memoryAllocated", "temp", "powerWatts", "powerPercent")
+AGGREGATIONS = ("mean", "max", "last")
+
+logger = logging.getLogger(__name__)
+
+# cpu time of the calling thread where available
+_thread_time = getattr(time, "thread_time", time.time)
 
-def gpu_in_use_by_this_process(gpu_handle):
-    if not psutil:
-        return False
 
+def _base_process(pid = None):
     # NOTE: this optimizes for the case where wandb was initialized from
     # iniside the user script (i.e. `wandb.init()`). If we ran using
     # `wandb run` on the command line, the shell will be detected as the
     # parent, possible resulting in sibling processes being incorrectly
     # indentified as part of this process -- still better than not
     # detecting in-use gpus at all.
-    base_process = psutil.Process().parent() or psutil.Process()
+    proc = psutil.Process(pid=pid)
+    return proc.parent() or proc
 
+
+def _our_pids():
+    base_process = _base_process()
     our_processes = base_process.children(recursive=True)
     our_processes.append(base_process)
+    return set([process.pid for process in our_processes])
 
-    our_pids = set([process.pid for process in our_processes])
+
+def gpu_in_use_by_this_process(
+    gpu_handle, our_pids = None
+):
+    if not psutil:
+        return False
+
+    if our_pids is None:
+        our_pids = _our_pids()
 
     compute_pids = set(
         [
@@ -74,28 +94,60 @@ class SystemStats(object):
     # _thread: Optional[threading.Thread]
     # gpu_count: int
 
-    def __init__(self, pid, interface):
+    def __init__(
+        self,
+        pid,
+        interface,
+        settings = None,
+    ):
+        self._settings = settings
+        self._gpu_handles = []
         try:
             pynvml.nvmlInit()
             self.gpu_count = pynvml.nvmlDeviceGetCount()
+            for i in range(self.gpu_count):
+                self._gpu_handles.append(pynvml.nvmlDeviceGetHandleByIndex(i))
         except pynvml.NVMLError:
             self.gpu_count = 0
+            self._gpu_handles = []
+        # metric keys are built once instead of formatted on every sample
+        self._gpu_keys = [
+            (
+                dict((m, "gpu.{}.{}".format(i, m)) for m in GPU_METRICS),
+                dict((m, "gpu.process.{}.{}".format(i, m)) for m in GPU_METRICS),
+            )
+            for i in range(len(self._gpu_handles))
+        ]
         # self.run = run
         self._pid = pid
+        self._proc = None
+        self._children = {}
         self._interface = interface
         self.sampler = {}
         self.samples = 0
         self._shutdown = False
+        self._shutdown_event = threading.Event()
         self._telem = telemetry.TelemetryRecord()
+        self._cpu_keys = []
         if psutil:
             net = psutil.net_io_counters()
             self.network_init = {"sent": net.bytes_sent, "recv": net.bytes_recv}
+            if self.per_cpu:
+                self._cpu_keys = [
+                    "cpu.{}.cpu_percent".format(i)
+                    for i in range(psutil.cpu_count() or 0)
+                ]
         else:
             wandb.termlog(
                 "psutil not installed, only GPU stats will be reported.  Install with pip install psutil"
             )
         self._thread = None
         self._tpu_profiler = None
+        # cost of sampling, measured in cpu seconds of the sampling thread
+        self._cost_seconds = 0.0
+        self._cost_samples = 0
+        self._cost_start = time.time()
+        self._over_budget = False
 
         if tpu.is_tpu_available():
             try:
@@ -106,6 +158,7 @@ class SystemStats(object):
     def start(self):
         if self._thread is None:
             self._shutdown = False
+            self._shutdown_event.clear()
             self._thread = threading.Thread(target=self._thread_body)
             self._thread.daemon = True
         if not self._thread.is_alive():
@@ -113,44 +166,95 @@ class SystemStats(object):
         if self._tpu_profiler:
             self._tpu_profiler.start()
 
+    def _setting(self, name, default):
+        value = self._settings and getattr(self._settings, name, None)
+        return default if value is None else value
+
     @property
     def proc(self):
-        return psutil.Process(pid=self._pid)
+        if self._proc is None:
+            self._proc = psutil.Process(pid=self._pid)
+        return self._proc
 
     @property
     def sample_rate_seconds(self):
-        """Sample system stats every this many seconds, defaults to 2, min is 0.5"""
-        return 1
-        # return max(0.5, self._api.dynamic_settings["system_sample_seconds"])
+        """Sample system stats every this many seconds, defaults to 1, min is 0.5"""
+        return max(0.5, float(self._setting("system_sample_seconds", 1)))
 
     @property
     def samples_to_average(self):
-        """The number of samples to average before pushing, defaults to 15 valid range (2:30)"""
-        return 4
-        # return min(30, max(2, self._api.dynamic_settings["system_samples"]))
+        """The number of samples to average before pushing, defaults to 4 valid range (2:30)"""
+        return min(30, max(2, int(self._setting("system_samples", 4))))
+
+    @property
+    def aggregation(self):
+        """How samples are combined before pushing: mean, max or last"""
+        aggregation = str(self._setting("_stats_aggregation", "mean"))
+        return aggregation if aggregation in AGGREGATIONS else "mean"
+
+    @property
+    def per_cpu(self):
+        return bool(self._setting("_stats_per_cpu", False))
+
+    @property
+    def include_children(self):
+        return bool(self._setting("_stats_children", False))
+
+    @property
+    def cpu_budget(self):
+        """Fraction of one cpu the sampling thread may use, defaults to 1%"""
+        return float(self._setting("_stats_cpu_budget", 0.01))
+
+    def _sample_interval(self):
+        # sample less often when sampling is more expensive than the budget
+        interval = self.sample_rate_seconds
+        if self._cost_samples and self.cpu_budget > 0:
+            cost = self._cost_seconds / self._cost_samples
+            interval = max(interval, cost / self.cpu_budget)
+            if interval > self.sample_rate_seconds and not self._over_budget:
+                self._over_budget = True
+                logger.info(
+                    "system stats sampling takes %.3fs, sampling every %.1fs",
+                    cost,
+                    interval,
+                )
+        return interval
+
+    def cost(self):
+        """CPU time used by the sampling thread."""
+        elapsed = max(time.time() - self._cost_start, 1e-6)
+        return {
+            "samples": self._cost_samples,
+            "cpu_seconds": self._cost_seconds,
+            "cpu_fraction": self._cost_seconds / elapsed,
+        }
+
+    def _sample(self):
+        start = _thread_time()
+        stats = self.stats()
+        for stat, value in stats.items():
+            if isinstance(value, (int, float)):
+                self.sampler.setdefault(stat, []).append(value)
+        self.samples += 1
+        self._cost_seconds += _thread_time() - start
+        self._cost_samples += 1
+        return stats
 
     def _thread_body(self):
         while True:
-            stats = self.stats()
-            for stat, value in stats.items():
-                if isinstance(value, (int, float)):
-                    self.sampler[stat] = self.sampler.get(stat, [])
-                    self.sampler[stat].append(value)
-            self.samples += 1
+            stats = self._sample()
             if self._shutdown or self.samples >= self.samples_to_average:
-                self.flush()
+                self.flush(stats)
                 if self._shutdown:
                     break
-            seconds = 0.0
-            while seconds < self.sample_rate_seconds:
-                time.sleep(0.1)
-                seconds += 0.1
-                if self._shutdown:
-                    self.flush()
-                    return
+            if self._shutdown_event.wait(self._sample_interval()):
+                self.flush()
+                break
+        logger.info("system stats sampling cost: %s", self.cost())
 
     def shutdown(self):
         self._shutdown = True
+        self._shutdown_event.set()
         try:
             if self._thread is not None:
                 self._thread.join()
@@ -159,71 +263,95 @@ class SystemStats(object):
         if self._tpu_profiler:
             self._tpu_profiler.stop()
 
-    def flush(self):
-        stats = self.stats()
+    def flush(self, stats = None):
+        if stats is None:
+            stats = self.stats()
+        aggregation = self.aggregation
         for stat, value in stats.items():
-            # TODO: a bit hacky, we assume all numbers should be averaged.  If you want
-            # max for a stat, you must put it in a sub key, like ["network"]["sent"]
+            # TODO: a bit hacky, we assume all numbers should be aggregated.  If you want
+            # a stat as is, you must put it in a sub key, like ["network"]["sent"]
             if isinstance(value, (float, int)):
-                # samples = list(self.sampler.get(stat, [stats[stat]]))
-                samples = list(self.sampler.get(stat, [value]))
-                stats[stat] = round(sum(samples) / len(samples), 2)
+                samples = self.sampler.get(stat, [value])
+                if aggregation == "max":
+                    stats[stat] = max(samples)
+                elif aggregation == "last":
+                    stats[stat] = samples[-1]
+                else:
+                    stats[stat] = round(sum(samples) / len(samples), 2)
         # self.run.events.track("system", stats, _wandb=True)
         if self._interface:
             self._interface.publish_stats(stats)
         self.samples = 0
         self.sampler = {}
 
-    def stats(self):
-        stats = {}
-        for i in range(0, self.gpu_count):
-            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+    def _gpu_stats(self, stats):
+        our_pids = None
+        for handle, (keys, process_keys) in zip(self._gpu_handles, self._gpu_keys):
             try:
                 utilz = pynvml.nvmlDeviceGetUtilizationRates(handle)
                 memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
                 temp = pynvml.nvmlDeviceGetTemperature(
                     handle, pynvml.NVML_TEMPERATURE_GPU
                 )
-                in_use_by_us = gpu_in_use_by_this_process(handle)
-
-                stats["gpu.{}.{}".format(i, "gpu")] = utilz.gpu
-                stats["gpu.{}.{}".format(i, "memory")] = utilz.memory
-                stats["gpu.{}.{}".format(i, "memoryAllocated")] = (
-                    memory.used / float(memory.total)
-                ) * 100
-                stats["gpu.{}.{}".format(i, "temp")] = temp
-
-                if in_use_by_us:
-                    stats["gpu.process.{}.{}".format(i, "gpu")] = utilz.gpu
-                    stats["gpu.process.{}.{}".format(i, "memory")] = utilz.memory
-                    stats["gpu.process.{}.{}".format(i, "memoryAllocated")] = (
-                        memory.used / float(memory.total)
-                    ) * 100
-                    stats["gpu.process.{}.{}".format(i, "temp")] = temp
-
-                    # Some GPUs don't provide information about power usage
+                if our_pids is None:
+                    our_pids = _our_pids() if psutil else set()
+                in_use_by_us = gpu_in_use_by_this_process(handle, our_pids)
+
+                gpu = {
+                    "gpu": utilz.gpu,
+                    "memory": utilz.memory,
+                    "memoryAllocated": (memory.used / float(memory.total)) * 100,
+                    "temp": temp,
+                }
+
+                # Some GPUs don't provide information about power usage
                 try:
                     power_watts = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
                     power_capacity_watts = (
                         pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
                     )
-                    power_usage = (power_watts / power_capacity_watts) * 100
-
-                    stats["gpu.{}.{}".format(i, "powerWatts")] = power_watts
-                    stats["gpu.{}.{}".format(i, "powerPercent")] = power_usage
-
-                    if in_use_by_us:
-                        stats["gpu.process.{}.{}".format(i, "powerWatts")] = power_watts
-                        stats[
-                            "gpu.process.{}.{}".format(i, "powerPercent")
-                        ] = power_usage
-
+                    gpu["powerWatts"] = power_watts
+                    gpu["powerPercent"] = (power_watts / power_capacity_watts) * 100
                 except pynvml.NVMLError:
                     pass
 
+                for metric, value in gpu.items():
+                    stats[keys[metric]] = value
+                    if in_use_by_us:
+                        stats[process_keys[metric]] = value
+
             except pynvml.NVMLError:
                 pass
 
+    def _children_stats(self, stats):
+        """Sums the stats of the other processes started by the user process."""
+        try:
+            children = _base_process(self._pid).children(recursive=True)
+        except psutil.NoSuchProcess:
+            return
+        # keep the Process objects around, cpu_percent compares to the last call
+        current = {}
+        for child in children:
+            if child.pid != self._pid:
+                current[child.pid] = self._children.get(child.pid, child)
+        self._children = current
+        rss = 0
+        cpu = 0.0
+        for child in current.values():
+            try:
+                with child.oneshot():
+                    rss += child.memory_info().rss
+                    cpu += child.cpu_percent()
+            except psutil.NoSuchProcess:
+                pass
+        stats["proc.children.count"] = len(current)
+        stats["proc.children.memory.rssMB"] = rss / 1048576.0
+        stats["proc.children.cpu.percent"] = cpu
+
+    def stats(self):
+        stats = {}
+        self._gpu_stats(stats)
+
         # On Apple M1 systems let's look for the gpu
         if (
             platform.system() == "Darwin"
@@ -265,12 +393,21 @@ class SystemStats(object):
             # TODO: maybe show other partitions, will likely need user to configure
             stats["disk"] = psutil.disk_usage("/").percent
             stats["proc.memory.availableMB"] = sysmem.available / 1048576.0
+            if self._cpu_keys:
+                for key, percent in zip(
+                    self._cpu_keys, psutil.cpu_percent(percpu=True)
+                ):
+                    stats[key] = percent
             try:
-                stats["proc.memory.rssMB"] = self.proc.memory_info().rss / 1048576.0
-                stats["proc.memory.percent"] = self.proc.memory_percent()
-                stats["proc.cpu.threads"] = self.proc.num_threads()
+                proc = self.proc
+                with proc.oneshot():
+                    stats["proc.memory.rssMB"] = proc.memory_info().rss / 1048576.0
+                    stats["proc.memory.percent"] = proc.memory_percent()
+                    stats["proc.cpu.threads"] = proc.num_threads()
             except psutil.NoSuchProcess:
                 pass
+            if self.include_children:
+                self._children_stats(stats)
         if self._tpu_profiler:
             stats["tpu"] = self._tpu_profiler.get_tpu_utilization()
         return stats
@@ -3,8 +3,10 @@
 tensor b watcher.
 """
 
+import heapq
 import logging
 import os
+import select
 import socket
 import threading
 import time
@@ -15,6 +17,7 @@ import wandb
 from wandb import util
 
 from . import run as internal_run
+from ..lib import inotify
 
 if wandb.TYPE_CHECKING:
     from typing import TYPE_CHECKING
@@ -22,7 +25,7 @@ if wandb.TYPE_CHECKING:
     if TYPE_CHECKING:
         from ..interface.interface import BackendSender
         from .settings_static import SettingsStatic
-        from typing import Dict, List, Optional
+        from typing import Any, Dict, List, Optional, Tuple
         from wandb.proto.wandb_internal_pb2 import RunRecord
         from six.moves.queue import PriorityQueue
         from tensorboard.compat.proto.event_pb2 import ProtoEvent
@@ -35,7 +38,15 @@ if wandb.TYPE_CHECKING:
 # Give some time for tensorboard data to be flushed
 SHUTDOWN_DELAY = 5
 ERROR_DELAY = 5
+# Logdirs without new events are polled less and less often
+MIN_POLL_SECONDS = 1
+MAX_POLL_SECONDS = 10
+# when inotify wakes us up on changes, polling only covers missed events
+MAX_POLL_SECONDS_INOTIFY = 60
 REMOTE_FILE_TOKEN = "://"
+# Events released from the reorder buffer at once, and rows per history record
+RELEASE_EVENTS = 1000
+BATCH_ROWS = 100
 logger = logging.getLogger(__name__)
 
 
@@ -108,6 +119,7 @@ class TBWatcher(object):
     ):
         self._logdirs = {}
         self._consumer = None
+        self._scheduler = None
         self._settings = settings
         self._interface = interface
         self._run_proto = run_proto
@@ -155,15 +167,31 @@ class TBWatcher(object):
             )
             self._consumer.start()
 
+        if not self._scheduler:
+            use_inotify = self._settings._tensorboard_inotify
+            self._scheduler = TBDirScheduler(
+                use_inotify=use_inotify is None or bool(use_inotify)
+            )
+            self._scheduler.start()
+
         tbdir_watcher = TBDirWatcher(self, logdir, save, namespace, self._watcher_queue)
         self._logdirs[logdir] = tbdir_watcher
-        tbdir_watcher.start()
+        self._scheduler.add(tbdir_watcher)
+
+    def stats(self):
+        """Events read and events/sec of each logdir."""
+        return self._scheduler.stats() if self._scheduler else {}
 
     def finish(self):
-        for tbdirwatcher in six.itervalues(self._logdirs):
-            tbdirwatcher.shutdown()
-        for tbdirwatcher in six.itervalues(self._logdirs):
-            tbdirwatcher.finish()
+        if self._scheduler:
+            self._scheduler.finish()
+            for logdir, logdir_stats in six.iteritems(self._scheduler.stats()):
+                logger.info(
+                    "tensorboard logdir %s: %d events, %.1f events/sec",
+                    logdir,
+                    logdir_stats["events"],
+                    logdir_stats["events_per_sec"],
+                )
         if self._consumer:
             self._consumer.finish()
 
@@ -192,17 +220,16 @@ class TBDirWatcher(object):
         self._generator = self.directory_watcher.DirectoryWatcher(
             logdir, self._loader(save, namespace), self._is_our_tfevents_file
         )
-        self._thread = threading.Thread(target=self._thread_body)
         self._first_event_timestamp = None
-        self._shutdown = threading.Event()
         self._queue = queue
         self._file_version = None
         self._namespace = namespace
         self._logdir = logdir
         self._hostname = socket.gethostname()
 
-    def start(self):
-        self._thread.start()
+    @property
+    def logdir(self):
+        return self._logdir
 
     def _is_our_tfevents_file(self, path):
         """Checks if a path has been modified since launch and contains tfevents"""
@@ -246,29 +273,22 @@ class TBDirWatcher(object):
 
         return EventFileLoader
 
-    def _thread_body(self):
-        """Check for new events every second"""
-        shutdown_time = None
-        while True:
-            try:
-                for event in self._generator.Load():
-                    self.process_event(event)
-            except (
-                self.directory_watcher.DirectoryDeletedError,
-                StopIteration,
-                RuntimeError,
-            ) as e:
-                # When listing s3 the directory may not yet exist, or could be empty
-                logger.debug("Encountered tensorboard directory watcher error: %s", e)
-                if not self._shutdown.is_set():
-                    time.sleep(ERROR_DELAY)
-            if self._shutdown.is_set():
-                now = time.time()
-                if not shutdown_time:
-                    shutdown_time = now + SHUTDOWN_DELAY
-                elif now > shutdown_time:
-                    break
-            time.sleep(1)
+    def poll(self):
+        """Load new events, returns how many were read or None on errors."""
+        count = 0
+        try:
+            for event in self._generator.Load():
+                self.process_event(event)
+                count += 1
+        except (
+            self.directory_watcher.DirectoryDeletedError,
+            StopIteration,
+            RuntimeError,
+        ) as e:
+            # When listing s3 the directory may not yet exist, or could be empty
+            logger.debug("Encountered tensorboard directory watcher error: %s", e)
+            return None
+        return count
 
     def process_event(self, event):
         # print("\nEVENT:::", self._logdir, self._namespace, event, "\n")
@@ -281,12 +301,173 @@ class TBDirWatcher(object):
         if event.HasField("summary"):
             self._queue.put(Event(event, self._namespace))
 
-    def shutdown(self):
-        self._shutdown.set()
+
+class TBDirScheduler(object):
+    """Polls the TBDirWatchers of a run from a single thread.
+
+    A logdir is polled every MIN_POLL_SECONDS while it has new events, and
+    twice less often after each idle poll, up to MAX_POLL_SECONDS.  With
+    inotify, a change in a logdir wakes the thread to poll it right away.
+    """
+
+    # _watchers: "Dict[Any, Dict[str, Any]]"
+
+    def __init__(self, use_inotify = True):
+        self._watchers = {}
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._woken = False
+        self._shutdown_time = None
+        self._thread = threading.Thread(target=self._thread_body)
+        self._thread.name = "TBDirScheduler"
+        self._thread.daemon = True
+        self._inotify = None
+        self._wds = {}
+        if use_inotify and inotify.available():
+            try:
+                self._inotify = inotify.Inotify()
+                self._wake_r, self._wake_w = os.pipe()
+            except OSError as e:
+                logger.info("inotify not available: %s", e)
+                self._inotify = None
+        self._max_interval = (
+            MAX_POLL_SECONDS_INOTIFY if self._inotify else MAX_POLL_SECONDS
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def add(self, watcher):
+        now = time.time()
+        state = dict(
+            next_poll=now,
+            polled=0.0,
+            interval=MIN_POLL_SECONDS,
+            added=now,
+            events=0,
+            watched=False,
+        )
+        with self._lock:
+            self._watchers[watcher] = state
+            self._watch(watcher, state)
+        self._wake()
+
+    def _watch(self, watcher, state):
+        if not self._inotify or state["watched"]:
+            return
+        path = watcher.logdir
+        if REMOTE_FILE_TOKEN in path:
+            return
+        if not os.path.isdir(path):
+            path = os.path.dirname(path)
+        if not os.path.isdir(path):
+            # watched once it exists
+            return
+        try:
+            self._wds[self._inotify.add_watch(path)] = watcher
+        except OSError as e:
+            # e.g. the watch limit was reached, polling still works
+            logger.info("not watching %s with inotify: %s", path, e)
+        state["watched"] = True
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            states = [(w.logdir, dict(s)) for w, s in six.iteritems(self._watchers)]
+        stats = {}
+        for logdir, state in states:
+            elapsed = now - state["added"]
+            stats[logdir] = dict(
+                events=state["events"],
+                events_per_sec=state["events"] / elapsed if elapsed > 0 else 0.0,
+            )
+        return stats
 
     def finish(self):
-        self.shutdown()
+        with self._lock:
+            self._shutdown_time = time.time() + SHUTDOWN_DELAY
+            for state in six.itervalues(self._watchers):
+                state["next_poll"] = min(state["next_poll"], time.time())
+                state["interval"] = MIN_POLL_SECONDS
+        self._wake()
         self._thread.join()
+        if self._inotify:
+            self._inotify.close()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+
+    def _wake(self):
+        if self._inotify:
+            os.write(self._wake_w, b"x")
+        else:
+            with self._lock:
+                self._woken = True
+                self._cond.notify()
+
+    def _wait(self, timeout):
+        if not self._inotify:
+            with self._lock:
+                if not self._woken:
+                    self._cond.wait(timeout)
+                self._woken = False
+            return
+        fd = self._inotify.fileno()
+        ready, _, _ = select.select([fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            os.read(self._wake_r, 4096)
+        if fd in ready:
+            now = time.time()
+            with self._lock:
+                for wd in self._inotify.read():
+                    state = self._watchers.get(self._wds.get(wd))
+                    if state:
+                        # poll soon, but not more often than MIN_POLL_SECONDS
+                        state["next_poll"] = min(
+                            state["next_poll"],
+                            max(now, state["polled"] + MIN_POLL_SECONDS),
+                        )
+                        state["interval"] = MIN_POLL_SECONDS
+
+    def _thread_body(self):
+        while True:
+            now = time.time()
+            with self._lock:
+                shutdown_time = self._shutdown_time
+                done = shutdown_time is not None and now > shutdown_time
+                due = [
+                    w
+                    for w, state in six.iteritems(self._watchers)
+                    if done or state["next_poll"] <= now
+                ]
+            for watcher in due:
+                self._poll(watcher, shutdown_time is not None)
+            if done:
+                break
+            with self._lock:
+                next_poll = min(
+                    [state["next_poll"] for state in six.itervalues(self._watchers)]
+                    + [shutdown_time or now + self._max_interval]
+                )
+            self._wait(max(next_poll - time.time(), 0))
+
+    def _poll(self, watcher, shutdown):
+        count = watcher.poll()
+        with self._lock:
+            state = self._watchers[watcher]
+            if count is None:
+                interval = ERROR_DELAY
+            elif count:
+                state["events"] += count
+                interval = MIN_POLL_SECONDS
+            else:
+                interval = min(state["interval"] * 2, self._max_interval)
+            if shutdown:
+                # keep reading until the shutdown delay is over
+                interval = MIN_POLL_SECONDS
+            state["interval"] = interval
+            state["polled"] = time.time()
+            state["next_poll"] = state["polled"] + interval
+            self._watch(watcher, state)
 
 
 class Event(object):
@@ -305,9 +486,13 @@ class Event(object):
 
 class TBEventConsumer(object):
     """Consumes tfevents from a priority queue.  There should always
-    only be one of these per run_manager.  We wait for 10 seconds of queued
-    events to reduce the chance of multiple tfevent files triggering
-    out of order steps.
+    only be one of these per run_manager.
+
+    Events from several tfevent files can arrive out of order, so they are
+    held in a reorder buffer keyed on (wall_time, step).  An event is released
+    once it is older than the newest event seen by more than `delay` seconds,
+    or has waited `delay` seconds in the buffer.  Released events are rolled
+    up by step into history rows which are published in batches.
     """
 
     def __init__(
@@ -323,6 +508,10 @@ class TBEventConsumer(object):
         self._thread = threading.Thread(target=self._thread_body)
         self._shutdown = threading.Event()
         self._delay = delay
+        # heap of (wall_time, step, seq, event)
+        self._buffer = []
+        self._seq = 0
+        self._watermark = 0.0
 
         # This is a bit of a hack to get file saving to work as it does in the user
         # process. Since we don't have a real run object, we have to define the
@@ -345,30 +534,57 @@ class TBEventConsumer(object):
     def _thread_body(self):
         tb_history = TBHistory()
         while True:
+            shutdown = self._shutdown.is_set()
+            # wake up at least every second to notice shutdown
+            timeout = self._next_release(time.time())
             try:
-                event = self._queue.get(True, 1)
-                # Wait self._delay seconds from consumer start before logging events
-                if (
-                    time.time() < self._start_time + self._delay
-                    and not self._shutdown.is_set()
-                ):
-                    self._queue.put(event)
-                    time.sleep(0.1)
-                    continue
+                event = self._queue.get(True, 1 if timeout is None else min(timeout, 1))
             except queue.Empty:
                 event = None
-                if self._shutdown.is_set():
-                    break
-            if event:
+            while event:
+                self._buffer_event(event)
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    event = None
+            for event in self._release(time.time(), flush=shutdown):
                 self._handle_event(event, history=tb_history)
-                items = tb_history._get_and_reset()
-                for item in items:
-                    self._save_row(item,)
+            self._save_rows(tb_history._get_and_reset())
+            if shutdown and not self._buffer:
+                break
         # flush uncommitted data
         tb_history._flush()
-        items = tb_history._get_and_reset()
-        for item in items:
-            self._save_row(item)
+        self._save_rows(tb_history._get_and_reset())
+
+    def _buffer_event(self, event):
+        wall_time = event.event.wall_time
+        self._watermark = max(self._watermark, wall_time)
+        self._seq += 1
+        heapq.heappush(self._buffer, (wall_time, event.event.step, self._seq, event))
+
+    def _releasable(self, now):
+        wall_time, _, _, event = self._buffer[0]
+        return (
+            wall_time <= self._watermark - self._delay
+            or event.created_at + self._delay <= now
+        )
+
+    def _next_release(self, now):
+        """Seconds until the oldest buffered event is released."""
+        if not self._buffer:
+            return None
+        if self._releasable(now):
+            return 0
+        event = self._buffer[0][3]
+        return max(event.created_at + self._delay - now, 0)
+
+    def _release(self, now, flush = False):
+        released = []
+        while self._buffer and len(released) < RELEASE_EVENTS:
+            if not flush and not self._releasable(now):
+                break
+            released.append(heapq.heappop(self._buffer)[3])
+        return released
 
     def _handle_event(self, event, history = None):
         wandb.tensorboard.log(
@@ -378,8 +594,11 @@ class TBEventConsumer(object):
             history=history,
         )
 
-    def _save_row(self, row):
-        self._tbwatcher._interface.publish_history(row, run=self._internal_run)
+    def _save_rows(self, rows):
+        for i in range(0, len(rows), BATCH_ROWS):
+            self._tbwatcher._interface.publish_history_batch(
+                rows[i : i + BATCH_ROWS], run=self._internal_run
+            )
 
 
 class TBHistory(object):
@@ -4,13 +4,19 @@
 
 from __future__ import print_function
 
+import glob
 import logging
+import os
+import time
 
 from . import datastore
 
 
 logger = logging.getLogger(__name__)
 
+# marks a log uploaded by wandb sync, see wandb.sync.sync.SYNCED_SUFFIX
+SYNCED_SUFFIX = ".synced"
+
 
 class WriteManager(object):
     def __init__(
@@ -20,10 +26,53 @@ class WriteManager(object):
         self._record_q = record_q
         self._result_q = result_q
         self._ds = None
+        self._fsync = settings.sync_file_fsync
+        self._fsync_seconds = settings.sync_file_fsync_seconds or 0
+        self._sync_time = time.time()
 
     def open(self):
         self._ds = datastore.DataStore()
-        self._ds.open_for_write(self._settings.sync_file)
+        fname = self._settings.sync_file
+        previous = self._previous_sync_file() if self._settings.resume else None
+        if previous:
+            # continue the log of the previous attempt so one file holds the
+            # whole history of the run, and syncing uploads it once
+            logger.info("resume: moving %s to %s", previous, fname)
+            os.rename(previous, fname)
+            if os.path.exists(previous + datastore.INDEX_SUFFIX):
+                os.rename(
+                    previous + datastore.INDEX_SUFFIX, fname + datastore.INDEX_SUFFIX
+                )
+            self._ds.open_for_append(fname)
+            return
+        self._ds.open_for_write(fname)
+
+    def _previous_sync_file(self):
+        """Return the log of the newest earlier attempt of this offline run,
+        unless it was already uploaded."""
+        fname = self._settings.sync_file
+        if (
+            not self._settings._offline
+            or self._settings.resume == "never"
+            or not self._settings.run_id
+        ):
+            # online runs stream their history, there is nothing to carry over
+            return None
+        sync_dir = os.path.dirname(fname)
+        pattern = os.path.join(
+            os.path.dirname(sync_dir),
+            "*-{}".format(self._settings.run_id),
+            os.path.basename(fname),
+        )
+        candidates = [f for f in glob.glob(pattern) if f != fname]
+        if not candidates:
+            return None
+        previous = max(candidates, key=os.path.getmtime)
+        online = not os.path.basename(os.path.dirname(previous)).startswith("offline-")
+        if online or os.path.exists(previous + SYNCED_SUFFIX):
+            # its history, and that of the attempts before it, was uploaded
+            return None
+        return previous
 
     def write(self, record):
         if not self._ds:
@@ -32,8 +81,34 @@ class WriteManager(object):
         record_type = record.WhichOneof("record_type")
         assert record_type
 
+        if record.control.local:
+            # only defer requests are sent to the writer, they are not logged
+            if self._fsync == "defer":
+                self._sync()
+            else:
+                self._ds.flush()
+            return
+
         self._ds.write(record)
 
+    def _sync(self):
+        self._ds.sync()
+        self._sync_time = time.time()
+
+    def debounce(self, idle):
+        if not self._ds:
+            return
+        # group commit: write out the partial block once the queue drains
+        if idle:
+            self._ds.flush()
+        if (
+            self._fsync == "periodic"
+            and time.time() - self._sync_time >= self._fsync_seconds
+        ):
+            self._sync()
+
     def finish(self):
         if self._ds:
+            if self._fsync in ("periodic", "defer"):
+                self._sync()
             self._ds.close()
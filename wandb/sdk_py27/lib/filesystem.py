@@ -13,3 +13,17 @@ def _safe_makedirs(dir_name):
         raise Exception("not dir")
     if not os.access(dir_name, os.W_OK):
         raise Exception("cant write: {}".format(dir_name))
+
+
+def write_atomic(path, data):
+    """Write a file so that readers never see partially written contents."""
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp_path, "w") as f:
+        f.write(data)
+    if hasattr(os, "replace"):
+        os.replace(tmp_path, path)
+        return
+    # python2 has no os.replace and rename doesnt overwrite on windows
+    if os.name == "nt" and os.path.exists(path):
+        os.remove(path)
+    os.rename(tmp_path, path)
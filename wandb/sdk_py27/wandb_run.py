@@ -74,6 +74,7 @@ if wandb.TYPE_CHECKING:  # type: ignore
     from wandb.proto.wandb_internal_pb2 import (
         RunRecord,
         FilePusherStats,
+        FileStreamStats,
         PollExitResponse,
     )
     from .wandb_setup import _WandbSetup
@@ -126,12 +127,16 @@ class ExitHooks(object):
 class RunStatusChecker(object):
     """Periodically polls the background process for relevant updates.
 
-    For now, we just use this to figure out if the user has requested a stop.
+    For now, we just use this to figure out if the user has requested a stop
+    and to track how far behind streaming to the server is.
     """
 
+    # file_stream_stats: Optional[FileStreamStats]
+
     def __init__(self, interface, polling_interval = 15):
         self._interface = interface
         self._polling_interval = polling_interval
+        self.file_stream_stats = None
 
         self._join_event = threading.Event()
         self._thread = threading.Thread(target=self.check_status)
@@ -142,6 +147,8 @@ class RunStatusChecker(object):
         join_requested = False
         while not join_requested:
             status_response = self._interface.communicate_status(check_stop_req=True)
+            if status_response:
+                self._check_file_stream(status_response.file_stream_stats)
             if status_response and status_response.run_should_stop:
                 # TODO(frz): This check is required
                 # until WB-3606 is resolved on server side.
@@ -150,6 +157,16 @@ class RunStatusChecker(object):
                     return
             join_requested = self._join_event.wait(self._polling_interval)
 
+    def _check_file_stream(self, stats):
+        blocked = self.file_stream_stats and self.file_stream_stats.blocked_seconds
+        if stats.blocked_seconds and not blocked:
+            wandb.termwarn(
+                "Data is logged faster than it can be streamed to the server, "
+                "%d bytes are waiting to be sent." % stats.queued_bytes
+            )
+        self.file_stream_stats = stats
+        logger.debug("file stream stats: %s", stats)
+
     def stop(self):
         self._join_event.set()
 
@@ -203,6 +220,7 @@ class Run(object):
     # _out_redir: Optional[redirect.RedirectBase]
     # _err_redir: Optional[redirect.RedirectBase]
     # _redirect_cb: Optional[Callable[[str, str], None]]
+    # _console_coalescer: Optional[redirect.ConsoleCoalescer]
     # _output_writer: Optional["WriteSerializingFile"]
 
     # _atexit_cleanup_called: bool
@@ -255,6 +273,7 @@ class Run(object):
         self._hooks = None
         self._teardown_hooks = []
         self._redirect_cb = None
+        self._console_coalescer = None
         self._out_redir = None
         self._err_redir = None
         self.stdout_redirector = None
@@ -1400,8 +1419,14 @@ class Run(object):
         atexit.register(lambda: self._atexit_cleanup())
 
         if self._use_redirect:
-            # setup fake callback
-            self._redirect_cb = self._console_callback
+            # writes are coalesced into chunks of lines before they are published
+            self._console_coalescer = redirect.ConsoleCoalescer(
+                self._console_callback,
+                interval=self._settings._console_flush_seconds,
+                max_size=self._settings._console_buffer_size,
+            )
+            self._console_coalescer.start()
+            self._redirect_cb = self._console_coalescer.write
 
         output_log_path = os.path.join(self.dir, filenames.OUTPUT_FNAME)
         self._output_writer = WriteSerializingFile(open(output_log_path, "wb"))
@@ -1409,6 +1434,9 @@ class Run(object):
 
     def _console_stop(self):
         self._restore()
+        if self._console_coalescer:
+            self._console_coalescer.stop()
+            self._console_coalescer = None
         if self._output_writer:
             self._output_writer.close()
             self._output_writer = None
@@ -1756,8 +1784,8 @@ class Run(object):
         self.save(spec_filename)
 
     # TODO(jhr): annotate this
-    def watch(self, models, criterion=None, log="gradients", log_freq=100, idx=None):  # type: ignore
-        wandb.watch(models, criterion, log, log_freq, idx)
+    def watch(self, models, criterion=None, log="gradients", log_freq=100, idx=None, histogram_sample_size=None):  # type: ignore
+        wandb.watch(models, criterion, log, log_freq, idx, histogram_sample_size)
 
     # TODO(jhr): annotate this
     def use_artifact(self, artifact_or_name, type=None, aliases=None):  # type: ignore
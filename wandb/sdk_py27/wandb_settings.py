@@ -228,6 +228,8 @@ class Settings(object):
     # TODO(jhr): Audit these attributes
     run_job_type = None
     base_url = None
+    # _console_flush_seconds: float
+    # _console_buffer_size: int
 
     # Private attributes
     # __start_time: Optional[float]
@@ -283,9 +285,12 @@ class Settings(object):
         # strict=None,  # set to "on" to enforce current best practices (also "warn")
         problem="fatal",
         # dynamic settings
-        system_sample_seconds=2,
-        system_samples=15,
+        system_sample_seconds=None,  # SystemStats samples every second
+        system_samples=None,  # and pushes the average of 4 samples
         heartbeat_seconds=30,
+        summary_write_seconds=2,
+        history_batch_rows=None,
+        history_batch_seconds=0.1,
         config_paths=None,
         sweep_param_path=None,
         _config_dict=None,
@@ -295,6 +300,8 @@ class Settings(object):
         settings_workspace_spec="{wandb_dir}/settings",
         sync_dir_spec="{wandb_dir}/{run_mode}-{timespec}-{run_id}",
         sync_file_spec="run-{run_id}.wandb",
+        sync_file_fsync=None,  # "periodic" or "defer" to fsync the sync file
+        sync_file_fsync_seconds=10,
         # sync_symlink_sync_spec="{wandb_dir}/sync",
         # sync_symlink_offline_spec="{wandb_dir}/offline",
         sync_symlink_latest_spec="{wandb_dir}/latest-run",
@@ -345,8 +352,20 @@ class Settings(object):
         summary_warnings=None,
         _internal_queue_timeout=2,
         _internal_check_process=8,
+        _transport=None,  # set to "shm" to use a shared memory ring buffer
+        _transport_buffer_size=16 * 1024 * 1024,
+        _file_stream_inflight=2,
+        _file_stream_backlog_bytes=64 * 1024 * 1024,
+        _file_stream_gzip=None,
+        _console_flush_seconds=0.5,
+        _console_buffer_size=4 * 1024 * 1024,
+        _tensorboard_inotify=None,  # set to False to only poll logdirs
         _disable_meta=None,
         _disable_stats=None,
+        _stats_aggregation=None,  # "mean", "max" or "last" of system_samples
+        _stats_per_cpu=None,  # set to True to report every cpu core
+        _stats_children=None,  # set to True to report child processes
+        _stats_cpu_budget=None,  # fraction of a cpu the sampler may use
         _jupyter_path=None,
         _jupyter_name=None,
         _jupyter_root=None,
@@ -537,6 +556,18 @@ class Settings(object):
             return
         return _error_choices(value, choices)
 
+    def _validate_sync_file_fsync(self, value):
+        choices = {"none", "periodic", "defer"}
+        if value in choices:
+            return
+        return _error_choices(value, choices)
+
+    def _validate__stats_aggregation(self, value):
+        choices = {"mean", "max", "last"}
+        if value in choices:
+            return
+        return _error_choices(value, choices)
+
     def _validate_problem(self, value):
         choices = {"fatal", "warn", "silent"}
         if value in choices:
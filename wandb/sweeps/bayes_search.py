@@ -22,14 +22,22 @@ sklearn_gaussian = get_module('sklearn.gaussian_process')
 scipy_stats = get_module('scipy.stats')
 
 
-def fit_normalized_gaussian_process(X, y, nu=1.5):
+def fit_normalized_gaussian_process(X, y, nu=1.5, kernel=None):
     """
         We fit a gaussian process but first subtract the mean and divide by stddev.
         To undo at prediction tim, call y_pred = gp.predict(X) * y_stddev + y_mean
+
+        If kernel is set (usually the kernel_ of an earlier fit) the optimizer
+        starts from its hyperparameters instead of restarting from scratch.
     """
-    gp = sklearn_gaussian.GaussianProcessRegressor(
-        kernel=sklearn_gaussian.kernels.Matern(nu=nu), n_restarts_optimizer=2, alpha=0.0000001, random_state=2
-    )
+    if kernel is None:
+        gp = sklearn_gaussian.GaussianProcessRegressor(
+            kernel=sklearn_gaussian.kernels.Matern(nu=nu), n_restarts_optimizer=2, alpha=0.0000001, random_state=2
+        )
+    else:
+        gp = sklearn_gaussian.GaussianProcessRegressor(
+            kernel=kernel, n_restarts_optimizer=0, alpha=0.0000001, random_state=2
+        )
     if len(y) == 1:
         y = np.array(y)
         y_mean = y[0]
@@ -42,27 +50,70 @@ def fit_normalized_gaussian_process(X, y, nu=1.5):
     return gp, y_mean, y_stddev
 
 
+def condition_gaussian_process(gp, X, y_norm):
+    """
+        Returns gp refit with the extra (X, y_norm) points, keeping the fitted
+        kernel hyperparameters.  This only factors the kernel matrix again so
+        it is much cheaper than fitting.  y_norm is in the normalized units of gp.
+    """
+    conditioned = sklearn_gaussian.GaussianProcessRegressor(
+        kernel=gp.kernel_, optimizer=None, alpha=gp.alpha
+    )
+    conditioned.fit(
+        np.append(gp.X_train_, X, axis=0), np.append(gp.y_train_, y_norm)
+    )
+    return conditioned
+
+
+class FitCache(object):
+    """
+        Remembers the last gaussian process fit by next_sample.
+
+        When next_sample is called again with the same observations the fit is
+        reused, otherwise the new fit starts from the kernel hyperparameters of
+        the last one.
+    """
+
+    def __init__(self, restart_every=10):
+        # every restart_every fits the optimizer starts from scratch again, so
+        # a poor local optimum is not kept forever
+        self.restart_every = restart_every
+        self.key = None
+        self.fit = None
+        self.kernel = None
+        self.fits = 0
+        self.hits = 0
+
+    @staticmethod
+    def make_key(*arrays_and_args):
+        key = []
+        for value in arrays_and_args:
+            if isinstance(value, np.ndarray):
+                key.append((value.shape, value.tobytes()))
+            else:
+                key.append(value)
+        return tuple(key)
+
+
 def sigmoid(x):
     return np.exp(-np.logaddexp(0, -x))
 
 
 def random_sample(X_bounds, num_test_samples):
     num_hyperparameters = len(X_bounds)
-    test_X = np.empty((num_test_samples, num_hyperparameters))
-    for ii in range(num_test_samples):
-        for jj in range(num_hyperparameters):
-            if type(X_bounds[jj][0]) == int:
-                assert (type(X_bounds[jj][1]) == int)
-                test_X[ii, jj] = np.random.randint(
-                    X_bounds[jj][0], X_bounds[jj][1])
-            else:
-                test_X[ii, jj] = np.random.uniform() * (
-                    X_bounds[jj][1] - X_bounds[jj][0]
-                ) + X_bounds[
-                    jj
-                ][
-                    0
-                ]
+    low = np.array([bounds[0] for bounds in X_bounds], dtype=float)
+    high = np.array([bounds[1] for bounds in X_bounds], dtype=float)
+    test_X = np.random.uniform(
+        size=(num_test_samples, num_hyperparameters)) * (high - low) + low
+    int_columns = []
+    for jj in range(num_hyperparameters):
+        if type(X_bounds[jj][0]) == int:
+            assert (type(X_bounds[jj][1]) == int)
+            int_columns.append(jj)
+    if int_columns:
+        # integers are drawn from [low, high) like np.random.randint
+        test_X[:, int_columns] = np.minimum(
+            np.floor(test_X[:, int_columns]), high[int_columns] - 1)
     return test_X
 
 
@@ -89,7 +140,7 @@ def train_runtime_model(sample_X, runtimes, X_bounds):
 
 
 def train_gaussian_process(
-    sample_X, sample_y, X_bounds, current_X=None, nu=1.5, max_samples=100
+    sample_X, sample_y, X_bounds, current_X=None, nu=1.5, max_samples=100, kernel=None
 ):
     """
     Trains a Gaussian Process function from sample_X, sample_y data
@@ -103,6 +154,8 @@ def train_gaussian_process(
             current_X - hyperparameters currently being explored
             nu - input to the Matern function, higher numbers make it smoother 0.5, 1.5, 2.5 are good values
              see http://scikit-learn.org/stable/modules/generated/sklearn.gaussian_process.kernels.Matern.html
+            max_samples - maximum samples to fit the gaussian process on
+            kernel - kernel with the hyperparameters to start optimizing from, usually from an earlier fit
 
         Returns:
             gp - the gaussian process function
@@ -149,17 +202,53 @@ def train_gaussian_process(
     else:
         X = sample_X
         y = sample_y
-    gp, y_mean, y_stddev = fit_normalized_gaussian_process(X, y, nu=nu)
+    gp, y_mean, y_stddev = fit_normalized_gaussian_process(X, y, nu=nu, kernel=kernel)
     if current_X is not None:
         # if we have some hyperparameters running, we pretend that they return
         # the prediction of the function we've fit
         X = np.append(X, current_X, axis=0)
         current_y_fantasy = (gp.predict(current_X) * y_stddev) + y_mean
         y = np.append(y, current_y_fantasy)
-        gp, y_mean, y_stddev = fit_normalized_gaussian_process(X, y, nu=nu)
+        gp, y_mean, y_stddev = fit_normalized_gaussian_process(X, y, nu=nu, kernel=kernel)
     return gp, y_mean, y_stddev
 
 
+def acquisition(gp, y_mean, y_stddev, test_X, min_unnorm_y, improvement=0.01,
+                opt_func="expected_improvement"):
+    """
+        Scores test_X with the acquisition function, higher is better.
+
+        Returns:
+            y_pred - normalized predictions for test_X
+            y_pred_std - normalized predicted std deviation for test_X
+            prob_of_improve - probability of improvement for test_X
+            score - acquisition function value for test_X
+    """
+    y_pred, y_pred_std = gp.predict(test_X, return_std=True)
+    # hack for dealing with predicted std of 0
+    epsilon = 0.00000001
+    if opt_func == "probability_of_improvement":
+        # might remove the norm_improvement at some point
+        # find best chance of an improvement by "at least norm improvement"
+        # so if norm_improvement is zero, we are looking for best chance of any
+        # improvment over the best result observerd so far.
+        #norm_improvement = improvement / y_stddev
+        min_norm_y = (min_unnorm_y - y_mean) / y_stddev - improvement
+        std_dev_distance = (y_pred - min_norm_y) / (y_pred_std + epsilon)
+        prob_of_improve = sigmoid(-std_dev_distance)
+        score = prob_of_improve
+    elif opt_func == "expected_improvement":
+        min_norm_y = (min_unnorm_y - y_mean) / y_stddev
+        Z = -(y_pred - min_norm_y) / (y_pred_std + epsilon)
+        prob_of_improve = scipy_stats.norm.cdf(Z)
+        score = -(y_pred - min_norm_y) * prob_of_improve + y_pred_std * scipy_stats.norm.pdf(
+            Z
+        )
+    else:
+        raise ValueError("Unknown opt_func {}".format(opt_func))
+    return y_pred, y_pred_std, prob_of_improve, score
+
+
 def filter_weird_values(sample_X, sample_y):
     is_row_finite = ~(np.isnan(sample_X).any(axis=1) | np.isnan(sample_y))
     sample_X = sample_X[is_row_finite, :]
@@ -167,6 +256,34 @@ def filter_weird_values(sample_X, sample_y):
     return sample_X, sample_y
 
 
+def fit_gaussian_process(
+    filtered_X, filtered_y, X_bounds, current_X=None, nu=1.5, max_samples=100, fit_cache=None
+):
+    """
+        Calls train_gaussian_process, reusing the fit in fit_cache when the
+        observations are the same as last time.
+    """
+    if fit_cache is None:
+        return train_gaussian_process(
+            filtered_X, filtered_y, X_bounds, current_X, nu, max_samples)
+    if current_X is not None:
+        current_X = np.array(current_X)
+    key = FitCache.make_key(filtered_X, filtered_y, current_X, nu, max_samples)
+    if key == fit_cache.key:
+        fit_cache.hits += 1
+        return fit_cache.fit
+    kernel = fit_cache.kernel
+    if fit_cache.fits % fit_cache.restart_every == 0:
+        kernel = None
+    fit = train_gaussian_process(
+        filtered_X, filtered_y, X_bounds, current_X, nu, max_samples, kernel)
+    fit_cache.key = key
+    fit_cache.fit = fit
+    fit_cache.kernel = fit[0].kernel_
+    fit_cache.fits += 1
+    return fit
+
+
 def next_sample(
     sample_X,
     sample_y,
@@ -180,6 +297,7 @@ def next_sample(
     num_points_to_try=1000,
     opt_func="expected_improvement",
     test_X=None,
+    fit_cache=None,
 ):
     """
         Calculates the best next sample to look at via bayesian optimization.
@@ -210,6 +328,7 @@ def next_sample(
                 to remove probability of improvement at some point.  (But I think prboability of improvement
                 is a little easier to calculate)
             test_X - X values to test when looking for the best values to try
+            fit_cache - FitCache to reuse the gaussian process fit between calls
 
         Returns:
             suggested_X - X vector to try running next
@@ -285,14 +404,17 @@ def next_sample(
         return X, 1.0, prediction, None, None, None, None, None, None
 
     # build the acquisition function
-    gp, y_mean, y_stddev, = train_gaussian_process(
-        filtered_X, filtered_y, X_bounds, current_X, nu, max_samples_for_gp
+    gp, y_mean, y_stddev, = fit_gaussian_process(
+        filtered_X, filtered_y, X_bounds, current_X, nu, max_samples_for_gp, fit_cache
     )
-    num_test_samples = 1000
     # Look for the minimum value of our fitted-target-function + (kappa * fitted-target-std_dev)
     if test_X is None:  # this is the usual case
-        test_X = random_sample(X_bounds, num_test_samples)
-    y_pred, y_pred_std = gp.predict(test_X, return_std=True)
+        test_X = random_sample(X_bounds, num_points_to_try)
+    # best value of y we've seen so far.  i.e. y*
+    min_unnorm_y = np.min(filtered_y)
+    y_pred, y_pred_std, prob_of_improve, score = acquisition(
+        gp, y_mean, y_stddev, test_X, min_unnorm_y, improvement, opt_func)
+    best_test_X_index = np.argmax(score)
     if failure_model is None:
         prob_of_failure = [0.0] * len(test_X)
     else:
@@ -305,29 +427,6 @@ def next_sample(
         expected_runtime = runtime_model.predict(
             test_X
         ) * runtime_model_stddev + runtime_model_mean
-    # best value of y we've seen so far.  i.e. y*
-    min_unnorm_y = np.min(filtered_y)
-    # hack for dealing with predicted std of 0
-    epsilon = 0.00000001
-    if opt_func == "probability_of_improvement":
-        # might remove the norm_improvement at some point
-        # find best chance of an improvement by "at least norm improvement"
-        # so if norm_improvement is zero, we are looking for best chance of any
-        # improvment over the best result observerd so far.
-        #norm_improvement = improvement / y_stddev
-        min_norm_y = (min_unnorm_y - y_mean) / y_stddev - improvement
-        distance = (y_pred - min_norm_y)
-        std_dev_distance = (y_pred - min_norm_y) / (y_pred_std + epsilon)
-        prob_of_improve = sigmoid(-std_dev_distance)
-        best_test_X_index = np.argmax(prob_of_improve)
-    elif opt_func == "expected_improvement":
-        min_norm_y = (min_unnorm_y - y_mean) / y_stddev
-        Z = -(y_pred - min_norm_y) / (y_pred_std + epsilon)
-        prob_of_improve = scipy_stats.norm.cdf(Z)
-        e_i = -(y_pred - min_norm_y) * scipy_stats.norm.cdf(Z) + y_pred_std * scipy_stats.norm.pdf(
-            Z
-        )
-        best_test_X_index = np.argmax(e_i)
     # TODO: support expected improvement per time by dividing e_i by runtime
     suggested_X = test_X[best_test_X_index]
     suggested_X_prob_of_improvement = prob_of_improve[best_test_X_index]
@@ -347,15 +446,90 @@ def next_sample(
     )
 
 
+def next_samples(
+    sample_X,
+    sample_y,
+    X_bounds,
+    count,
+    current_X=None,
+    nu=1.5,
+    max_samples_for_gp=100,
+    improvement=0.01,
+    num_points_to_try=1000,
+    opt_func="expected_improvement",
+    lie="min",
+    fit_cache=None,
+):
+    """
+        Calculates count samples to run in parallel from a single gaussian process fit.
+
+        Uses the constant liar strategy: after each suggestion we pretend it was
+        evaluated with the value lie and condition the gaussian process on it
+        (keeping the kernel hyperparameters) before picking the next one.
+
+        Arguments:
+            count - number of samples to suggest
+            lie - one of {"min", "mean", "max"} of sample_y to use as the value of
+                suggested samples.  "max" explores more
+            other arguments are the same as next_sample
+
+        Returns:
+            list of count (suggested_X, suggested_X_prob_of_improvement, suggested_X_predicted_y)
+    """
+    sample_X = np.array(sample_X)
+    sample_y = np.array(sample_y)
+    if len(sample_X.shape) != 2:
+        raise ValueError("Sample X must be a 2 dimensional array")
+    if sample_X.shape[0] != sample_y.shape[0]:
+        raise ValueError("Sample X and y must be same length")
+    lie_funcs = {"min": np.min, "mean": np.mean, "max": np.max}
+    if lie not in lie_funcs:
+        raise ValueError("lie must be one of {}".format(sorted(lie_funcs)))
+
+    filtered_X, filtered_y = filter_weird_values(sample_X, sample_y)
+    if filtered_X.shape[0] < 2:
+        # not enough points to fit, return random points like next_sample
+        prediction = filtered_y[0] if filtered_X.shape[0] else 0.0
+        return [(X, 1.0, prediction) for X in random_sample(X_bounds, count)]
+
+    gp, y_mean, y_stddev = fit_gaussian_process(
+        filtered_X, filtered_y, X_bounds, current_X, nu, max_samples_for_gp, fit_cache
+    )
+    test_X = random_sample(X_bounds, num_points_to_try)
+    min_unnorm_y = np.min(filtered_y)
+    lie_norm = (lie_funcs[lie](filtered_y) - y_mean) / y_stddev
+    samples = []
+    for ii in range(count):
+        if ii > 0:
+            gp = condition_gaussian_process(
+                gp, test_X[[best_test_X_index]], [lie_norm])
+        y_pred, y_pred_std, prob_of_improve, score = acquisition(
+            gp, y_mean, y_stddev, test_X, min_unnorm_y, improvement, opt_func)
+        best_test_X_index = np.argmax(score)
+        samples.append((
+            test_X[best_test_X_index],
+            prob_of_improve[best_test_X_index],
+            y_pred[best_test_X_index] * y_stddev + y_mean,
+        ))
+    return samples
+
+
 def target(x):
     return np.exp(-(x - 2) ** 2) + np.exp(-(x - 6) ** 2 / 10) + 1 / (x ** 2 + 1)
 
 
 class BayesianSearch(Search):
+    """
+        The gaussian process fit is kept between calls, so calling next_run or
+        next_runs on the same object again with the same finished and running
+        runs does not fit it again.
+    """
+
     def __init__(self, minimum_improvement=0.1):
         self.minimum_improvement = minimum_improvement
+        self._fit_cache = FitCache()
 
-    def next_run(self, sweep):
+    def _observations(self, sweep):
         if 'parameters' not in sweep['config']:
             raise ValueError('Bayesian search requires "parameters" section')
         if 'metric' not in sweep['config']:
@@ -365,7 +539,6 @@ class BayesianSearch(Search):
         params = HyperParameterSet.from_config(config)
 
         sample_X = []
-        sample_y = []
         current_X = []
         y = []
 
@@ -417,34 +590,30 @@ class BayesianSearch(Search):
         if len(current_X) == 0:
             current_X = None
         else:
-            np.array(current_X)
-        (try_params, success_prob, pred,
-            test_X, y_pred, y_pred_std, prob_of_improve,
-            prob_of_failure, expected_runtime) = next_sample(
-                np.array(sample_X),
-                np.array(y), X_bounds,
-                current_X=current_X, improvement=self.minimum_improvement)
+            current_X = np.array(current_X)
+        return params, np.array(sample_X), np.array(y), X_bounds, current_X
 
+    def _to_config(self, params, try_params):
         # convert the parameters from vector of [0,1] values
         # to the original ranges
-
         for param in params:
             if param.type == HyperParameter.CONSTANT:
                 continue
-
-            # try_value = try_params[params.param_names_to_index[param.name]]
-            # if param.type == HyperParameter.CATEGORICAL:
-            #     param.value = param.values[int(try_value)]
-            # elif param.type == HyperParameter.INT_UNIFORM:
-            #     param.value = int(try_value)
-            # elif param.type == HyperParameter.UNIFORM:
-            #     param.value = try_value
             try_value = try_params[params.param_names_to_index[param.name]]
             param.value = param.ppf(try_value)
+        return params.to_config()
 
-        metric_name = sweep['config']['metric']['name']
+    def next_run(self, sweep):
+        params, sample_X, y, X_bounds, current_X = self._observations(sweep)
+        (try_params, success_prob, pred,
+            test_X, y_pred, y_pred_std, prob_of_improve,
+            prob_of_failure, expected_runtime) = next_sample(
+                sample_X, y, X_bounds,
+                current_X=current_X, improvement=self.minimum_improvement,
+                fit_cache=self._fit_cache)
 
-        ret_dict = params.to_config()
+        ret_dict = self._to_config(params, try_params)
+        metric_name = sweep['config']['metric']['name']
         info = {}
         info['predictions'] = {metric_name: pred}
         info['success_probability'] = success_prob
@@ -456,3 +625,23 @@ class BayesianSearch(Search):
             info['acq_func']['score'] = prob_of_improve
 
         return ret_dict, info
+
+    def next_runs(self, sweep, count, lie="min"):
+        """Suggests count runs to schedule at once, see next_samples.
+
+        Returns:
+            list of count (params, info) tuples like next_run
+        """
+        params, sample_X, y, X_bounds, current_X = self._observations(sweep)
+        samples = next_samples(
+            sample_X, y, X_bounds, count,
+            current_X=current_X, improvement=self.minimum_improvement,
+            lie=lie, fit_cache=self._fit_cache)
+
+        metric_name = sweep['config']['metric']['name']
+        suggestions = []
+        for try_params, success_prob, pred in samples:
+            info = {'predictions': {metric_name: pred},
+                    'success_probability': success_prob}
+            suggestions.append((self._to_config(params, try_params), info))
+        return suggestions
@@ -2,15 +2,125 @@
 Grid Search
 """
 
-import itertools
-import random
+import zlib
 from wandb.sweeps.params import HyperParameter, HyperParameterSet
 from wandb.sweeps.base import Search
 
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(x):
+    # splitmix64 finalizer
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class _Permutation(object):
+    """A pseudo random permutation of range(n) computed one index at a time.
+
+    A Feistel network permutes the smallest power of 4 >= n, indexes outside
+    of range(n) are mapped again until they fall inside (cycle walking).
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, n, seed):
+        self.n = n
+        self.half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+        self.mask = (1 << self.half_bits) - 1
+        self.keys = [_mix(seed + r * 0x9E3779B97F4A7C15)
+                     for r in range(self.ROUNDS)]
+
+    def _feistel(self, x):
+        left, right = x >> self.half_bits, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (_mix(right ^ key) & self.mask)
+        return (left << self.half_bits) | right
+
+    def __getitem__(self, i):
+        x = self._feistel(i)
+        while x >= self.n:
+            x = self._feistel(x)
+        return x
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
 
 class GridSearch(Search):
-    def __init__(self, randomize_order=False):
+    """Schedules every combination of the parameter values once.
+
+    Combinations are enumerated lazily by index, in order or in a shuffled
+    order that is the same for every call with the same parameters.  The
+    parameter values of the runs seen so far are kept in a set, so when the
+    same GridSearch is used for successive calls only new runs, and runs
+    whose config was incomplete, are indexed.
+    """
+
+    def __init__(self, randomize_order=False, seed=None):
         self.randomize_order = randomize_order
+        self.seed = seed
+        self._grid_key = None
+
+    def _reset(self, grid_key, param_values):
+        self._grid_key = grid_key
+        self._sizes = [len(values) for values in param_values]
+        self._size = 1
+        for size in self._sizes:
+            self._size *= size
+        self._order = None
+        if self.randomize_order and self._size > 1:
+            seed = self.seed
+            if seed is None:
+                seed = zlib.crc32(grid_key.encode('utf-8'))
+            self._order = _Permutation(self._size, seed)
+        self._seen = set()
+        # run name -> hashable parameter values, None if the config was incomplete
+        self._run_values = {}
+        self._position = 0
+
+    def _value_set(self, param_values, position):
+        index = self._order[position] if self._order else position
+        value_set = []
+        # the last parameter changes fastest, like itertools.product
+        for values, size in zip(reversed(param_values), reversed(self._sizes)):
+            index, i = divmod(index, size)
+            value_set.append(values[i])
+        return tuple(reversed(value_set))
+
+    def _index_runs(self, runs, param_names):
+        names = set()
+        for run in runs:
+            names.add(run.name)
+            if self._run_values.get(run.name) is not None:
+                continue
+            try:
+                value_set = tuple(run.config[name]['value']
+                                  for name in param_names)
+            except (KeyError, TypeError):
+                # indexed again on the next call
+                self._run_values[run.name] = None
+                continue
+            value_set = _hashable(value_set)
+            self._run_values[run.name] = value_set
+            self._seen.add(value_set)
+        if len(names) < len(self._run_values):
+            # runs were removed, their combinations may be free again
+            self._run_values = dict((name, value_set) for name, value_set
+                                    in self._run_values.items() if name in names)
+            self._seen = set(value_set for value_set in self._run_values.values()
+                             if value_set is not None)
+            self._position = 0
 
     def next_run(self, sweep):
         if 'parameters' not in sweep['config']:
@@ -27,24 +137,25 @@ class GridSearch(Search):
         # we can only deal with discrete params in a grid search
         discrete_params = [p for p in params if p.type ==
                            HyperParameter.CATEGORICAL]
-
-        # build an iterator over all combinations of param values
         param_names = [p.name for p in discrete_params]
         param_values = [p.values for p in discrete_params]
-        param_value_set = list(itertools.product(*param_values))
 
-        if self.randomize_order:
-            random.shuffle(param_value_set)
+        grid_key = repr((param_names, param_values))
+        if grid_key != self._grid_key:
+            self._reset(grid_key, param_values)
+        self._index_runs(sweep['runs'], param_names)
 
-        new_value_set = next(
-            (value_set for value_set in param_value_set
-             # check if parameter set is contained in some run
-                if not self._runs_contains_param_values(sweep['runs'], dict(zip(param_names, value_set))
-                                                        )
-             ), None)
+        # combinations before the current position are all in some run
+        new_value_set = None
+        while self._position < self._size:
+            value_set = self._value_set(param_values, self._position)
+            if _hashable(value_set) not in self._seen:
+                new_value_set = value_set
+                break
+            self._position += 1
 
         # handle the case where we couldn't find a unique parameter set
-        if new_value_set == None:
+        if new_value_set is None:
             return None
 
         # set next_run_params based on our new set of params
@@ -52,17 +163,3 @@ class GridSearch(Search):
             param.value = value
 
         return (params.to_config(), None)
-
-    def _run_contains_param_values(self, run, params):
-        for key, value in params.items():
-            if not key in run.config:
-                return False
-            if not run.config[key]['value'] == value:
-                #print("not same {} {}".format(run.config[key], value))
-                return False
-        return True
-
-    def _runs_contains_param_values(self, runs, params):
-        ret_val = any(self._run_contains_param_values(run, params)
-                      for run in runs)
-        return any(self._run_contains_param_values(run, params) for run in runs)
@@ -168,46 +168,61 @@ class HyperParameter():
             return self.value
         elif self.type == HyperParameter.CATEGORICAL:
             return self.values[int(stats.randint.ppf(x, 0, len(self.values)))]
-        elif self.type == HyperParameter.INT_UNIFORM:
-            return int(stats.randint.ppf(x, self.min, self.max + 1))
+        ret_val = self._numeric_ppf(x)
+        if self._numeric_ppf_is_int():
+            return int(ret_val)
+        return ret_val
+
+    def ppf_array(self, x):
+        """
+        Vectorized ppf
+        Inputs: x: array of floats in range [0, 1]
+        Ouputs: list with the samples from selected distribution at each percentile.
+        """
+        x = np.asarray(x, dtype=float)
+        if np.any(x < 0.0) or np.any(x > 1.0):
+            raise ValueError("Can't call ppf on value outside of [0,1]")
+        if self.type == HyperParameter.CONSTANT:
+            return [self.value] * len(x)
+        elif self.type == HyperParameter.CATEGORICAL:
+            return [self.values[int(i)] for i in stats.randint.ppf(x, 0, len(self.values))]
+        ret_vals = self._numeric_ppf(x)
+        if self._numeric_ppf_is_int():
+            return [int(ret_val) for ret_val in ret_vals]
+        return list(ret_vals)
+
+    def _numeric_ppf_is_int(self):
+        if self.type == HyperParameter.INT_UNIFORM:
+            return True
+        return (self.type in (HyperParameter.Q_UNIFORM, HyperParameter.Q_LOG_UNIFORM,
+                              HyperParameter.Q_NORMAL, HyperParameter.Q_LOG_NORMAL) and
+                type(self.q) == int)
+
+    def _numeric_ppf(self, x):
+        """ppf of the numeric distributions, x can be a float or an array"""
+        if self.type == HyperParameter.INT_UNIFORM:
+            return stats.randint.ppf(x, self.min, self.max + 1)
         elif self.type == HyperParameter.UNIFORM:
             return stats.uniform.ppf(x, self.min, self.max - self.min)
         elif self.type == HyperParameter.Q_UNIFORM:
             r = stats.uniform.ppf(x, self.min, self.max - self.min)
-            ret_val = np.round(r / self.q) * self.q
-            if type(self.q) == int:
-                return int(ret_val)
-            else:
-                return ret_val
+            return np.round(r / self.q) * self.q
         elif self.type == HyperParameter.LOG_UNIFORM:
             return np.exp(stats.uniform.ppf(x, self.min, self.max - self.min))
         elif self.type == HyperParameter.Q_LOG_UNIFORM:
             r = np.exp(stats.uniform.ppf(x, self.min, self.max - self.min))
-            ret_val = np.round(r / self.q) * self.q
-            if type(self.q) == int:
-                return int(ret_val)
-            else:
-                return ret_val
+            return np.round(r / self.q) * self.q
         elif self.type == HyperParameter.NORMAL:
             return stats.norm.ppf(x, loc=self.mu, scale=self.sigma)
         elif self.type == HyperParameter.Q_NORMAL:
             r = stats.norm.ppf(x, loc=self.mu, scale=self.sigma)
-            ret_val = np.round(r / self.q) * self.q
-            if type(self.q) == int:
-                return int(ret_val)
-            else:
-                return ret_val
+            return np.round(r / self.q) * self.q
         elif self.type == HyperParameter.LOG_NORMAL:
             # https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.lognorm.html
             return stats.lognorm.ppf(x, s=self.sigma, scale=np.exp(self.mu))
         elif self.type == HyperParameter.Q_LOG_NORMAL:
             r = stats.lognorm.ppf(x, s=self.sigma, scale=np.exp(self.mu))
-            ret_val = np.round(r / self.q) * self.q
-
-            if type(self.q) == int:
-                return int(ret_val)
-            else:
-                return ret_val
+            return np.round(r / self.q) * self.q
         else:
             raise ValueError("Unsupported hyperparameter distribution type")
 
@@ -355,12 +370,9 @@ class HyperParameterSet(list):
 
     def denormalize_vector(self, X):
         """Converts a list of vectors [0,1] to values in the original space"""
-        v = np.zeros(X.shape).tolist()
-
-        for ii, param in enumerate(self.searchable_params):
-            for jj, x in enumerate(X[:, ii]):
-                v[jj][ii] = param.ppf(x)
-        return v
+        columns = [param.ppf_array(X[:, ii])
+                   for ii, param in enumerate(self.searchable_params)]
+        return [list(row) for row in zip(*columns)]
 
     def convert_run_to_normalized_vector(self, run):
         """Converts run parameters to vectors with all values compressed to [0, 1]"""
@@ -306,3 +306,62 @@ def test_runs_bayes_categorical_list():
     sweep = {'config': sweep_config_2params_categorical, 'runs': runs}
     params, info = bs.next_run(sweep)
     assert params['v1']['value'] == [(7, 8), ['9', [10, 11]]] and params['v2']['value'] == 1
+
+
+def test_random_sample_bounds():
+    samples = bayes.random_sample([[-1., 1.], [2, 5]], 1000)
+    assert samples.shape == (1000, 2)
+    assert samples[:, 0].min() >= -1. and samples[:, 0].max() < 1.
+    assert set(samples[:, 1]) == {2, 3, 4}
+
+
+def squiggle_runs(count):
+    runs = []
+    for ii in range(count):
+        v1 = 1 + ii % 10
+        v2 = 1 + (ii * 7) % 10
+        runs.append(Run('r%d' % ii, 'finished', {
+            'v1': {'value': v1}, 'v2': {'value': v2}
+        }, {'loss': float(squiggle(v1 / 2.) + v2 / 10.)}, []))
+    return runs
+
+
+def test_fit_cache_reused():
+    np.random.seed(73)
+    bs = bayes.BayesianSearch()
+    sweep = {'config': sweep_config_2params, 'runs': squiggle_runs(8)}
+    bs.next_run(sweep)
+    bs.next_run(sweep)
+    assert bs._fit_cache.fits == 1 and bs._fit_cache.hits == 1
+    sweep['runs'].append(Run('running', 'running', {
+        'v1': {'value': 3}, 'v2': {'value': 3}}, {}, []))
+    bs.next_run(sweep)
+    assert bs._fit_cache.fits == 2
+
+
+def test_next_samples_constant_liar():
+    np.random.seed(73)
+    X = np.random.uniform(size=(20, 2))
+    y = np.array([rosenbrock(x * 2) for x in X])
+    fit_cache = bayes.FitCache()
+    samples = bayes.next_samples(X, y, [[0., 1.], [0., 1.]], 4, fit_cache=fit_cache)
+    assert len(samples) == 4
+    assert fit_cache.fits == 1
+    suggested = [tuple(sample[0]) for sample in samples]
+    assert len(set(suggested)) == 4
+    for sample, prob, pred in samples:
+        assert 0. <= prob <= 1.
+        assert np.isfinite(pred)
+
+
+def test_runs_bayes_batch():
+    np.random.seed(73)
+    bs = bayes.BayesianSearch()
+    sweep = {'config': sweep_config_2params, 'runs': squiggle_runs(8)}
+    suggestions = bs.next_runs(sweep, 3)
+    assert len(suggestions) == 3
+    for params, info in suggestions:
+        assert 1 <= params['v1']['value'] <= 10
+        assert 1 <= params['v2']['value'] <= 10
+        assert 'loss' in info['predictions']
+    assert bs._fit_cache.fits == 1
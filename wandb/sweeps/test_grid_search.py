@@ -4,7 +4,11 @@ from wandb.sweeps.params import HyperParameter
 
 
 class Run(object):
-    def __init__(self, params):
+    count = 0
+
+    def __init__(self, params, name=None):
+        Run.count += 1
+        self.name = name or 'run-%d' % Run.count
         self.config = params
 
 
@@ -58,3 +62,97 @@ def test_grid_all():
         if num > 100:
             break
     assert num == 3 * 2
+
+
+def test_grid_all_reused():
+    # one GridSearch for all calls only indexes the new runs
+    gs = grid_search.GridSearch()
+    runs = []
+    while True:
+        sweep = {'config': sweep_config_2params, 'runs': runs}
+        params = gs.next_run(sweep)
+        if params is None:
+            break
+        runs.append(Run(params[0]))
+        assert len(runs) <= 6
+    assert sorted((r.config['v1']['value'], r.config['v2']['value']) for r in runs) == \
+        [(1, 4), (1, 5), (2, 4), (2, 5), (3, 4), (3, 5)]
+    assert len(gs._run_values) == 6
+
+
+def test_grid_runs_replaced():
+    gs = grid_search.GridSearch()
+    first = Run(gs.next_run({'config': sweep_config_2params, 'runs': []})[0])
+    second = Run(gs.next_run({'config': sweep_config_2params, 'runs': [first]})[0])
+    gs.next_run({'config': sweep_config_2params, 'runs': [first, second]})
+    # the first run is deleted and a run is added in the same step, the
+    # deleted run's combination is free again
+    replaced = Run({'v1': {'value': 3}, 'v2': {'value': 5}})
+    params, _ = gs.next_run({'config': sweep_config_2params,
+                             'runs': [second, replaced]})
+    assert params == first.config
+
+
+def test_grid_run_config_incomplete():
+    gs = grid_search.GridSearch()
+    run = Run({})
+    params, _ = gs.next_run({'config': sweep_config_2params, 'runs': [run]})
+    # the config of the run is filled in after it was first seen
+    run.config = params
+    params, _ = gs.next_run({'config': sweep_config_2params, 'runs': [run]})
+    assert params != run.config
+
+
+def test_grid_same_suggestion_until_scheduled():
+    gs = grid_search.GridSearch()
+    sweep = {'config': sweep_config_2params, 'runs': []}
+    assert gs.next_run(sweep) == gs.next_run(sweep)
+
+
+def test_grid_randomized_deterministic():
+    def order(gs):
+        runs = []
+        while True:
+            params = gs.next_run({'config': sweep_config_2params, 'runs': runs})
+            if params is None:
+                return [(r.config['v1']['value'], r.config['v2']['value']) for r in runs]
+            runs.append(Run(params[0]))
+
+    shuffled = order(grid_search.GridSearch(randomize_order=True))
+    assert sorted(shuffled) == order(grid_search.GridSearch())
+    assert shuffled == order(grid_search.GridSearch(randomize_order=True))
+
+
+def test_grid_permutation():
+    for n in (1, 2, 3, 7, 64, 1000):
+        perm = grid_search._Permutation(n, seed=42)
+        assert sorted(perm[i] for i in range(n)) == list(range(n))
+    assert [grid_search._Permutation(1000, 1)[i] for i in range(10)] != list(range(10))
+
+
+def test_grid_large_lazy():
+    # 10^6 points, the grid is never materialized
+    config = {'parameters': {
+        'p%d' % i: {'values': list(range(10))} for i in range(6)}}
+    gs = grid_search.GridSearch(randomize_order=True)
+    runs = []
+    seen = set()
+    for _ in range(200):
+        params, _ = gs.next_run({'config': config, 'runs': runs})
+        run = Run(params)
+        runs.append(run)
+        seen.add(tuple(params['p%d' % i]['value'] for i in range(6)))
+    assert len(seen) == 200
+
+
+def test_grid_unhashable_values():
+    config = {'parameters': {'v1': {'values': [[1, 2], [3, 4]]},
+                             'v2': {'values': [{'a': 1}, {'a': 2}]}}}
+    gs = grid_search.GridSearch()
+    runs = []
+    while True:
+        params = gs.next_run({'config': config, 'runs': runs})
+        if params is None:
+            break
+        runs.append(Run(params[0]))
+    assert len(runs) == 4
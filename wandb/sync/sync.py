@@ -6,6 +6,7 @@ from __future__ import print_function
 
 import datetime
 import fnmatch
+import json
 import os
 import sys
 import threading
@@ -32,6 +33,11 @@ else:
 
 WANDB_SUFFIX = ".wandb"
 SYNCED_SUFFIX = ".synced"
+# progress of an interrupted sync, used to resume it
+SYNCING_SUFFIX = ".syncing"
+CHECKPOINT_SECONDS = 5
+# records sent through file_stream, which the server appends to
+STREAMED_RECORDS = ("history", "history_batch", "output", "stats")
 
 
 class _LocalRun(object):
@@ -47,6 +53,40 @@ class _LocalRun(object):
         return self.path
 
 
+class SyncStatus(object):
+    """Progress of a sync, shared by the sync threads."""
+
+    def __init__(self, total_runs=0):
+        self._lock = threading.Lock()
+        self._start_time = time.time()
+        self.total_runs = total_runs
+        self.done_runs = 0
+        self.records = 0
+        self.bytes = 0
+
+    def add_record(self, nbytes):
+        with self._lock:
+            self.records += 1
+            self.bytes += nbytes
+
+    def run_done(self):
+        with self._lock:
+            self.done_runs += 1
+
+    def summary(self):
+        with self._lock:
+            elapsed = time.time() - self._start_time
+            return dict(
+                total_runs=self.total_runs,
+                done_runs=self.done_runs,
+                records=self.records,
+                bytes=self.bytes,
+                elapsed_seconds=elapsed,
+                records_per_sec=self.records / elapsed if elapsed else 0.0,
+                bytes_per_sec=self.bytes / elapsed if elapsed else 0.0,
+            )
+
+
 class SyncThread(threading.Thread):
     def __init__(
         self,
@@ -58,11 +98,20 @@ class SyncThread(threading.Thread):
         verbose=None,
         mark_synced=None,
         app_url=None,
+        sync_queue=None,
+        status=None,
+        parallel=None,
     ):
         threading.Thread.__init__(self)
         # mark this process as internal
         wandb._IS_INTERNAL_PROCESS = True
-        self._sync_list = sync_list
+        if sync_queue is None:
+            sync_queue = queue.Queue()
+            for sync_item in sync_list:
+                sync_queue.put(sync_item)
+        self._sync_queue = sync_queue
+        self._status = status or SyncStatus(len(sync_list))
+        self._parallel = parallel or 1
         self._project = project
         self._entity = entity
         self._run_id = run_id
@@ -72,108 +121,204 @@ class SyncThread(threading.Thread):
         self._app_url = app_url
 
     def run(self):
-        for sync_item in self._sync_list:
-            if os.path.isdir(sync_item):
-                files = os.listdir(sync_item)
-                filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
-                if check_and_warn_old(files) or len(filtered_files) != 1:
-                    print("Skipping directory: {}".format(sync_item))
-                    continue
-                sync_item = os.path.join(sync_item, filtered_files[0])
-            dirname = os.path.dirname(sync_item)
-            files_dir = os.path.join(dirname, "files")
-            sd = dict(
-                files_dir=files_dir,
-                _start_time=0,
-                git_remote=None,
-                resume=None,
-                program=None,
-                ignore_globs=(),
-                run_id=None,
-                entity=None,
-                project=None,
-                run_group=None,
-                job_type=None,
-                run_tags=None,
-                run_name=None,
-                run_notes=None,
-                save_code=None,
-                email=None,
-                silent=None,
-            )
-            settings = settings_static.SettingsStatic(sd)
-            record_q = queue.Queue()
-            result_q = queue.Queue()
-            publish_interface = interface.BackendSender(record_q=record_q)
-            sm = sender.SendManager(
-                settings=settings,
-                record_q=record_q,
-                result_q=result_q,
-                interface=publish_interface,
+        while True:
+            try:
+                sync_item = self._sync_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._sync_item(sync_item)
+            except Exception as e:
+                # one bad run should not stop the other runs from syncing
+                print("Failed to sync {}: {}".format(sync_item, e))
+            self._status.run_done()
+
+    def _sync_item(self, sync_item):
+        if os.path.isdir(sync_item):
+            files = os.listdir(sync_item)
+            filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
+            if check_and_warn_old(files) or len(filtered_files) != 1:
+                print("Skipping directory: {}".format(sync_item))
+                return
+            sync_item = os.path.join(sync_item, filtered_files[0])
+        dirname = os.path.dirname(sync_item)
+        files_dir = os.path.join(dirname, "files")
+        syncing_file = "{}{}".format(sync_item, SYNCING_SUFFIX)
+        checkpoint = None if self._view else _read_checkpoint(syncing_file)
+        sm, record_q, result_q = self._make_sender(
+            files_dir, resume="allow" if checkpoint else None
+        )
+        ds = datastore.DataStoreReader(sync_item)
+        skip_offset = checkpoint["offset"] if checkpoint else 0
+        if skip_offset:
+            print("Resuming sync of {} at byte {}.".format(sync_item, skip_offset))
+
+        # save exit for final send
+        exit_pb = None
+        final_pb = None
+        self._run = None
+        self._url = None
+        checkpoint_time = time.time()
+
+        for offset, data in ds.records():
+            self._status.add_record(len(data))
+            pb = wandb_internal_pb2.Record()
+            pb.ParseFromString(data)
+            record_type = pb.WhichOneof("record_type")
+            if self._view:
+                if self._verbose:
+                    print("Record:", pb)
+                else:
+                    print("Record:", record_type)
+                continue
+            if record_type == "run":
+                self._update_run(pb.run, checkpoint)
+                pb.control.req_resp = True
+                # a resumed run appends to the log of the previous
+                # attempt, only the exit of the last attempt is sent
+                exit_pb = None
+                final_pb = None
+            elif record_type == "exit":
+                exit_pb = pb
+                continue
+            elif record_type == "final":
+                assert exit_pb, "final seen without exit"
+                final_pb = exit_pb
+                exit_pb = None
+                continue
+            elif offset < skip_offset and record_type in STREAMED_RECORDS:
+                # already acknowledged by the server in a previous sync
+                continue
+            else:
+                # only the run and exit responses are needed, the others
+                # would only be queued and dropped
+                pb.control.req_resp = False
+            self._send_record(sm, record_q, result_q, pb)
+            if (
+                self._run
+                and time.time() - checkpoint_time > CHECKPOINT_SECONDS
+                and not sm.stream_pending()
+            ):
+                # every record up to this one has been acknowledged, a
+                # resumed sync starts after it
+                _write_checkpoint(syncing_file, ds.valid_length, self._run)
+                checkpoint_time = time.time()
+        if final_pb:
+            self._send_record(sm, record_q, result_q, final_pb)
+        ds.close()
+        if ds.truncated:
+            print(
+                "Warning: {} is truncated, synced up to byte {}.".format(
+                    sync_item, ds.valid_length
+                )
             )
-            ds = datastore.DataStore()
-            ds.open_for_scan(sync_item)
-
-            # save exit for final send
-            exit_pb = None
-            shown = False
-
-            while True:
-                data = ds.scan_data()
-                if data is None:
-                    break
-                pb = wandb_internal_pb2.Record()
-                pb.ParseFromString(data)
-                record_type = pb.WhichOneof("record_type")
-                if self._view:
-                    if self._verbose:
-                        print("Record:", pb)
-                    else:
-                        print("Record:", record_type)
-                    continue
-                if record_type == "run":
-                    if self._run_id:
-                        pb.run.run_id = self._run_id
-                    if self._project:
-                        pb.run.project = self._project
-                    if self._entity:
-                        pb.run.entity = self._entity
-                    pb.control.req_resp = True
-                elif record_type == "exit":
-                    exit_pb = pb
-                    continue
-                elif record_type == "final":
-                    assert exit_pb, "final seen without exit"
-                    pb = exit_pb
-                    exit_pb = None
-                sm.send(pb)
-                # send any records that were added in previous send
-                while not record_q.empty():
-                    data = record_q.get(block=True)
-                    sm.send(data)
-
-                if pb.control.req_resp:
-                    result = result_q.get(block=True)
-                    result_type = result.WhichOneof("result_type")
-                    if not shown and result_type == "run_result":
-                        r = result.run_result.run
-                        # TODO(jhr): hardcode until we have settings in sync
-                        url = "{}/{}/{}/runs/{}".format(
-                            self._app_url,
-                            url_quote(r.entity),
-                            url_quote(r.project),
-                            url_quote(r.run_id),
-                        )
-                        print("Syncing: %s ..." % url, end="")
-                        sys.stdout.flush()
-                        shown = True
-            sm.finish()
-            if self._mark_synced and not self._view:
-                synced_file = "{}{}".format(sync_item, SYNCED_SUFFIX)
-                with open(synced_file, "w"):
-                    pass
+        sm.finish()
+        if not self._view and os.path.exists(syncing_file):
+            os.remove(syncing_file)
+        if self._mark_synced and not self._view:
+            synced_file = "{}{}".format(sync_item, SYNCED_SUFFIX)
+            with open(synced_file, "w"):
+                pass
+        if self._parallel > 1:
+            print("Synced: {}".format(self._url or sync_item))
+        else:
             print("done.")
 
+    def _make_sender(self, files_dir, resume=None):
+        sd = dict(
+            files_dir=files_dir,
+            _start_time=0,
+            git_remote=None,
+            resume=resume,
+            program=None,
+            ignore_globs=(),
+            run_id=None,
+            entity=None,
+            project=None,
+            run_group=None,
+            job_type=None,
+            run_tags=None,
+            run_name=None,
+            run_notes=None,
+            save_code=None,
+            email=None,
+            silent=None,
+            summary_write_seconds=None,
+            _file_stream_inflight=None,
+            _file_stream_backlog_bytes=None,
+            _file_stream_gzip=None,
+        )
+        settings = settings_static.SettingsStatic(sd)
+        record_q = queue.Queue()
+        result_q = queue.Queue()
+        publish_interface = interface.BackendSender(record_q=record_q)
+        sm = sender.SendManager(
+            settings=settings,
+            record_q=record_q,
+            result_q=result_q,
+            interface=publish_interface,
+        )
+        return sm, record_q, result_q
+
+    def _update_run(self, run, checkpoint):
+        if checkpoint:
+            # continue the run created by the interrupted sync
+            run.run_id = checkpoint["run_id"]
+            run.project = checkpoint["project"]
+            run.entity = checkpoint["entity"]
+        if self._run_id:
+            run.run_id = self._run_id
+        if self._project:
+            run.project = self._project
+        if self._entity:
+            run.entity = self._entity
+
+    def _send_record(self, sm, record_q, result_q, pb):
+        sm.send(pb)
+        # send any records that were added in previous send
+        while not record_q.empty():
+            data = record_q.get(block=True)
+            sm.send(data)
+
+        if pb.control.req_resp:
+            result = result_q.get(block=True)
+            result_type = result.WhichOneof("result_type")
+            if not self._run and result_type == "run_result":
+                r = self._run = result.run_result.run
+                # TODO(jhr): hardcode until we have settings in sync
+                self._url = "{}/{}/{}/runs/{}".format(
+                    self._app_url,
+                    url_quote(r.entity),
+                    url_quote(r.project),
+                    url_quote(r.run_id),
+                )
+                if self._parallel > 1:
+                    print("Syncing: %s" % self._url)
+                else:
+                    print("Syncing: %s ..." % self._url, end="")
+                sys.stdout.flush()
+
+
+def _read_checkpoint(fname):
+    try:
+        with open(fname) as f:
+            checkpoint = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if not all(k in checkpoint for k in ("offset", "run_id", "project", "entity")):
+        return None
+    return checkpoint
+
+
+def _write_checkpoint(fname, offset, run):
+    checkpoint = dict(
+        offset=offset, run_id=run.run_id, project=run.project, entity=run.entity
+    )
+    tmp_fname = fname + ".tmp"
+    with open(tmp_fname, "w") as f:
+        json.dump(checkpoint, f)
+    getattr(os, "replace", os.rename)(tmp_fname, fname)
+
 
 class SyncManager:
     def __init__(
@@ -185,9 +330,11 @@ class SyncManager:
         app_url=None,
         view=None,
         verbose=None,
+        parallel=None,
     ):
         self._sync_list = []
-        self._thread = None
+        self._threads = []
+        self._status = None
         self._project = project
         self._entity = entity
         self._run_id = run_id
@@ -195,33 +342,45 @@ class SyncManager:
         self._app_url = app_url
         self._view = view
         self._verbose = verbose
+        self._parallel = parallel or 1
 
     def status(self):
-        pass
+        return self._status.summary() if self._status else None
 
     def add(self, p):
         self._sync_list.append(str(p))
 
     def start(self):
-        # create a thread for each file?
-        self._thread = SyncThread(
-            sync_list=self._sync_list,
-            project=self._project,
-            entity=self._entity,
-            run_id=self._run_id,
-            view=self._view,
-            verbose=self._verbose,
-            mark_synced=self._mark_synced,
-            app_url=self._app_url,
-        )
-        self._thread.start()
+        sync_queue = queue.Queue()
+        for sync_item in self._sync_list:
+            sync_queue.put(sync_item)
+        self._status = SyncStatus(len(self._sync_list))
+        # viewing prints the records, keep them in order
+        num_threads = 1 if self._view else min(self._parallel, len(self._sync_list))
+        for _ in range(max(num_threads, 1)):
+            thread = SyncThread(
+                sync_list=self._sync_list,
+                project=self._project,
+                entity=self._entity,
+                run_id=self._run_id,
+                view=self._view,
+                verbose=self._verbose,
+                mark_synced=self._mark_synced,
+                app_url=self._app_url,
+                sync_queue=sync_queue,
+                status=self._status,
+                parallel=num_threads,
+            )
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
 
     def is_done(self):
-        return not self._thread.is_alive()
+        return not any(thread.is_alive() for thread in self._threads)
 
     def poll(self):
         time.sleep(1)
-        return False
+        return self.status()
 
 
 def get_runs(
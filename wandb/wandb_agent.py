@@ -7,6 +7,7 @@ import signal
 import socket
 import subprocess
 import sys
+import threading
 import time
 import traceback
 
@@ -28,15 +29,26 @@ class AgentError(Exception):
 
 
 class AgentProcess(object):
-    """Launch and manage a process."""
+    """Launch and manage a process.
+
+    A thread waits for the process to exit, sets exited() and calls on_exit,
+    so the owner doesn't have to poll.
+    """
 
     def __init__(
-        self, env=None, command=None, function=None, run_id=None, in_jupyter=None
+        self,
+        env=None,
+        command=None,
+        function=None,
+        run_id=None,
+        in_jupyter=None,
+        on_exit=None,
     ):
         self._popen = None
         self._proc = None
         self._finished_q = multiprocessing.Queue()
         self._proc_killed = False
+        self._exited = threading.Event()
 
         if command:
             if platform.system() == "Windows":
@@ -52,6 +64,22 @@ class AgentProcess(object):
             self._proc.start()
         else:
             raise AgentError("Agent Process requires command or function")
+        self._waiter = threading.Thread(target=self._wait_exit, args=(on_exit,))
+        self._waiter.daemon = True
+        self._waiter.start()
+
+    def _wait_exit(self, on_exit):
+        # blocks in waitpid until the process exits
+        if self._popen:
+            self._popen.wait()
+        else:
+            self._proc.join()
+        self._exited.set()
+        if on_exit:
+            on_exit()
+
+    def exited(self):
+        return self._exited.is_set()
 
     def _start(self, finished_q, env, function, run_id, in_jupyter):
         if env:
@@ -85,20 +113,18 @@ class AgentProcess(object):
                 return True
         except queue.Empty:
             pass
+        if self._exited.is_set():
+            # the process exited without signaling, e.g. the function raised
+            return self._proc.exitcode
         return
 
     def wait(self):
         if self._popen:
-            # if on windows, wait() will block and we wont be able to interrupt
+            # if on windows, wait() will block and we wont be able to interrupt,
+            # so wait on the exit event with a timeout instead
             if platform.system() == "Windows":
-                try:
-                    while True:
-                        p = self._popen.poll()
-                        if p is not None:
-                            return p
-                        time.sleep(1)
-                except KeyboardInterrupt:
-                    raise
+                while not self._exited.wait(1):
+                    pass
             return self._popen.wait()
         return self._proc.join()
 
@@ -123,18 +149,29 @@ class AgentProcess(object):
 
 class Agent(object):
     POLL_INTERVAL = 5
+    HEARTBEAT_MAX_INTERVAL = 30
     REPORT_INTERVAL = 0
     KILL_DELAY = 30
     FLAPPING_MAX_SECONDS = 60
     FLAPPING_MAX_FAILURES = 3
     MAX_INITIAL_FAILURES = 5
+    _WAKEUP = "wakeup"
 
     def __init__(
-        self, api, queue, sweep_id=None, function=None, in_jupyter=None, count=None
+        self,
+        api,
+        queue,
+        sweep_id=None,
+        function=None,
+        in_jupyter=None,
+        count=None,
+        slots=1,
     ):
         self._api = api
         self._queue = queue
         self._run_processes = {}  # keyed by run.id (GQL run name)
+        self._run_slots = {}  # run.id -> id of the agent that was sent the run
+        self._agent_ids = []
         self._server_responses = []
         self._sweep_id = sweep_id
         self._in_jupyter = in_jupyter
@@ -149,6 +186,8 @@ class Agent(object):
         self._finished = 0
         self._failed = 0
         self._count = count
+        self._slots = slots
+        self._heartbeat_interval = self.POLL_INTERVAL
         self._sweep_command = []
         self._max_initial_failures = wandb.env.get_agent_max_initial_failures(
             self.MAX_INITIAL_FAILURES
@@ -157,6 +196,8 @@ class Agent(object):
             raise AgentError("Invalid agent report interval")
         if self._kill_delay is None:
             raise AgentError("Invalid agent kill delay")
+        if self._slots < 1:
+            raise AgentError("Invalid agent slots: %s" % self._slots)
         # if the directory to log to is not set, set it
         if os.environ.get("WANDB_DIR") is None:
             os.environ["WANDB_DIR"] = os.path.abspath(os.getcwd())
@@ -178,7 +219,7 @@ class Agent(object):
     def run(self):  # noqa: C901
 
         # TODO: catch exceptions, handle errors, show validation warnings, and make more generic
-        sweep_obj = self._api.sweep(self._sweep_id, "{}")
+        sweep_obj = self._api.sweep(self._sweep_id, "{}", include_runs=False)
         if sweep_obj:
             sweep_yaml = sweep_obj.get("config")
             if sweep_yaml:
@@ -189,15 +230,28 @@ class Agent(object):
                         self._sweep_command = sweep_command
 
         # TODO: include sweep ID
-        agent = self._api.register_agent(socket.gethostname(), sweep_id=self._sweep_id)
-        agent_id = agent["id"]
+        # every slot is registered as an agent, the server sends each of them
+        # one run at a time
+        for _ in range(self._slots):
+            agent = self._api.register_agent(
+                socket.gethostname(), sweep_id=self._sweep_id
+            )
+            self._agent_ids.append(agent["id"])
 
         try:
+            next_heartbeat = None
             while self._running:
-                commands = util.read_many_from_queue(
-                    self._queue, 100, self.POLL_INTERVAL
-                )
+                # sleep until the next heartbeat unless a command arrives or a
+                # run exits
+                timeout = 0
+                if next_heartbeat is not None:
+                    timeout = max(0, next_heartbeat - util.stopwatch_now())
+                commands = util.read_many_from_queue(self._queue, 100, timeout)
+                changed = False
                 for command in commands:
+                    changed = True
+                    if command == self._WAKEUP:
+                        continue
                     command["resp_queue"].put(self._process_command(command))
 
                 now = util.stopwatch_now()
@@ -209,7 +263,9 @@ class Agent(object):
                     self._last_report_time = now
                 run_status = {}
                 for run_id, run_process in list(six.iteritems(self._run_processes)):
-                    poll_result = run_process.poll()
+                    poll_result = None
+                    if run_process.exited():
+                        poll_result = run_process.poll()
                     if poll_result is None:
                         run_status[run_id] = True
                         continue
@@ -242,19 +298,24 @@ class Agent(object):
                             break
                     logger.info("Cleaning up finished run: %s", run_id)
                     del self._run_processes[run_id]
+                    self._run_slots.pop(run_id, None)
                     self._last_report_time = None
                     self._finished += 1
+                    changed = True
 
                 if self._count and self._finished >= self._count or not self._running:
                     self._running = False
                     continue
 
-                commands = self._api.agent_heartbeat(agent_id, {}, run_status)
-
-                # TODO: send _server_responses
-                self._server_responses = []
-                for command in commands:
-                    self._server_responses.append(self._process_command(command))
+                if (
+                    not changed
+                    and next_heartbeat is not None
+                    and util.stopwatch_now() < next_heartbeat
+                ):
+                    continue
+                received = self._heartbeat(run_status)
+                self._update_heartbeat_interval(changed or received)
+                next_heartbeat = util.stopwatch_now() + self._heartbeat_interval
 
         except KeyboardInterrupt:
             try:
@@ -284,6 +345,53 @@ class Agent(object):
                     except OSError:
                         pass  # if process is already dead
 
+    def _wakeup(self):
+        self._queue.put(self._WAKEUP)
+
+    def _heartbeat(self, run_status):
+        """Sends a heartbeat for every slot, returns True if commands were received."""
+        received = False
+        # TODO: send _server_responses
+        self._server_responses = []
+        for agent_id in self._agent_ids:
+            slot_status = {
+                run_id: status
+                for run_id, status in six.iteritems(run_status)
+                if self._run_slots.get(run_id, self._agent_ids[0]) == agent_id
+            }
+            # don't ask for more runs than count
+            if (
+                not slot_status
+                and self._count
+                and self._finished + len(self._run_processes) >= self._count
+            ):
+                continue
+            commands = self._api.agent_heartbeat(agent_id, {}, slot_status)
+            for command in commands:
+                self._server_responses.append(self._process_command(command))
+                run_id = command.get("run_id")
+                if command.get("type") == "run" and run_id in self._run_processes:
+                    self._run_slots[run_id] = agent_id
+            received = received or bool(commands)
+        return received
+
+    def _update_heartbeat_interval(self, active):
+        """Backs off the heartbeat while nothing happens.
+
+        Runs being stopped need frequent heartbeats, they are killed when the
+        stop command is repeated after the kill delay.
+        """
+        stopping = any(
+            proc.last_sigterm_time is not None
+            for proc in six.itervalues(self._run_processes)
+        )
+        if active or stopping:
+            self._heartbeat_interval = self.POLL_INTERVAL
+        else:
+            self._heartbeat_interval = min(
+                self._heartbeat_interval * 2, self.HEARTBEAT_MAX_INTERVAL
+            )
+
     def _process_command(self, command):
         logger.info(
             "Agent received command: %s"
@@ -385,6 +493,7 @@ class Agent(object):
                 env=env,
                 run_id=run_id,
                 in_jupyter=self._in_jupyter,
+                on_exit=self._wakeup,
             )
         else:
             sweep_vars = dict(
@@ -411,7 +520,7 @@ class Agent(object):
                     " ".join('"%s"' % c if " " in c else c for c in command_list)
                 )
             )
-            proc = AgentProcess(command=command_list, env=env)
+            proc = AgentProcess(command=command_list, env=env, on_exit=self._wakeup)
         self._run_processes[run_id] = proc
 
         # we keep track of when we sent the sigterm to give processes a chance
@@ -475,7 +584,13 @@ class AgentApi(object):
 
 
 def run_agent(
-    sweep_id, function=None, in_jupyter=None, entity=None, project=None, count=None
+    sweep_id,
+    function=None,
+    in_jupyter=None,
+    entity=None,
+    project=None,
+    count=None,
+    slots=1,
 ):
     parts = dict(entity=entity, project=project, name=sweep_id)
     err = util.parse_sweep_id(parts)
@@ -515,6 +630,7 @@ def run_agent(
             function=function,
             in_jupyter=in_jupyter,
             count=count,
+            slots=slots,
         )
         agent.run()
     finally:
@@ -522,7 +638,7 @@ def run_agent(
         logger.removeHandler(ch)
 
 
-def agent(sweep_id, function=None, entity=None, project=None, count=None):
+def agent(sweep_id, function=None, entity=None, project=None, count=None, slots=1):
     """
     Generic agent entrypoint, used for CLI or jupyter.
 
@@ -536,6 +652,8 @@ def agent(sweep_id, function=None, entity=None, project=None, count=None):
         entity: (str, optional) W&B Entity
         project: (str, optional) W&B Project
         count: (int, optional) the number of trials to run.
+        slots: (int, optional) the number of trials to run at the same time,
+            only supported when function is not set.
 
     Examples:
         Run a sample sweep over a function:
@@ -552,6 +670,8 @@ def agent(sweep_id, function=None, entity=None, project=None, count=None):
         ```
     """
     global _INSTANCES
+    if function and slots != 1:
+        raise AgentError("Agent slots are not supported with a function")
     _INSTANCES += 1
     try:
         # make sure we are logged in
@@ -566,6 +686,7 @@ def agent(sweep_id, function=None, entity=None, project=None, count=None):
             entity=entity,
             project=project,
             count=count,
+            slots=slots,
         )
     finally:
         _INSTANCES -= 1
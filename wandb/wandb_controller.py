@@ -77,6 +77,10 @@ wandb_sweeps = None
 # This should be something like 'pending' (but we need to make sure everyone else is ok with that)
 SWEEP_INITIAL_RUN_STATE = "running"
 
+# incremental reads of the sweep runs between listings of all run names,
+# which drop deleted runs from the cache
+RUNS_LIST_READS = 10
+
 
 def _id_generator(size=10, chars=string.ascii_lowercase + string.digits):
     return "".join(random.choice(chars) for _ in range(size))
@@ -101,6 +105,11 @@ def _get_sweep_url(api, sweep_id):
             )
 
 
+def _last_step(history):
+    """Last _step of sampled history rows, -1 if there are none."""
+    return max([row.get("_step", -1) for row in history] or [-1])
+
+
 class _Run(object):
     """Run object containing attributes about a run for sweep searching and stopping."""
 
@@ -227,6 +236,19 @@ class _WandbController:
         self._controller = None
         # keep track of controller dict from previous step
         self._controller_prev_step = None
+        # raw run dicts by name, only runs updated since the last read are fetched
+        self._runs_cache = {}
+        # latest updatedAt of the cached runs
+        self._runs_updated_at = None
+        # metric of the cached run histories
+        self._runs_cache_metric = None
+        # incremental reads since the runs were fetched or listed in full
+        self._runs_reads = 0
+        # size of the responses of the last read from the backend
+        self._fetched_bytes = 0
+        # search object kept between steps so it can reuse its state
+        self._search_obj = None
+        self._search_obj_config = None
 
         # Internal
         # Keep track of whether the sweep has been started
@@ -437,17 +459,113 @@ class _WandbController:
                 self.print_debug()
             time.sleep(5)
 
-    def _sweep_object_read_from_backend(self):
+    def _history_specs(self, min_step=0):
         specs_json = {}
         if self._sweep_metric:
             k = ["_step"]
             k.append(self._sweep_metric)
             specs_json = {"keys": k, "samples": 100000}
-        specs = json.dumps(specs_json)
+            if min_step:
+                specs_json["minStep"] = min_step
+        return json.dumps(specs_json)
+
+    def _read_runs_from_backend(self, sizes):
+        """Fetches the runs updated since the last read, and their new history."""
+        updated = self._api.sweep_runs(
+            self._sweep_id, updated_since=self._runs_updated_at
+        )
+        sizes.append(len(json.dumps(updated)))
+        if not self._sweep_metric:
+            for run in updated:
+                cached = self._runs_cache.get(run["name"])
+                run["sampledHistory"] = cached["sampledHistory"] if cached else [[]]
+            return updated
+
+        new = []
+        known = []
+        for run in updated:
+            cached = self._runs_cache.get(run["name"])
+            if not cached:
+                new.append(run["name"])
+            # runs fetched again at the updated_since boundary are unchanged
+            elif cached.get("updatedAt") != run.get("updatedAt"):
+                known.append(run["name"])
+        histories = {}
+        if new:
+            runs = self._api.sweep_runs(
+                self._sweep_id, specs=self._history_specs(), names=new
+            )
+            sizes.append(len(json.dumps(runs)))
+            for run in runs:
+                histories[run["name"]] = run["sampledHistory"][0]
+        if known:
+            # only history after the last step we have for any of these runs
+            min_step = 1 + min(
+                [
+                    _last_step(self._runs_cache[name]["sampledHistory"][0])
+                    for name in known
+                ]
+            )
+            runs = self._api.sweep_runs(
+                self._sweep_id, specs=self._history_specs(min_step), names=known
+            )
+            sizes.append(len(json.dumps(runs)))
+            for run in runs:
+                history = self._runs_cache[run["name"]]["sampledHistory"][0]
+                history = [row for row in history if row.get("_step", 0) < min_step]
+                histories[run["name"]] = history + run["sampledHistory"][0]
+        for run in updated:
+            history = histories.get(run["name"])
+            if history is None:
+                cached = self._runs_cache.get(run["name"])
+                history = cached["sampledHistory"][0] if cached else []
+            run["sampledHistory"] = [history]
+        return updated
+
+    def _evict_deleted_runs(self, sizes):
+        """Drops cached runs which are no longer in the sweep."""
+        listed = self._api.sweep_runs(self._sweep_id, fields="name")
+        sizes.append(len(json.dumps(listed)))
+        names = set(run["name"] for run in listed)
+        for name in list(self._runs_cache):
+            if name not in names:
+                del self._runs_cache[name]
+
+    def _sweep_object_read_from_backend(self):
+        # the first read, and reads after the metric changed, fetch all runs
+        incremental = (
+            self._runs_updated_at is not None
+            and self._runs_cache_metric == self._sweep_metric
+        )
         # TODO(jhr): catch exceptions?
-        sweep_obj = self._api.sweep(self._sweep_id, specs)
+        sweep_obj = self._api.sweep(
+            self._sweep_id, self._history_specs(), include_runs=not incremental
+        )
         if not sweep_obj:
             return
+        sizes = [len(json.dumps(sweep_obj))]
+        if incremental:
+            runs = self._read_runs_from_backend(sizes)
+            self._runs_reads += 1
+        else:
+            runs = sweep_obj["runs"]
+            self._runs_cache = {}
+            self._runs_updated_at = None
+            self._runs_reads = 0
+        self._runs_cache_metric = self._sweep_metric
+        for run in runs:
+            self._runs_cache[run["name"]] = run
+            updated_at = run.get("updatedAt")
+            if updated_at and updated_at > (self._runs_updated_at or ""):
+                self._runs_updated_at = updated_at
+        if self._runs_reads >= RUNS_LIST_READS:
+            self._evict_deleted_runs(sizes)
+            self._runs_reads = 0
+        self._fetched_bytes = sum(sizes)
+        if self._runs_updated_at is None:
+            self._runs_updated_at = sweep_obj.get("createdAt") or ""
+        sweep_obj["runs"] = list(self._runs_cache.values())
+
         self._sweep_obj = sweep_obj
         self._sweep_config = yaml.safe_load(sweep_obj["config"])
         self._sweep_metric = self._sweep_config.get("metric", {}).get("name")
@@ -532,7 +650,7 @@ class _WandbController:
 
         # Clear out step logs
         self._log_actions = []
-        self._log_debug = []
+        self._log_debug = ["fetched %d bytes" % self._fetched_bytes]
 
     def step(self):
         self._step()
@@ -553,7 +671,12 @@ class _WandbController:
         sweep = self._sweep_obj.copy()
         sweep["runs"] = self._sweep_runs
         sweep["config"] = self._sweep_config
-        search = self._custom_search or wandb_sweeps.Search.to_class(self._sweep_config)
+        search = self._custom_search
+        if not search:
+            if self._search_obj_config != self._sweep_config:
+                self._search_obj = wandb_sweeps.Search.to_class(self._sweep_config)
+                self._search_obj_config = self._sweep_config
+            search = self._search_obj
         next_run = search.next_run(sweep)
         if next_run:
             next_run, info = next_run
@@ -5,17 +5,26 @@
 
 from collections import namedtuple
 import itertools
+import logging
+import math
 import weakref
 from six.moves import reduce
 from distutils.version import LooseVersion
 from operator import mul
 
+import numpy as np
 from wandb import util
 from wandb.data_types import Node, Edge
 import wandb
 
+logger = logging.getLogger(__name__)
+
 torch = None
 
+# tensors are histogrammed in chunks of this many elements on the device to
+# bound the size of temporaries
+HISTOGRAM_CHUNK_ELEMENTS = 1 << 24
+
 
 def nested_shape(array_or_tuple, seen=None):
     """Figures out the shape of tensors possibly embedded in tuples
@@ -81,6 +90,10 @@ class TorchHistory(object):
         self._num_bins = 64
         self._is_cuda_histc_supported = None
         self._jupyter_run = None
+        # gradients to histogram at the end of the backward pass, by name
+        self._pending_gradients = {}
+        # samples are drawn with these, by device, to leave the global rng alone
+        self._generators = {}
 
     def add_log_hooks_to_pytorch_module(
         self,
@@ -91,11 +104,13 @@ class TorchHistory(object):
         log_gradients=True,
         log_freq=0,
         jupyter_run=None,
+        sample_size=None,
     ):
         """ This instuments hooks into the pytorch module
         log_parameters - log parameters after a forward pass
         log_gradients - log gradients after a backward pass
         log_freq - log gradients/parameters every N batches
+        sample_size - histogram tensors with more elements from a random sample of this size
         """
         if name is not None:
             prefix = prefix + name
@@ -110,13 +125,15 @@ class TorchHistory(object):
             def parameter_log_hook(module, input_, output, log_track):
                 if not log_track_update(log_track):
                     return
+                named_tensors = []
                 for name, parameter in module.named_parameters():
                     # for pytorch 0.3 Variables
                     if isinstance(parameter, torch.autograd.Variable):
                         data = parameter.data
                     else:
                         data = parameter
-                    self.log_tensor_stats(data.cpu(), "parameters/" + prefix + name)
+                    named_tensors.append(("parameters/" + prefix + name, data))
+                self.log_tensors_stats(named_tensors, sample_size)
 
             log_track_params = log_track_init(log_freq)
             hook = module.register_forward_hook(
@@ -133,9 +150,25 @@ class TorchHistory(object):
                     log_track_grad = log_track_init(log_freq)
                     module._wandb_hook_names.append("gradients/" + prefix + name)
                     self._hook_variable_gradient_stats(
-                        parameter, "gradients/" + prefix + name, log_track_grad
+                        parameter,
+                        "gradients/" + prefix + name,
+                        log_track_grad,
+                        sample_size,
                     )
 
+    def _current_history(self):
+        history = self._history()
+
+        # recover history from run if using jupyter
+        if history is None and self._jupyter_run:
+            jupyter_run = self._jupyter_run()
+            if jupyter_run:
+                history = jupyter_run.history
+
+        if history is None or not history.compute:
+            return None
+        return history
+
     def log_tensor_stats(self, tensor, name):
         """Add distribution statistics on a tensor's elements to the current History entry
         """
@@ -154,15 +187,8 @@ class TorchHistory(object):
             raise TypeError(
                 "Expected Tensor, not {}.{}".format(cls.__module__, cls.__name__)
             )
-        history = self._history()
-
-        # recover history from run if using jupyter
-        if history is None and self._jupyter_run:
-            jupyter_run = self._jupyter_run()
-            if jupyter_run:
-                history = jupyter_run.history
-
-        if history is None or not history.compute:
+        history = self._current_history()
+        if history is None:
             return
 
         # HalfTensors on cpu do not support view(), upconvert to 32bit
@@ -261,7 +287,178 @@ class TorchHistory(object):
             {name: wandb.Histogram(np_histogram=(tensor.tolist(), bins.tolist()))}
         )
 
-    def _hook_variable_gradient_stats(self, var, name, log_track):
+    def log_tensors_stats(self, named_tensors, sample_size=None):
+        """Add distribution statistics of several tensors to the current History entry
+
+        The tensors stay on their device, they are histogrammed together with
+        a single copy of the results to the host per device.  Tensors with more
+        than sample_size elements are histogrammed from a random sample of
+        sample_size elements, with the counts scaled up.
+        """
+        history = self._current_history()
+        if history is None:
+            return
+
+        batches = {}
+        for name, tensor in named_tensors:
+            if not self._can_batch(tensor):
+                self.log_tensor_stats(tensor, name)
+                continue
+            flat = tensor.detach().reshape(-1)
+            count = flat.numel()
+            if count == 0:
+                continue
+            scale = 1.0
+            if sample_size and count > sample_size:
+                index = torch.randint(
+                    count,
+                    (sample_size,),
+                    device=flat.device,
+                    generator=self._generator(flat.device),
+                )
+                flat = flat[index]
+                scale = count / float(sample_size)
+            # summary ops are not supported for float16 everywhere
+            if not flat.is_floating_point() or flat.element_size() < 4:
+                flat = flat.float()
+            batches.setdefault(str(flat.device), []).append((name, flat, scale))
+
+        row = {}
+        for device, batch in batches.items():
+            flats = [flat for _, flat, _ in batch]
+            if device == "cpu":
+                histograms = [self._cpu_histogram(flat) for flat in flats]
+            else:
+                try:
+                    histograms = self._device_histograms(flats)
+                except RuntimeError:
+                    logger.debug("batched histograms failed on %s", device)
+                    for name, flat, _ in batch:
+                        self.log_tensor_stats(flat, name)
+                    continue
+            for (name, _, scale), histogram in zip(batch, histograms):
+                if histogram is None:
+                    # Often the whole tensor is nan or inf. Just don't log it in that case.
+                    continue
+                counts, bins = histogram
+                if scale != 1.0:
+                    counts = [c * scale for c in counts]
+                row[name] = wandb.Histogram(np_histogram=(counts, bins))
+        if row:
+            history._row_update(row)
+
+    def _can_batch(self, tensor):
+        # old pytorch versions and sparse tensors use log_tensor_stats
+        return (
+            hasattr(tensor, "detach")
+            and hasattr(torch, "isfinite")
+            and hasattr(torch.Tensor, "index_add_")
+            and not tensor.is_sparse
+        )
+
+    def _generator(self, device):
+        generator = self._generators.get(str(device))
+        if generator is None:
+            generator = torch.Generator(device=device)
+            self._generators[str(device)] = generator
+        return generator
+
+    def _cpu_histogram(self, flat):
+        # reading values is cheap on the cpu, so skip masking when all are finite
+        tmin = flat.min().item()
+        tmax = flat.max().item()
+        if any(math.isnan(v) or math.isinf(v) for v in (tmin, tmax)):
+            flat = flat[torch.isfinite(flat)]
+            if flat.numel() == 0:
+                return None
+            tmin = flat.min().item()
+            tmax = flat.max().item()
+        if tmin == tmax:
+            # histc uses this range, report it in the bins as well
+            tmin, tmax = tmin - 1, tmax + 1
+        counts = flat.histc(bins=self._num_bins, min=tmin, max=tmax)
+        bins = torch.linspace(tmin, tmax, steps=self._num_bins + 1)
+        return counts.tolist(), bins.tolist()
+
+    def _device_histograms(self, flats):
+        """Histograms of flat tensors on the same device, synchronizing once.
+
+        Values are binned like histc and counted with index_add_, which unlike
+        bincount doesn't read the range of the indices back to the host.
+        """
+        num_bins = self._num_bins
+        results = []
+        for flat in flats:
+            inf = flat.new_full((1,), float("inf"))
+            mins = []
+            maxs = []
+            for chunk in flat.split(HISTOGRAM_CHUNK_ELEMENTS):
+                finite = torch.isfinite(chunk)
+                mins.append(torch.where(finite, chunk, inf).min())
+                maxs.append(torch.where(finite, chunk, -inf).max())
+            tmin = torch.stack(mins).min()
+            tmax = torch.stack(maxs).max()
+            # like histc, use [min - 1, max + 1] if all values are the same
+            same = tmin == tmax
+            tmin = torch.where(same, tmin - 1, tmin)
+            tmax = torch.where(same, tmax + 1, tmax)
+            width = tmax - tmin
+            # nan and inf go to an extra bin that is dropped
+            overflow = flat.new_full((1,), num_bins)
+            counts = torch.zeros(num_bins + 1, dtype=torch.long, device=flat.device)
+            one = counts.new_ones(1)
+            for chunk in flat.split(HISTOGRAM_CHUNK_ELEMENTS):
+                # same arithmetic as histc so values on bin edges match
+                index = (chunk - tmin).mul_(num_bins).div_(width)
+                index = index.floor_().clamp_(0, num_bins - 1)
+                index = torch.where(torch.isfinite(chunk), index, overflow)
+                counts.index_add_(0, index.long(), one.expand(index.numel()))
+            results.append(
+                torch.cat(
+                    [
+                        counts[:num_bins].double(),
+                        tmin.double().reshape(1),
+                        tmax.double().reshape(1),
+                    ]
+                )
+            )
+        # the only copy to the host
+        results = torch.stack(results).cpu().numpy()
+
+        histograms = []
+        for result in results:
+            tmin, tmax = result[num_bins], result[num_bins + 1]
+            if tmin > tmax:
+                # no finite values
+                histograms.append(None)
+                continue
+            bins = np.linspace(tmin, tmax, num_bins + 1)
+            histograms.append((result[:num_bins].tolist(), bins.tolist()))
+        return histograms
+
+    def _queue_gradient_stats(self, grad, name, sample_size):
+        # gradients are histogrammed together at the end of the backward pass.
+        # Every hook queues the callback, since a pass which raises drops the
+        # callbacks queued during it; the later callbacks find nothing to log.
+        engine = getattr(torch.autograd.Variable, "_execution_engine", None)
+        try:
+            engine.queue_callback(self._log_pending_gradients)
+        except (AttributeError, RuntimeError):
+            self._pending_gradients = {}
+            self.log_tensors_stats([(name, grad)], sample_size)
+            return
+        # replaces the gradient left over from a pass which raised
+        self._pending_gradients[name] = (grad, sample_size)
+
+    def _log_pending_gradients(self):
+        pending, self._pending_gradients = self._pending_gradients, {}
+        by_sample_size = {}
+        for name, (grad, sample_size) in pending.items():
+            by_sample_size.setdefault(sample_size, []).append((name, grad))
+        for sample_size, named_tensors in by_sample_size.items():
+            self.log_tensors_stats(named_tensors, sample_size)
+
+    def _hook_variable_gradient_stats(self, var, name, log_track, sample_size=None):
         """Logs a Variable's gradient's distribution statistics next time backward()
         is called on it.
         """
@@ -280,7 +477,7 @@ class TorchHistory(object):
         def _callback(grad, log_track):
             if not log_track_update(log_track):
                 return
-            self.log_tensor_stats(grad.data, name)
+            self._queue_gradient_stats(grad.data, name, sample_size)
 
         handle = var.register_hook(lambda grad: _callback(grad, log_track))
         self._hook_handles[name] = handle